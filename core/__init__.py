@@ -7,7 +7,11 @@ try:
     from .ai_translator import *  # noqa
     from .app_paths import *  # noqa
     from .backtester import *  # noqa
+    from .backtester_vectorized import *  # noqa
+    from .bar_cache import *  # noqa
+    from .bar_data import *  # noqa
     from .bot_skeleton import *  # noqa
+    from .checkpoint import *  # noqa
     from .conf_guard import *  # noqa
     from .config_collection import *  # noqa
     from .config_manager import *  # noqa
@@ -15,25 +19,45 @@ try:
     from .data_manager import *  # noqa
     from .encryption_manager import *  # noqa
     from .execution import *  # noqa
+    from .indicator_cache import *  # noqa
+    from .indicators import *  # noqa
+    from .intrabar_exits import *  # noqa
     from .lang_manager import *  # noqa
     from .logger_monitor import *  # noqa
     from .login_logic import *  # noqa
     from .main_logic import *  # noqa
+    from .metrics import *  # noqa
+    from .monte_carlo import *  # noqa
+    from .multi_timeframe import *  # noqa
+    from .order_book import *  # noqa
     from .order_manager import *  # noqa
+    from .param_sweep import *  # noqa
+    from .portfolio_backtester import *  # noqa
+    from .profiling import *  # noqa
     from .register_logic import *  # noqa
+    from .resampler import *  # noqa
+    from .result_cache import *  # noqa
     from .risk_manager import *  # noqa
     from .session_state import *  # noqa
     from .settings_dialog import *  # noqa
+    from .signal_batch import *  # noqa
     from .splash_runner import *  # noqa
+    from .synthetic_data import *  # noqa
+    from .tick_replay import *  # noqa
     from .token_manager import *  # noqa
     from .ui_translator import *  # noqa
+    from .walk_forward import *  # noqa
 except ImportError:
     pass
 
 __all__ = [
-    "ai_translator", "app_paths", "backtester", "bot_skeleton", "conf_guard",
-    "config_collection", "config_manager", "config_trades", "data_manager",
-    "encryption_manager", "execution", "lang_manager", "logger_monitor", "login_logic",
-    "main_logic", "order_manager", "register_logic", "risk_manager", "session_state",
-    "settings_dialog", "splash_runner", "token_manager", "ui_translator"
+    "ai_translator", "app_paths", "backtester", "backtester_vectorized", "bar_cache",
+    "bar_data", "bot_skeleton", "checkpoint", "conf_guard", "config_collection",
+    "config_manager", "config_trades", "data_manager", "encryption_manager",
+    "execution", "indicator_cache", "indicators", "intrabar_exits", "lang_manager",
+    "logger_monitor", "login_logic", "main_logic", "metrics", "monte_carlo",
+    "multi_timeframe", "order_book", "order_manager", "param_sweep",
+    "portfolio_backtester", "profiling", "register_logic", "resampler", "result_cache",
+    "risk_manager", "session_state", "settings_dialog", "signal_batch", "splash_runner",
+    "synthetic_data", "tick_replay", "token_manager", "ui_translator", "walk_forward"
 ]
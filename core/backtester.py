@@ -4,101 +4,410 @@
 Модуль Backtester реалізує клас для симуляції торгової стратегії на історичних даних.
 
 Backtester:
-- Завантажує цінові дані з CSV файлу.
+- Завантажує цінові дані з CSV файлу у колонкове сховище BarSeries.
 - Виконує поетапний прогін даних, генерує торгові сигнали за допомогою
   переданої стратегії.
-- Симулює відкриття і закриття ордерів через ExecutionEngine.
+- Симулює відкриття і закриття ордерів через ExecutionEngine
+  (з урахуванням внутрішньобарового спрацювання SL/TP).
 - Підраховує журнал усіх угод.
+- Великі файли можна проганяти потоково: run(chunk_size=...) читає CSV
+  порціями, не завантажуючи весь файл у пам'ять.
+- Довгі прогони періодично зберігають контрольні точки (checkpoint_path)
+  і можуть продовжитися з останньої: run(resume=True).
+- Опційне профілювання по фазах (profiler=True, core.profiling).
 """
 
-import csv
+import heapq
 from pathlib import Path
 
-from core.execution import ExecutionEngine
+from core.bar_cache import load_cached_bars
+from core.bar_data import BarSeries, bar_date, iter_bar_chunks
+from core.checkpoint import (
+    CHECKPOINT_EVERY,
+    CheckpointWriter,
+    dump_state,
+    load_checkpoint,
+)
+from core.config_trades import TRADES
+from core.execution import ExecutionEngine, Order
+from core.intrabar_exits import EXIT_END, ExitCloser, resolve_exits
 from core.lang_manager import LangManager
+from core.metrics import summarize_trades
+from core.profiling import RunProfiler
+from core.resampler import resample, resample_chunks
+from core.result_cache import (
+    ResultCache,
+    apply_risk_state,
+    data_hash,
+    result_key,
+    risk_fingerprint,
+    risk_state,
+    strategy_fingerprint,
+)
 from core.risk_manager import RiskManager
+from strategies.strategy_base import as_streaming
 
 lang = LangManager()
 
 
-class Backtester:
-    def __init__(self, data_file: str, strategy, risk_manager: RiskManager):
+class Backtester(ExitCloser):
+    def __init__(
+        self,
+        data_file: str,
+        strategy,
+        risk_manager: RiskManager,
+        close_after_bars: int | None = None,
+        intrabar_exits: bool = True,
+        use_cache: bool = True,
+        timeframe: str | int | None = None,
+        result_cache: ResultCache | None = None,
+        checkpoint_path: str | Path | None = None,
+        checkpoint_every: int = CHECKPOINT_EVERY,
+        profiler: RunProfiler | bool | None = None,
+    ):
         base_dir = Path(__file__).parent.resolve()
         self.data_file = base_dir.parent / "data" / data_file
         self.strategy = strategy
         self.risk_manager = risk_manager
+        if close_after_bars is None:
+            close_after_bars = TRADES["close_after_bars"]
+        self.close_after_bars = close_after_bars
+        # False — лише вихід за часом, без перевірки SL/TP за high/low
+        self.intrabar_exits = intrabar_exits
+        # True — CSV читається через бінарний кеш (core.bar_cache)
+        self.use_cache = use_cache
+        # None — таймфрейм файлу; інакше бари збираються з базової серії
+        # ("M5", "H1", "1 hour", секунди — див. core.resampler)
+        self.timeframe = timeframe
+        # Постійний кеш результатів (core.result_cache); None — без кешу
+        self.result_cache = result_cache
+        # Файл контрольної точки (core.checkpoint); None — без знімків.
+        # Знімок пишеться кожні checkpoint_every барів у фоновому потоці.
+        self.checkpoint_path = Path(checkpoint_path) if checkpoint_path else None
+        self.checkpoint_every = max(int(checkpoint_every), 1)
+        # Профілювання фаз run() (core.profiling); None — вимкнено.
+        # Після прогону підсумок — у self.profiler.stats.
+        self.profiler = RunProfiler() if profiler is True else profiler or None
         self.execution = ExecutionEngine(risk_manager, mode="simulator")
         self.trades_log = []
 
-    def load_data(self):
+    def load_data(self) -> BarSeries:
         """
         Завантаження історичних даних цін з CSV файлу.
 
-        Повертає список словників з ключами:
-        'time', 'open', 'high', 'low', 'close'
+        Перше завантаження зберігає бінарний кеш поруч із CSV, наступні
+        відкривають його через mmap без розбору тексту (core.bar_cache).
+        Якщо задано timeframe, бари вищого таймфрейму будуються з базової
+        серії файлу (core.resampler).
+        Повертає BarSeries — колонкові масиви 'time', 'open', 'high', 'low',
+        'close'. Індексація data[i] дає бар, сумісний зі словником,
+        а зріз data[a:b] — вікно без копіювання.
         """
-        data = []
-        with open(self.data_file, "r") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                data.append(
-                    {
-                        "time": row["time"],
-                        "open": float(row["open"]),
-                        "high": float(row["high"]),
-                        "low": float(row["low"]),
-                        "close": float(row["close"]),
-                    }
-                )
+        data = load_cached_bars(self.data_file, self.use_cache)
+        if self.timeframe is not None:
+            data = resample(data, self.timeframe)
         return data
 
-    def run(self):
+    def run(self, chunk_size: int | None = None, resume: bool = False):
         """
         Запуск бек-тестування стратегії на завантажених даних.
 
         Логіка:
         - Ітерується по кожному бару (свічці).
-        - Закриває відкриті ордери, якщо з моменту відкриття пройшло 3 бари.
-        - Генерує торговий сигнал зі стратегії.
-        - Відправляє ордер на виконання через ExecutionEngine.
-        - Зберігає всі угоди в журналі.
+        - Закриває ордери, чий бар виходу настав: перше торкання SL/TP
+          за high/low (intrabar_exits) або close_after_bars барів після
+          відкриття (TRADES["close_after_bars"], типово 3).
+        - Передає бар стратегії через on_bar (стратегія тримає ковзний стан;
+          старі стратегії з generate_signal обгортаються SignalAdapter).
+        - Відправляє ордер на виконання через ExecutionEngine і одразу
+          шукає його бар виходу векторно (resolve_exits) у поточній порції;
+          якщо вихід далі — пошук продовжується в наступних порціях.
+        - Зберігає всі угоди в журналі (закриті — з 'exit_price', 'profit'
+          і 'exit_reason').
         - В кінці закриває всі залишені відкриті ордери.
+        Якщо задано result_cache, повторний прогін з тими самими даними,
+        стратегією, RiskManager і налаштуваннями береться з кешу.
+        Якщо задано checkpoint_path, кожні checkpoint_every барів стан
+        прогону зберігається у файл; після успішного завершення файл
+        видаляється.
 
+        :param chunk_size: None — весь файл завантажується через load_data();
+            число — потоковий режим: CSV читається порціями по chunk_size
+            барів (iter_bar_chunks), пікова пам'ять не залежить від довжини
+            файлу. Потоковий режим потребує стратегії з on_bar.
+        :param resume: True — продовжити з контрольної точки checkpoint_path
+            (якщо її немає, прогін починається з початку). Стратегія,
+            RiskManager, відкриті ордери і журнал угод відновлюються
+            зі знімка; розмір порції може відрізнятися від перерваного прогону.
         Повертає список усіх угод (трейдів).
         """
-        data = self.load_data()
-        open_orders = []
-
-        for i in range(len(data)):
-            price = data[i]["close"]
-
-            # Закриття ордерів через 3 бари після відкриття
-            for order in open_orders[:]:
-                if i - order["open_index"] >= 3:
-                    self.execution.close_order(order["id"], exit_price=price)
-                    open_orders.remove(order)
-
-            # Генерація сигнала від стратегії
-            signal = self.strategy.generate_signal(data[: i + 1])
-            if signal:
-                side, stop_loss, take_profit = signal
-
-                # Посилання ордера на виконання
-                ok, order = self.execution.submit_order(
-                    symbol="TEST",
-                    side=side,
-                    price=price,
-                    stop_loss=stop_loss,
-                    take_profit=take_profit,
+        if self.profiler is None:
+            return self._run(chunk_size, resume)
+        with self.profiler.attach(self):
+            return self._run(chunk_size, resume)
+
+    def _run(self, chunk_size: int | None, resume: bool):
+        """Прогін бек-тесту (див. run)."""
+        key = self._result_key(self.data_file)
+        if self._load_result(key):
+            return self.trades_log
+        first_trade = len(self.trades_log)
+        start_balance = self.risk_manager.balance
+
+        if chunk_size is None:
+            chunks = [self.load_data()]
+            strategy = as_streaming(self.strategy)
+        else:
+            if not hasattr(self.strategy, "on_bar"):
+                raise ValueError("Streaming mode requires a strategy with on_bar")
+            chunks = iter_bar_chunks(self.data_file, chunk_size)
+            if self.timeframe is not None:
+                chunks = resample_chunks(chunks, self.timeframe)
+            strategy = self.strategy
+            if self.profiler is not None:
+                chunks = self.profiler.timed_iter("load", chunks)
+        if self.profiler is not None:
+            strategy = self.profiler.wrap_strategy(strategy)
+
+        # купа (бар виходу, порядковий номер, ціна виходу, причина, ордер)
+        exits = []
+        # ордери, чий вихід лежить за межами поточної порції
+        waiting = []
+        # індекс першого бару, який ще не оброблено
+        start = 0
+        last_close = None
+        # угоди журналу, вже передані в контрольну точку як завершені
+        self._journal_sent = 0
+        state = self._restore_checkpoint() if resume else None
+        if state is not None:
+            exits, waiting = state["exits"], state["waiting"]
+            start, last_close = state["index"], state["last_close"]
+            first_trade, start_balance = state["first_trade"], state["start_balance"]
+
+        writer = None
+        next_checkpoint = None
+        if self.checkpoint_path is not None:
+            chunks_written = state["journal_chunks"] if state is not None else ()
+            writer = CheckpointWriter(self.checkpoint_path, chunks_written)
+            next_checkpoint = start + self.checkpoint_every
+
+        offset = 0
+        try:
+            for data in chunks:
+                size = len(data)
+                if offset + size <= start:  # порція оброблена до контрольної точки
+                    offset += size
+                    continue
+                resolved, waiting = resolve_exits(
+                    data, offset, waiting, self.close_after_bars, self.intrabar_exits
                 )
-                if ok:
-                    order["open_index"] = i  # зберігаємо індекс бару відкриття
-                    open_orders.append(order)
-                    self.trades_log.append(order)
+                for item in resolved:
+                    heapq.heappush(exits, item)
+
+                for i in range(max(start - offset, 0), size):
+                    price = self._process_bar(data, offset, i, strategy, exits, waiting)
+                    if (
+                        next_checkpoint is not None
+                        and offset + i + 1 >= next_checkpoint
+                    ):
+                        writer.submit(
+                            *self._checkpoint_state(
+                                offset + i + 1,
+                                price,
+                                exits,
+                                waiting,
+                                first_trade,
+                                start_balance,
+                            )
+                        )
+                        next_checkpoint += self.checkpoint_every
+
+                offset += size
+                if size:
+                    last_close = float(data.close[-1])
+        finally:
+            if writer is not None:
+                writer.close()
+
+        # Ордери без виходу до кінця даних закриваються за останньою ціною
+        for seq, order, _ in waiting:
+            heapq.heappush(exits, (offset, seq, last_close, EXIT_END, order))
 
         # Закриття всіх відкритих ордерів у кінці тесту
-        for order in open_orders:
-            self.execution.close_order(order["id"], exit_price=data[-1]["close"])
-        open_orders.clear()
+        while exits:
+            self._close_exit(heapq.heappop(exits))
 
+        if self.checkpoint_path is not None:
+            self.checkpoint_path.unlink(missing_ok=True)
+        self._save_result(key, first_trade, start_balance)
         return self.trades_log
+
+    def _process_bar(
+        self, data: BarSeries, offset: int, i: int, strategy, exits, waiting
+    ) -> float:
+        """
+        Обробляє бар i порції: закриває ордери, чий вихід настав, передає бар
+        стратегії і відкриває ордер за сигналом. Повертає ціну закриття бару.
+        """
+        index = offset + i
+        price = float(data.close[i])
+
+        # Закриття ордерів, чий бар виходу настав (у порядку відкриття)
+        while exits and exits[0][0] <= index:
+            self._close_exit(heapq.heappop(exits))
+
+        # Генерація сигнала від стратегії
+        signal = strategy.on_bar(data[i])
+        if signal:
+            side, stop_loss, take_profit = signal
+
+            # Посилання ордера на виконання
+            ok, order = self.execution.submit_order(
+                symbol="TEST",
+                side=side,
+                price=price,
+                stop_loss=stop_loss,
+                take_profit=take_profit,
+                trade_date=bar_date(data.time[i]),  # денний ліміт за датою бару
+            )
+            if ok:
+                order["open_index"] = index  # індекс бару відкриття
+                new, left = resolve_exits(
+                    data,
+                    offset,
+                    [(len(self.trades_log), order, index)],
+                    self.close_after_bars,
+                    self.intrabar_exits,
+                )
+                for item in new:
+                    heapq.heappush(exits, item)
+                waiting.extend(left)
+                self.trades_log.append(order)
+        return price
+
+    # -----------------------------
+    # Контрольні точки
+    # -----------------------------
+    def _checkpoint_settings(self) -> dict:
+        """Налаштування, з якими знімок сумісний."""
+        strategy = type(self.strategy)
+        return {
+            "data_file": str(self.data_file),
+            "strategy": f"{strategy.__module__}.{strategy.__qualname__}",
+            "close_after_bars": self.close_after_bars,
+            "intrabar_exits": self.intrabar_exits,
+            "timeframe": self.timeframe,
+        }
+
+    def _checkpoint_state(
+        self,
+        index: int,
+        last_close: float,
+        exits: list,
+        waiting: list,
+        first_trade: int,
+        start_balance: float,
+    ) -> tuple[bytes, list]:
+        """
+        Знімок прогону після бару index - 1: (серіалізований стан, нові
+        завершені угоди для журналу CheckpointWriter).
+
+        Завершені угоди з початку журналу більше не змінюються, тому
+        не серіалізуються тут: у стан іде лише хвіст журналу від першої
+        відкритої угоди (він спільний з купою виходів і active_orders).
+        """
+        log = self.trades_log
+        sent = end = self._journal_sent
+        while end < len(log) and log[end].status != "OPEN":
+            end += 1
+        self._journal_sent = end
+        payload = dump_state(
+            {
+                "settings": self._checkpoint_settings(),
+                "index": index,
+                "last_close": last_close,
+                "exits": exits,
+                "waiting": waiting,
+                "trades_tail": log[end:],
+                "active_orders": self.execution.active_orders,
+                "next_order_id": self.execution.next_order_id,
+                "risk": risk_state(self.risk_manager),
+                "strategy": self.strategy,
+                "first_trade": first_trade,
+                "start_balance": start_balance,
+            }
+        )
+        return payload, log[sent:end]
+
+    def _restore_checkpoint(self) -> dict | None:
+        """
+        Відновлює журнал угод, відкриті ордери, RiskManager і стан стратегії
+        з checkpoint_path. Повертає знімок або None, якщо його немає.
+        """
+        if self.checkpoint_path is None:
+            raise ValueError("resume requires checkpoint_path")
+        state = load_checkpoint(self.checkpoint_path)
+        if state is None:
+            return None
+        if state["settings"] != self._checkpoint_settings():
+            raise ValueError(
+                f"Checkpoint {self.checkpoint_path} belongs to another backtest"
+            )
+        self.trades_log = state["journal"] + state["trades_tail"]
+        self._journal_sent = len(state["journal"])
+        self.execution.active_orders = state["active_orders"]
+        self.execution.next_order_id = state["next_order_id"]
+        apply_risk_state(self.risk_manager, state["risk"])
+        # стан переноситься в той самий об'єкт стратегії, що й у виклику
+        vars(self.strategy).update(vars(state["strategy"]))
+        return state
+
+    # -----------------------------
+    # Кеш результатів
+    # -----------------------------
+    def _result_key(self, source, **engine) -> str | None:
+        """
+        Ключ результату в result_cache (None, якщо кеш вимкнено або стан
+        стратегії не серіалізується).
+        """
+        if self.result_cache is None:
+            return None
+        strategy = strategy_fingerprint(self.strategy)
+        if strategy is None:
+            return None
+        settings = {
+            "class": type(self).__qualname__,
+            "close_after_bars": self.close_after_bars,
+            "intrabar_exits": self.intrabar_exits,
+            "timeframe": self.timeframe,
+            **engine,
+        }
+        return result_key(
+            data_hash(source),
+            strategy,
+            risk_fingerprint(self.risk_manager),
+            settings,
+        )
+
+    def _load_result(self, key: str | None) -> bool:
+        """Підставляє збережений результат: журнал угод і стан RiskManager."""
+        cached = self.result_cache.get(key) if key else None
+        if cached is None:
+            return False
+        self.trades_log.extend(Order(trade) for trade in cached.trades)
+        apply_risk_state(self.risk_manager, cached.state)
+        return True
+
+    def _save_result(
+        self, key: str | None, first_trade: int, start_balance: float
+    ) -> None:
+        """Зберігає угоди цього прогону, метрики і стан RiskManager."""
+        if key is None:
+            return
+        trades = self.trades_log[first_trade:]
+        self.result_cache.put(
+            key,
+            trades,
+            summarize_trades(trades, start_balance),
+            risk_state(self.risk_manager),
+        )
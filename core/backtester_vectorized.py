@@ -0,0 +1,277 @@
+# core\backtester_vectorized.py
+
+"""
+Векторний режим бек-тесту для SMAStrategy.
+
+VectorizedBacktester:
+- Обчислює швидку і повільну SMA, точки перетину, ціни входу, рівні SL/TP
+  та бари виходу (з торканням SL/TP) цілими масивами NumPy — без
+  Python-колбеків на кожен бар.
+- Розмір позиції і баланс рахуються через той самий RiskManager, що й
+  у Backtester.run, але цикл іде лише по сигналах, а не по барах.
+- Повертає журнал угод у форматі Backtester.run (з порядковими id замість
+  uuid), тому результати можна порівнювати угода в угоду.
+"""
+
+import heapq
+
+import numpy as np
+
+from core.backtester import Backtester
+from core.bar_data import BarSeries, bar_date
+from core.checkpoint import CHECKPOINT_EVERY
+from core.execution import Order
+from core.indicator_cache import IndicatorCache, default_cache
+from core.indicators import sma
+from core.intrabar_exits import (
+    EXIT_END,
+    EXIT_STOP_LOSS,
+    EXIT_TAKE_PROFIT,
+    EXIT_TIME,
+    find_first_touch,
+)
+
+LONG = 1
+SHORT = -1
+
+
+# ковзне середнє з тими самими числами, що й SMAStrategy.on_bar (RollingSMA)
+rolling_mean = sma
+
+
+def sma_cross_signals(
+    closes: np.ndarray,
+    sma_fast: int,
+    sma_slow: int,
+    cache: IndicatorCache | None = None,
+) -> np.ndarray:
+    """
+    Повертає масив напрямків сигналу по барах: 1 (long), -1 (short), 0.
+
+    Логіка збігається з SMAStrategy: перше значення SMA (бар sma_slow - 1)
+    лише запам'ятовується, сигнали можливі з бару sma_slow.
+
+    :param cache: Кеш індикаторів — SMA беруться з нього (і туди ж
+        записуються), тож набори з тими самими періодами не рахують їх знову.
+    """
+    if cache is None:
+        fast = sma(closes, sma_fast)
+        slow = sma(closes, sma_slow)
+    else:
+        fast = cache.sma(closes, sma_fast)
+        slow = cache.sma(closes, sma_slow)
+
+    signals = np.zeros(len(closes), dtype=np.int8)
+    if len(closes) <= sma_slow:
+        return signals
+
+    prev_fast, prev_slow = fast[sma_slow - 1 : -1], slow[sma_slow - 1 : -1]  # noqa
+    cur_fast, cur_slow = fast[sma_slow:], slow[sma_slow:]
+
+    long_mask = (prev_fast <= prev_slow) & (cur_fast > cur_slow)
+    short_mask = ~long_mask & (prev_fast >= prev_slow) & (cur_fast < cur_slow)
+    signals[sma_slow:][long_mask] = LONG
+    signals[sma_slow:][short_mask] = SHORT
+    return signals
+
+
+class VectorizedBacktester(Backtester):
+    """
+    Бек-тест SMAStrategy цілими масивами.
+
+    Приймає ті самі аргументи, що й Backtester, крім контрольних точок
+    і профілювання (checkpoint_path, checkpoint_every, profiler —
+    ValueError); стратегія має надавати атрибути sma_fast, sma_slow,
+    sl_coef, rr_ratio (як SMAStrategy).
+
+    Ряди SMA беруться з indicator_cache (None — спільний кеш процесу,
+    core.indicator_cache.default_cache).
+    """
+
+    indicator_cache: IndicatorCache | None = None
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if self.checkpoint_path is not None or self.profiler is not None:
+            raise ValueError(
+                "VectorizedBacktester does not support checkpoints or profiling"
+            )
+        if self.checkpoint_every != CHECKPOINT_EVERY:
+            raise ValueError("VectorizedBacktester does not support checkpoint_every")
+
+    def run(
+        self,
+        chunk_size: int | None = None,
+        resume: bool = False,
+        *,
+        data: BarSeries | None = None,
+        symbol: str = "TEST",
+        warmup: int = 0,
+        signals: np.ndarray | None = None,
+    ):
+        """
+        Запускає векторний бек-тест.
+
+        Логіка:
+        - Векторно знаходить бари перетину SMA і напрямок угоди.
+        - Векторно рахує ціни входу, SL/TP, бар і ціну виходу: перше
+          торкання SL/TP (find_first_touch) або через close_after_bars барів.
+        - По сигналах по черзі закриває угоди, що вже вийшли, і перевіряє
+          нові через RiskManager.validate_order (розмір, просадка, ліміти).
+
+        :param chunk_size: Потоковий режим не підтримується (лише None).
+        :param resume: Відновлення з контрольної точки не підтримується.
+        :param data: Вже завантажена BarSeries (інакше читається data_file).
+        :param symbol: Символ для записів у журналі угод.
+        :param warmup: Кількість початкових барів лише для розгону SMA —
+            сигнали на них ігноруються (для вікон walk-forward).
+        :param signals: Готові сигнали по барах для параметрів цієї стратегії
+            (рядок core.signal_batch.sma_cross_matrix) замість обчислення SMA.
+        :return: Список угод у форматі Backtester.run.
+        """
+        if chunk_size is not None or resume:
+            raise ValueError("VectorizedBacktester does not support chunk_size/resume")
+        key = self._result_key(
+            self.data_file if data is None else data, symbol=symbol, warmup=warmup
+        )
+        if self._load_result(key):
+            return self.trades_log
+        first_trade = len(self.trades_log)
+        start_balance = self.risk_manager.balance
+
+        if data is None:
+            data = self.load_data()
+        closes = data.close
+        size = len(closes)
+        if size == 0:
+            return self.trades_log
+
+        strategy = self.strategy
+        if signals is None:
+            cache = self.indicator_cache
+            if cache is None:
+                cache = default_cache()
+            signals = sma_cross_signals(
+                closes, strategy.sma_fast, strategy.sma_slow, cache=cache
+            )
+        elif len(signals) != size:
+            raise ValueError("signals length must match the number of bars")
+        entry_index = np.flatnonzero(signals[warmup:]) + warmup
+        direction = signals[entry_index].astype(np.float64)
+
+        # --- ціни входу і рівні SL/TP ---
+        entry_price = closes[entry_index]
+        stop_loss = entry_price * (1 - direction * strategy.sl_coef)
+        take_profit = entry_price + (entry_price - stop_loss) * strategy.rr_ratio
+
+        # --- бари та ціни виходу ---
+        # size означає "після останнього бару" (закриття наприкінці тесту)
+        hold = max(int(self.close_after_bars), 1)
+        exit_index = entry_index + hold
+        exit_index[exit_index >= size] = size
+        exit_price = closes[np.minimum(exit_index, size - 1)]
+        reason = np.where(exit_index < size, EXIT_TIME, EXIT_END)
+
+        # --- внутрішньобарове торкання SL/TP (як schedule_exit у Backtester) ---
+        if self.intrabar_exits:
+            hit_index, hit_price, is_stop = find_first_touch(
+                data.open,
+                data.high,
+                data.low,
+                entry_index,
+                direction,
+                stop_loss,
+                take_profit,
+                np.minimum(entry_index + hold, size - 1),
+            )
+            hit = hit_index >= 0
+            exit_index = np.where(hit, hit_index, exit_index)
+            exit_price = np.where(hit, hit_price, exit_price)
+            reason = np.where(
+                hit, np.where(is_stop, EXIT_STOP_LOSS, EXIT_TAKE_PROFIT), reason
+            )
+        stop_distance = np.abs(entry_price - stop_loss)
+
+        self._apply_risk(
+            symbol,
+            data.time,
+            entry_index.tolist(),
+            direction.tolist(),
+            entry_price.tolist(),
+            stop_loss.tolist(),
+            take_profit.tolist(),
+            stop_distance.tolist(),
+            exit_index.tolist(),
+            exit_price.tolist(),
+            reason.tolist(),
+        )
+        self._save_result(key, first_trade, start_balance)
+        return self.trades_log
+
+    def _apply_risk(
+        self,
+        symbol,
+        times,
+        entry_index,
+        direction,
+        entry_price,
+        stop_loss,
+        take_profit,
+        stop_distance,
+        exit_index,
+        exit_price,
+        reason,
+    ) -> None:
+        """
+        Послідовно проводить сигнали через RiskManager.
+
+        Розмір позиції залежить від балансу після попередніх угод,
+        тому цей крок іде по сигналах (їх набагато менше, ніж барів).
+        Денний ліміт угод рахується за датою бару входу (times[i]).
+        """
+        rm = self.risk_manager
+        # купа (бар виходу, порядковий номер, ціна виходу, причина, угода)
+        exits = []
+
+        for k, i in enumerate(entry_index):
+            # Закриття угод, чий бар виходу настав до сигналу
+            while exits and exits[0][0] <= i:
+                self._close_exit(heapq.heappop(exits))
+
+            price = entry_price[k]
+            valid, info = rm.validate_order(stop_distance[k], price, bar_date(times[i]))
+            if not valid:
+                continue
+
+            order = Order(
+                id=len(self.trades_log) + 1,
+                symbol=symbol,
+                side="long" if direction[k] > 0 else "short",
+                price=price,
+                size=info,
+                stop_loss=stop_loss[k],
+                take_profit=take_profit[k],
+                status="OPEN",
+                open_index=i,
+            )
+            heapq.heappush(
+                exits,
+                (exit_index[k], len(self.trades_log), exit_price[k], reason[k], order),
+            )
+            self.trades_log.append(order)
+
+        # Закриття решти угод (у т.ч. наприкінці тесту)
+        while exits:
+            self._close_exit(heapq.heappop(exits))
+
+    def _close_order(
+        self, exit_price: float, reason: str, order: Order, exit_index: int
+    ) -> None:
+        """Закриває угоду так само, як ExecutionEngine.close_order."""
+        if order.side == "long":
+            pnl = (exit_price - order.price) * order.size
+        else:
+            pnl = (order.price - exit_price) * order.size
+        order.status = "CLOSED"
+        self._record_exit(order, exit_index, exit_price, reason, pnl)
+        self.risk_manager.register_trade(pnl)
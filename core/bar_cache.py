@@ -0,0 +1,163 @@
+# core\bar_cache.py
+
+"""
+Бінарний кеш розібраних CSV з барами.
+
+Перше завантаження CSV записує поруч два файли:
+- <name>.cache.npy — колонки BarSeries одним масивом (6, n) float64:
+  рядок 0 — час (біти int64), рядки 1..5 — open, high, low, close, volume;
+- <name>.cache.json — ключ кешу: розмір і mtime CSV, хеш вмісту, версія.
+
+Наступні завантаження відкривають .npy через mmap: колонки BarSeries
+є представленнями файлу без копіювання і без розбору тексту.
+Якщо розмір або mtime CSV змінилися, перевіряється хеш вмісту;
+при розбіжності кеш перебудовується автоматично.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+
+from core.bar_data import BAR_FIELDS, BarSeries
+
+CACHE_VERSION = 1
+CACHE_SUFFIX = ".cache.npy"
+META_SUFFIX = ".cache.json"
+HASH_BLOCK = 1 << 20
+
+
+def cache_paths(csv_path: str | Path) -> tuple[Path, Path]:
+    """Шляхи до файлу даних і файлу ключа кешу для CSV."""
+    csv_path = Path(csv_path)
+    return (
+        csv_path.with_name(csv_path.name + CACHE_SUFFIX),
+        csv_path.with_name(csv_path.name + META_SUFFIX),
+    )
+
+
+def content_hash(path: str | Path) -> str:
+    """BLAKE2b-хеш вмісту файлу (читання блоками)."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_BLOCK), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _file_key(path: Path) -> dict:
+    stat = path.stat()
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def save_cache(series: BarSeries, csv_path: str | Path) -> bool:
+    """
+    Записує кеш для CSV. Запис атомарний (тимчасовий файл + os.replace),
+    тому паралельні процеси не бачать напівзаписаний кеш.
+    Повертає False, якщо записати не вдалося (напр. тека лише для читання).
+    """
+    csv_path = Path(csv_path)
+    data_path, meta_path = cache_paths(csv_path)
+    columns = np.empty((len(BAR_FIELDS), len(series)), dtype=np.float64)
+    columns[0] = series.time.view(np.float64)
+    for row, name in enumerate(BAR_FIELDS[1:], start=1):
+        columns[row] = getattr(series, name)
+
+    meta = {
+        "version": CACHE_VERSION,
+        **_file_key(csv_path),
+        "hash": content_hash(csv_path),
+        "rows": len(series),
+    }
+    suffix = f".{os.getpid()}.tmp"
+    try:
+        with open(data_path.with_name(data_path.name + suffix), "wb") as f:
+            np.save(f, columns)
+        os.replace(data_path.with_name(data_path.name + suffix), data_path)
+        meta_tmp = meta_path.with_name(meta_path.name + suffix)
+        meta_tmp.write_text(json.dumps(meta), encoding="utf-8")
+        os.replace(meta_tmp, meta_path)
+    except OSError:
+        return False
+    return True
+
+
+def _read_meta(meta_path: Path) -> dict | None:
+    try:
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(meta, dict) or meta.get("version") != CACHE_VERSION:
+        return None
+    return meta
+
+
+def cached_content_hash(csv_path: str | Path) -> str:
+    """
+    Хеш вмісту CSV: з ключа кешу, якщо розмір і mtime не змінилися,
+    інакше файл хешується заново.
+    """
+    csv_path = Path(csv_path)
+    meta = _read_meta(cache_paths(csv_path)[1])
+    if meta is not None and _file_key(csv_path) == {
+        "size": meta["size"],
+        "mtime_ns": meta["mtime_ns"],
+    }:
+        return meta["hash"]
+    return content_hash(csv_path)
+
+
+def open_cache(csv_path: str | Path) -> BarSeries | None:
+    """
+    Відкриває актуальний кеш CSV через mmap (без копіювання колонок).
+
+    Ключ перевіряється за розміром і mtime; якщо вони змінилися, а хеш
+    вмісту той самий (файл лише «торкнули»), ключ оновлюється.
+    Повертає None, якщо кешу немає або він застарів.
+    """
+    csv_path = Path(csv_path)
+    data_path, meta_path = cache_paths(csv_path)
+    meta = _read_meta(meta_path)
+    if meta is None or not data_path.exists():
+        return None
+
+    key = _file_key(csv_path)
+    if key["size"] != meta["size"]:
+        return None
+    if key["mtime_ns"] != meta["mtime_ns"]:
+        if content_hash(csv_path) != meta["hash"]:
+            return None
+        try:
+            meta_path.write_text(json.dumps({**meta, **key}), encoding="utf-8")
+        except OSError:
+            pass
+
+    try:
+        columns = np.load(data_path, mmap_mode="r")
+    except (OSError, ValueError):
+        return None
+    if columns.shape != (len(BAR_FIELDS), meta["rows"]):
+        return None
+    return BarSeries(columns[0].view(np.int64), *columns[1:])
+
+
+def load_cached_bars(csv_path: str | Path, use_cache: bool = True) -> BarSeries:
+    """
+    Завантажує BarSeries з CSV через бінарний кеш.
+
+    :param csv_path: Шлях до CSV з барами.
+    :param use_cache: False — завжди розбирати CSV (без читання/запису кешу).
+    """
+    if use_cache:
+        series = open_cache(csv_path)
+        if series is not None:
+            return series
+
+    series = BarSeries.from_csv(csv_path)
+    if use_cache:
+        save_cache(series, csv_path)
+    return series
@@ -0,0 +1,263 @@
+# core\bar_data.py
+"""
+Колонкове сховище барів (OHLCV) для Backtester, стратегій і моніторів.
+
+BarSeries:
+- Тримає ціни у суцільних масивах float64, а час — у int64 (секунди epoch).
+- Завантажується з CSV одним векторизованим проходом (np.loadtxt)
+  або порціями (iter_bar_chunks) для файлів, що не вміщаються в пам'ять.
+- Зріз series[a:b] повертає вікно-представлення без копіювання даних.
+- series[i] повертає легкий рядок Bar, сумісний зі словником
+  (candle["close"], candle["time"] тощо).
+"""
+
+from __future__ import annotations
+
+import datetime
+import itertools
+from collections.abc import Mapping
+from pathlib import Path
+
+import numpy as np
+
+BAR_CHUNK = 100_000
+BAR_FIELDS = ("time", "open", "high", "low", "close", "volume")
+PRICE_FIELDS = ("open", "high", "low", "close", "volume")
+EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+SECONDS_PER_DAY = 86_400
+
+
+def _csv_layout(path) -> tuple[list, list[int]]:
+    """
+    Читає заголовок CSV і повертає (dtype, usecols) для np.loadtxt.
+    Потрібні колонки time,open,high,low,close; volume — необов'язкова.
+    """
+    path = Path(path)
+    with open(path, "r", encoding="utf-8") as f:
+        header = [h.strip() for h in f.readline().split(",")]
+
+    missing = [name for name in BAR_FIELDS[:5] if name not in header]
+    if missing:
+        raise ValueError(f"CSV {path.name} has no columns: {missing}")
+
+    fields = [name for name in BAR_FIELDS if name in header]
+    dtype = [(name, "datetime64[s]" if name == "time" else "f8") for name in fields]
+    return dtype, [header.index(name) for name in fields]
+
+
+def _time_to_str(value) -> str:
+    """Перетворює int64-час (секунди epoch) у рядок ISO."""
+    return str(np.datetime64(int(value), "s"))
+
+
+def bar_date(timestamp: int) -> datetime.date:
+    """Дата бару (UTC) з часу в секундах epoch — для денного ліміту угод."""
+    return datetime.date.fromordinal(EPOCH_ORDINAL + int(timestamp) // SECONDS_PER_DAY)
+
+
+class Bar(Mapping):
+    """
+    Представлення одного бару всередині BarSeries (без копіювання).
+
+    Поводиться як словник з ключами 'time', 'open', 'high', 'low',
+    'close', 'volume', тому існуючий код на кшталт candle["close"]
+    працює без змін.
+    """
+
+    __slots__ = ("_series", "_index")
+
+    def __init__(self, series: "BarSeries", index: int):
+        self._series = series
+        self._index = index
+
+    @property
+    def index(self) -> int:
+        """Індекс бару всередині батьківської серії."""
+        return self._index
+
+    @property
+    def series(self) -> "BarSeries":
+        """Батьківська серія, до якої належить бар."""
+        return self._series
+
+    def __getitem__(self, key: str):
+        if key == "time":
+            return _time_to_str(self._series.time[self._index])
+        if key in PRICE_FIELDS:
+            return getattr(self._series, key)[self._index]
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(BAR_FIELDS)
+
+    def __len__(self) -> int:
+        return len(BAR_FIELDS)
+
+    def to_dict(self) -> dict:
+        """Повертає бар як звичайний словник (копія значень)."""
+        return {key: self[key] for key in BAR_FIELDS}
+
+    def __repr__(self) -> str:
+        return f"Bar({self.to_dict()})"
+
+
+class BarSeries:
+    """
+    Колонковий контейнер барів.
+
+    Атрибути:
+        time (np.ndarray[int64]): час відкриття бару, секунди epoch.
+        open, high, low, close, volume (np.ndarray[float64]): ціни та обсяг.
+        origin (tuple | None): Для вікна — (коренева серія, індекс початку
+            в ній); None для серії з власними даними.
+    """
+
+    __slots__ = ("time", "open", "high", "low", "close", "volume", "origin")
+
+    def __init__(self, time, open_, high, low, close, volume=None):
+        self.time = np.ascontiguousarray(time, dtype=np.int64)
+        self.open = np.ascontiguousarray(open_, dtype=np.float64)
+        self.high = np.ascontiguousarray(high, dtype=np.float64)
+        self.low = np.ascontiguousarray(low, dtype=np.float64)
+        self.close = np.ascontiguousarray(close, dtype=np.float64)
+        if volume is None:
+            volume = np.zeros(len(self.close), dtype=np.float64)
+        self.volume = np.ascontiguousarray(volume, dtype=np.float64)
+
+        self.origin = None
+
+        size = len(self.close)
+        for name in BAR_FIELDS:
+            if len(getattr(self, name)) != size:
+                raise ValueError(f"Column '{name}' length mismatch")
+
+    def __reduce__(self):
+        # колонки вікна серіалізуються як власні дані, без кореневої серії
+        return BarSeries, tuple(getattr(self, name) for name in BAR_FIELDS)
+
+    # -----------------------------
+    # Завантаження
+    # -----------------------------
+    @classmethod
+    def from_csv(cls, path) -> "BarSeries":
+        """
+        Завантажує CSV з заголовком time,open,high,low,close[,volume].
+
+        Весь файл розбирається за один прохід C-парсером NumPy
+        у структурований масив, після чого колонки стають суцільними.
+        """
+        dtype, usecols = _csv_layout(path)
+        raw = np.loadtxt(
+            path, delimiter=",", skiprows=1, usecols=usecols, dtype=dtype, ndmin=1
+        )
+        return cls._from_raw(raw)
+
+    @classmethod
+    def _from_raw(cls, raw) -> "BarSeries":
+        """Серія зі структурованого масиву, розібраного з CSV."""
+        return cls(
+            time=raw["time"].astype(np.int64),
+            open_=raw["open"],
+            high=raw["high"],
+            low=raw["low"],
+            close=raw["close"],
+            volume=raw["volume"] if "volume" in raw.dtype.names else None,
+        )
+
+    @classmethod
+    def from_records(cls, records) -> "BarSeries":
+        """Створює серію зі списку словників (старий формат load_data)."""
+        records = list(records)
+        times = np.array([r["time"] for r in records], dtype="datetime64[s]")
+        return cls(
+            time=times.astype(np.int64),
+            open_=[r["open"] for r in records],
+            high=[r["high"] for r in records],
+            low=[r["low"] for r in records],
+            close=[r["close"] for r in records],
+            volume=[r.get("volume", 0.0) for r in records],
+        )
+
+    # -----------------------------
+    # Доступ до рядків і вікон
+    # -----------------------------
+    def __len__(self) -> int:
+        return len(self.close)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return self.window(key.start, key.stop, key.step)
+        index = int(key)
+        size = len(self.close)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("BarSeries index out of range")
+        return Bar(self, index)
+
+    def __iter__(self):
+        for i in range(len(self.close)):
+            yield Bar(self, i)
+
+    def window(self, start=None, stop=None, step=None) -> "BarSeries":
+        """Повертає вікно барів як представлення (NumPy-view, без копії)."""
+        key = slice(start, stop, step)
+        series = BarSeries(
+            self.time[key],
+            self.open[key],
+            self.high[key],
+            self.low[key],
+            self.close[key],
+            self.volume[key],
+        )
+        if step is None or step == 1:
+            root, offset = self.origin or (self, 0)
+            series.origin = (root, offset + key.indices(len(self.close))[0])
+        return series
+
+    def to_records(self) -> list[dict]:
+        """Повертає список словників (для сумісності та налагодження)."""
+        return [bar.to_dict() for bar in self]
+
+    @property
+    def nbytes(self) -> int:
+        """Сумарний розмір колонок у байтах."""
+        return sum(getattr(self, name).nbytes for name in BAR_FIELDS)
+
+    def __repr__(self) -> str:
+        return f"BarSeries(bars={len(self)})"
+
+
+def load_bars(path) -> BarSeries:
+    """Зручна обгортка над BarSeries.from_csv."""
+    return BarSeries.from_csv(path)
+
+
+def iter_bar_chunks(path, chunk_size: int = BAR_CHUNK):
+    """
+    Генерує файл CSV порціями BarSeries по chunk_size барів.
+
+    У пам'яті одночасно лише одна порція (рядки читаються через islice
+    і розбираються np.loadtxt), тому пікове споживання не залежить
+    від довжини файлу.
+    """
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+    dtype, usecols = _csv_layout(path)
+    with open(path, "r", encoding="utf-8") as f:
+        f.readline()  # заголовок
+        while True:
+            lines = list(itertools.islice(f, chunk_size))
+            if not lines:
+                return
+            raw = np.loadtxt(
+                lines, delimiter=",", usecols=usecols, dtype=dtype, ndmin=1
+            )
+            if len(raw):
+                yield BarSeries._from_raw(raw)
+
+
+def iter_bars(path, chunk_size: int = BAR_CHUNK):
+    """Генерує бари CSV по одному (Bar), читаючи файл порціями."""
+    for chunk in iter_bar_chunks(path, chunk_size):
+        yield from chunk
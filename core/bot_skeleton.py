@@ -8,6 +8,8 @@ import asyncio
 
 import ccxt.async_support as ccxt  # для асинхронних бірж через CCXT
 
+from core.indicators import RollingSMA
+
 
 class DataFeed:
     """Забезпечує отримання OHLCV-даних із біржі."""
@@ -21,19 +23,35 @@ class DataFeed:
 
 
 class Strategy:
-    """Проста стратегія EMA crossover (демо)."""
+    """Проста стратегія MA crossover (демо)."""
 
     def __init__(self):
-        pass
+        # середні оновлюються лише новими барами кожного опитування
+        self.short = RollingSMA(9)
+        self.long = RollingSMA(21)
+        self.bars = 0
+        self.last_time = None
 
     def signal(self, ohlcv):  # noqa
         """Повертає торговий сигнал: 'buy', 'sell' або None."""
-        closes = [c[4] for c in ohlcv]
-        if len(closes) < 50:
+        for candle in ohlcv:
+            close = float(candle[4])
+            if self.last_time is not None and candle[0] < self.last_time:
+                continue  # бар уже врахований
+            if candle[0] == self.last_time:
+                # останній бар ще формується — оновлюємо його закриття
+                self.short.replace(close)
+                self.long.replace(close)
+                continue
+            self.short.update(close)
+            self.long.update(close)
+            self.bars += 1
+            self.last_time = candle[0]
+        if self.bars < 50:
             return None
 
-        short = sum(closes[-9:]) / 9
-        long = sum(closes[-21:]) / 21
+        short = self.short.value
+        long = self.long.value
 
         if short > long:
             return "buy"
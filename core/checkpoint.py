@@ -0,0 +1,160 @@
+# core\checkpoint.py
+
+"""
+Контрольні точки довгих бек-тестів.
+
+Знімок складається з двох частин:
+- стан (індекс наступного бару, відкриті ордери, купа виходів, стан
+  RiskManager і стратегії, хвіст журналу з відкритими угодами) —
+  серіалізується pickle в основному потоці; він малий і ще змінюватиметься;
+- журнал завершених угод — незмінний, тому в основному потоці лише
+  передається список нових угод з останнього знімка, а серіалізує їх
+  (раз, окремою порцією) фоновий потік CheckpointWriter.
+Запис у файл (тимчасовий файл + os.replace) теж виконує фоновий потік;
+якщо попередній знімок ще пишеться, у черзі лишається лише найновіший
+стан (нові угоди всіх поданих знімків накопичуються).
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import pickle
+import threading
+from pathlib import Path
+
+CHECKPOINT_VERSION = 4
+# типовий інтервал контрольних точок, барів
+CHECKPOINT_EVERY = 100_000
+
+logger = logging.getLogger(__name__)
+
+
+def dump_state(state: dict) -> bytes:
+    """Серіалізує знімок стану (спільні об'єкти, напр. ордери, зберігаються раз)."""
+    return pickle.dumps(
+        {"version": CHECKPOINT_VERSION, **state}, protocol=pickle.HIGHEST_PROTOCOL
+    )
+
+
+def pack_checkpoint(payload: bytes, journal_chunks=()) -> bytes:
+    """Вміст файлу: серіалізований стан і порції журналу (вже серіалізовані)."""
+    return pickle.dumps(
+        {
+            "version": CHECKPOINT_VERSION,
+            "state": payload,
+            "journal": list(journal_chunks),
+        },
+        protocol=pickle.HIGHEST_PROTOCOL,
+    )
+
+
+def write_checkpoint(path: str | Path, payload: bytes) -> None:
+    """Атомарно записує знімок: читач бачить або старий, або новий файл."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp, "wb") as f:
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def load_checkpoint(path: str | Path) -> dict | None:
+    """
+    Читає знімок стану.
+
+    Повертає стан з двома додатковими ключами: 'journal' — завершені угоди
+    (у порядку журналу) і 'journal_chunks' — їхні серіалізовані порції
+    (для продовження запису, CheckpointWriter(journal_chunks=...)).
+    None, якщо файлу немає, він пошкоджений або іншої версії.
+    Відкривайте лише власні контрольні точки: pickle виконує код під час
+    читання.
+    """
+    try:
+        with open(path, "rb") as f:
+            packed = pickle.load(f)
+        if not isinstance(packed, dict) or packed.get("version") != CHECKPOINT_VERSION:
+            return None
+        chunks = packed["journal"]
+        state = pickle.loads(packed["state"])
+        journal = [trade for chunk in chunks for trade in pickle.loads(chunk)]
+    except (OSError, EOFError, KeyError, TypeError, pickle.UnpicklingError):
+        return None
+    if not isinstance(state, dict):
+        return None
+    state["journal"] = journal
+    state["journal_chunks"] = chunks
+    return state
+
+
+class CheckpointWriter:
+    """
+    Фоновий запис контрольних точок в один файл.
+
+    submit() повертається одразу; потік серіалізує нові угоди журналу
+    і пише найновіший поданий стан. close() дочікується запису останнього
+    знімка.
+
+    :param journal_chunks: Уже записані порції журналу (при продовженні
+        з контрольної точки — load_checkpoint(...)["journal_chunks"]).
+    """
+
+    def __init__(self, path: str | Path, journal_chunks=()):
+        self.path = Path(path)
+        self.error: BaseException | None = None
+        self._chunks: list[bytes] = list(journal_chunks)
+        self._pending: bytes | None = None
+        self._pending_journal: list = []
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(
+            target=self._loop, name="checkpoint-writer", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, payload: bytes, journal=()) -> None:
+        """
+        Ставить знімок у чергу (стан замінює ще не записаний попередній).
+
+        :param journal: Нові завершені угоди з попереднього знімка; потік
+            лише читає їх, тож після submit вони не повинні змінюватися.
+        """
+        with self._cond:
+            self._pending = payload
+            self._pending_journal.extend(journal)
+            self._cond.notify()
+
+    def _loop(self) -> None:
+        while True:
+            with self._cond:
+                while self._pending is None and not self._closed:
+                    self._cond.wait()
+                payload, self._pending = self._pending, None
+                journal, self._pending_journal = self._pending_journal, []
+                if payload is None:
+                    return
+            if journal:
+                self._chunks.append(
+                    pickle.dumps(journal, protocol=pickle.HIGHEST_PROTOCOL)
+                )
+            try:
+                write_checkpoint(self.path, pack_checkpoint(payload, self._chunks))
+            except OSError as e:
+                # невдалий знімок не зупиняє бек-тест; наступний спробує знову
+                self.error = e
+                logger.warning("Checkpoint write failed: %s", e)
+
+    def close(self) -> None:
+        """Записує останній знімок і зупиняє потік."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
+
+    def __enter__(self) -> "CheckpointWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -42,6 +42,7 @@ DEFAULT_TRADE_TEMPLATE: Dict[str, Any] = {
 
 # --- Параметри стратегії ---
 STRATEGY: Dict[str, Any] = {
+    "name": "sma",  # ім'я в реєстрі strategies.registry
     "sma_fast": 3,
     "sma_slow": 5,
     "sl_coef": 0.01,
@@ -1,13 +1,57 @@
 # data_manager.py
 # --- Python 3.13---
 
+import time
+
+import numpy as np
 import pandas as pd
 from ib_insync import IB, Forex
 
+from core.bar_cache import load_cached_bars
+from core.bar_data import BarSeries
+from core.resampler import resample, timeframe_seconds
+
+# Найбільша кількість базових барів, яку варто тягнути одним запитом
+# (тиждень хвилинних барів — у межах лімітів історичних даних IB)
+MAX_BASE_BARS = 10_080
+# одиниці durationStr IB ("3600 S", "1 D", "2 W", "1 M", "1 Y")
+_DURATION_UNITS = {"S": 1, "D": 86_400, "W": 604_800, "M": 2_592_000, "Y": 31_536_000}
+# колонки барів IB поза BarSeries (зберігаються для формату результату)
+_IB_EXTRA = ("volume", "average", "barCount")
+
+
+def duration_seconds(duration: str) -> int:
+    """Тривалість durationStr IB ("1 D", "2 W", "1 Y") у секундах."""
+    count, _, unit = str(duration).strip().partition(" ")
+    unit = unit.strip().upper()
+    if not count.isdigit() or unit not in _DURATION_UNITS:
+        raise ValueError(f"Unknown duration: {duration!r}")
+    return int(count) * _DURATION_UNITS[unit]
+
 
 class DataManager:
-    def __init__(self, backend="ib", **kwargs):
+    """
+    Джерело ринкових даних (IB, cTrader, dummy).
+
+    Коротка історія зберігається як одна базова серія на символ
+    (base_bar_size, типово "1 min"); вищі таймфрейми будуються з неї
+    (core.resampler), тому для різних bar_size немає окремих завантажень.
+    Серія IB береться з пам'яті, лише поки після її останнього бару не міг
+    початися новий базовий бар; далі (або з refresh=True, clear_cache())
+    вона завантажується заново. Серії з data_files кешуються до clear_cache().
+    Довгі запити (понад MAX_BASE_BARS базових барів, напр. денні бари
+    за рік) і bar_size, не кратні базовому, йдуть в IB напряму.
+    Для dummy-бекенду базова серія читається з data_files (symbol -> CSV).
+    """
+
+    def __init__(self, backend="ib", base_bar_size="1 min", data_files=None, **kwargs):
         self.backend = backend.lower()
+        self.base_bar_size = base_bar_size
+        self.data_files = data_files or {}
+        # (symbol, duration) -> базова BarSeries
+        self._base_series: dict[tuple[str, str], BarSeries] = {}
+        # (symbol, duration) -> колонки _IB_EXTRA базових барів IB
+        self._base_extra: dict[tuple[str, str], dict[str, np.ndarray]] = {}
         if self.backend == "ib":
             self._init_ib(kwargs)
         elif self.backend == "ctrader":
@@ -53,11 +97,91 @@ class DataManager:
         self.ib.sleep(1)
         return ticker.last if ticker.last else 0.0
 
-    def get_historical_data(self, symbol: str, duration="1 D", bar_size="5 mins"):
+    def get_historical_data(
+        self, symbol: str, duration="1 D", bar_size="5 mins", refresh=False
+    ):
+        """
+        Повертає історичні бари bar_size як DataFrame у форматі
+        reqHistoricalData (колонки date, open, high, low, close, volume,
+        average, barCount).
+
+        Якщо базова серія дешево покриває duration (use_base_series), бари
+        будуються з неї (get_base_series, refresh — примусове
+        перезавантаження). Інакше bar_size запитується в IB напряму.
+        """
+        if symbol not in self.data_files:
+            if self.backend != "ib":
+                raise NotImplementedError("get_historical_data for IB only")
+            if not self.use_base_series(duration, bar_size):
+                return pd.DataFrame(self._request_bars(symbol, duration, bar_size))
+        if timeframe_seconds(bar_size) % timeframe_seconds(self.base_bar_size):
+            raise ValueError(
+                f"bar_size {bar_size!r} is not a multiple of {self.base_bar_size!r}"
+            )
+        base = self.get_base_series(symbol, duration, refresh=refresh)
+        series = resample(base, bar_size)
+        frame = _series_to_frame(series)
+        extra = self._base_extra.get((symbol, duration))
+        if extra is not None:
+            frame = frame.assign(
+                **_resample_extra(extra, np.searchsorted(base.time, series.time))
+            )
+        return frame
+
+    def use_base_series(self, duration: str, bar_size: str) -> bool:
+        """
+        True — бари bar_size за duration будуються з базової серії:
+        bar_size кратний base_bar_size, а базових барів не більше MAX_BASE_BARS.
+        """
+        base = timeframe_seconds(self.base_bar_size)
+        if timeframe_seconds(bar_size) % base:
+            return False
+        return duration_seconds(duration) // base <= MAX_BASE_BARS
+
+    def get_base_series(self, symbol: str, duration="1 D", refresh=False) -> BarSeries:
+        """
+        Базова серія символу (base_bar_size). Завантажується заново, якщо
+        її немає в пам'яті, refresh=True або закешована серія IB застаріла.
+        """
+        key = (symbol, duration)
+        series = self._base_series.get(key)
+        if series is None or refresh or self._is_stale(symbol, series):
+            self._base_extra.pop(key, None)
+            series = self._base_series[key] = self._load_base_series(symbol, duration)
+        return series
+
+    def clear_cache(self, symbol: str | None = None) -> None:
+        """Скидає закешовані базові серії (усі або лише символу symbol)."""
+        for key in [k for k in self._base_series if symbol in (None, k[0])]:
+            del self._base_series[key]
+            self._base_extra.pop(key, None)
+
+    def _is_stale(self, symbol: str, series: BarSeries) -> bool:
+        """Серія IB, після останнього бару якої вже почався новий базовий бар."""
+        if symbol in self.data_files:
+            return False
+        if not len(series):
+            return True
+        next_bar = int(series.time[-1]) + timeframe_seconds(self.base_bar_size)
+        return time.time() >= next_bar
+
+    def _load_base_series(self, symbol: str, duration: str) -> BarSeries:
+        if symbol in self.data_files:
+            return load_cached_bars(self.data_files[symbol])
         if self.backend != "ib":
             raise NotImplementedError("get_historical_data for IB only")
+        frame = pd.DataFrame(self._request_bars(symbol, duration, self.base_bar_size))
+        if not frame.empty:
+            self._base_extra[(symbol, duration)] = {
+                name: frame[name].to_numpy(dtype=np.float64)
+                for name in _IB_EXTRA
+                if name in frame
+            }
+        return _frame_to_series(frame)
+
+    def _request_bars(self, symbol: str, duration: str, bar_size: str):
         contract = self.get_forex_contract(symbol)
-        bars = self.ib.reqHistoricalData(
+        return self.ib.reqHistoricalData(
             contract,
             endDateTime="",
             durationStr=duration,
@@ -65,13 +189,65 @@ class DataManager:
             whatToShow="MIDPOINT",
             useRTH=False,
         )
-        return pd.DataFrame(bars)
 
     # Методи cTrader можна додати тут пізніше
 
     # Заглушки або інші методи для dummy
 
 
+def _frame_to_series(frame: pd.DataFrame) -> BarSeries:
+    """DataFrame барів IB (date, open, high, low, close[, volume]) -> BarSeries."""
+    if frame.empty:
+        return BarSeries([], [], [], [], [], [])
+    times = pd.to_datetime(frame["date"], utc=True).dt.tz_localize(None)
+    return BarSeries(
+        time=times.to_numpy(dtype="datetime64[s]").astype(np.int64),
+        open_=frame["open"].to_numpy(),
+        high=frame["high"].to_numpy(),
+        low=frame["low"].to_numpy(),
+        close=frame["close"].to_numpy(),
+        volume=frame["volume"].clip(lower=0).to_numpy() if "volume" in frame else None,
+    )
+
+
+def _series_to_frame(series: BarSeries) -> pd.DataFrame:
+    """BarSeries -> DataFrame з колонками date, open, high, low, close, volume."""
+    return pd.DataFrame(
+        {
+            "date": series.time.astype("datetime64[s]"),
+            "open": series.open,
+            "high": series.high,
+            "low": series.low,
+            "close": series.close,
+            "volume": series.volume,
+        }
+    )
+
+
+def _resample_extra(extra: dict[str, np.ndarray], starts: np.ndarray) -> dict:
+    """
+    Колонки volume/average/barCount IB для кошиків, що починаються зі starts.
+    Недоступні значення IB (-1, напр. для MIDPOINT) лишаються -1.
+    """
+    columns = {}
+    volume = extra.get("volume")
+    if volume is not None:
+        total = np.add.reduceat(np.clip(volume, 0, None), starts)
+        missing = np.minimum.reduceat(volume, starts) < 0
+        columns["volume"] = np.where(missing, -1.0, total)
+        average = extra.get("average")
+        if average is not None:
+            weighted = np.add.reduceat(np.clip(volume, 0, None) * average, starts)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                columns["average"] = np.where(total > 0, weighted / total, -1.0)
+    count = extra.get("barCount")
+    if count is not None:
+        total = np.add.reduceat(np.clip(count, 0, None), starts)
+        missing = np.minimum.reduceat(count, starts) < 0
+        columns["barCount"] = np.where(missing, -1, total).astype(np.int64)
+    return columns
+
+
 # Приклад ініціалізації:
 # dm_ib = DataManager(backend="ib", host="localhost", port=7497, client_id=1)
 # dm_ctrader = DataManager(backend="ctrader", access_token="...", refresh_token="...",
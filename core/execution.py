@@ -1,12 +1,149 @@
 # core\execution.py
+import datetime
 import uuid
+from collections.abc import MutableMapping
+
+import numpy as np
 
 from core.lang_manager import LangManager
 from core.logger_monitor import LoggerMonitor
+from core.order_book import OrderBook, PendingOrder
 from core.risk_manager import RiskManager
 
 lang = LangManager()
 
+# Поля ордера в порядку словникового представлення
+ORDER_FIELDS = (
+    "id",
+    "symbol",
+    "side",
+    "price",
+    "size",
+    "stop_loss",
+    "take_profit",
+    "status",
+    "open_index",
+    "open_time",
+    "exit_index",
+    "exit_price",
+    "exit_reason",
+    "close_time",
+    "profit",
+)
+_ORDER_SLOTS = frozenset(ORDER_FIELDS)
+
+# Рядок журналу угод як NumPy structured array (див. trades_to_array)
+TRADE_DTYPE = np.dtype(
+    [
+        ("id", np.int64),
+        ("side", np.int8),  # 1 — long, -1 — short
+        ("price", np.float64),
+        ("size", np.float64),
+        ("stop_loss", np.float64),
+        ("take_profit", np.float64),
+        ("open_index", np.int64),
+        ("exit_index", np.int64),
+        ("exit_price", np.float64),
+        ("profit", np.float64),
+    ]
+)
+
+
+class Order(MutableMapping):
+    """
+    Компактний запис ордера/угоди (__slots__ замість словника).
+
+    Поводиться як словник: order["price"], order.get("profit"),
+    "profit" in order, dict(order). Незадані поля (напр. 'profit' у
+    відкритого ордера) відсутні так само, як ключі словника.
+    Поля поза ORDER_FIELDS зберігаються в додатковому словнику.
+    """
+
+    __slots__ = ORDER_FIELDS + ("_extra",)
+
+    def __init__(self, *args, **fields):
+        self._extra = None
+        self.update(*args, **fields)
+
+    def __getitem__(self, key):
+        if key in _ORDER_SLOTS:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        if self._extra is not None and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key, value) -> None:
+        if key in _ORDER_SLOTS:
+            setattr(self, key, value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __delitem__(self, key) -> None:
+        if key in _ORDER_SLOTS:
+            try:
+                delattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        elif self._extra is not None and key in self._extra:
+            del self._extra[key]
+        else:
+            raise KeyError(key)
+
+    def __iter__(self):
+        for name in ORDER_FIELDS:
+            if hasattr(self, name):
+                yield name
+        if self._extra:
+            yield from self._extra
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def to_dict(self) -> dict:
+        """Звичайний словник (для JSON, CSV, pandas)."""
+        return dict(self.items())
+
+    def __repr__(self) -> str:
+        return f"Order({self.to_dict()!r})"
+
+    def __getstate__(self):
+        return self.to_dict()
+
+    def __setstate__(self, state) -> None:
+        self._extra = None
+        self.update(state)
+
+
+def trades_to_array(trades) -> np.ndarray:
+    """
+    Журнал угод як NumPy structured array (TRADE_DTYPE).
+
+    Відсутні числові поля (напр. 'profit' у відкритого ордера) — NaN,
+    відсутні/нечислові 'id', 'open_index' і 'exit_index' — -1.
+    """
+    records = np.empty(len(trades), dtype=TRADE_DTYPE)
+    for k, trade in enumerate(trades):
+        order_id = trade.get("id", -1)
+        take_profit = trade.get("take_profit")
+        records[k] = (
+            order_id if isinstance(order_id, (int, np.integer)) else -1,
+            1 if trade.get("side") == "long" else -1,
+            trade.get("price", np.nan),
+            trade.get("size", np.nan),
+            trade.get("stop_loss", np.nan),
+            np.nan if take_profit is None else take_profit,
+            trade.get("open_index", -1),
+            trade.get("exit_index", -1),
+            trade.get("exit_price", np.nan),
+            trade.get("profit", np.nan),
+        )
+    return records
+
 
 class ExecutionEngine:
     """
@@ -24,8 +161,12 @@ class ExecutionEngine:
     ):
         self.risk_manager = risk_manager
         self.mode = mode.lower().strip()  # нормалізація значення
-        self.active_orders: dict[str, dict] = {}
+        self.active_orders: dict[int | str, Order] = {}
         self.logger = logger
+        # Наступний ID ордера в режимі 'simulator' (цілі числа з 1)
+        self.next_order_id = 1
+        # Відкладені limit/stop ордери (виконуються в on_bar / on_tick)
+        self.order_book = OrderBook()
 
     # -----------------------------
     # Основний метод подачі ордера
@@ -37,37 +178,47 @@ class ExecutionEngine:
         price: float,
         stop_loss: float,
         take_profit: float | None = None,
-    ) -> tuple[bool, dict | str]:
+        trade_date: datetime.date | None = None,
+    ) -> tuple[bool, Order | str]:
         """
         Створює новий ордер у режимі 'simulator' (або готує до 'live').
+        trade_date — дата угоди для денного ліміту RiskManager
+        (у бек-тесті — дата бару; типово поточна дата).
 
         Повертає:
-            (True, order_dict) — якщо ордер створено успішно
+            (True, order) — якщо ордер створено успішно (Order, доступ як
+                до словника; у симуляторі ID — послідовне ціле число)
             (False, reason) — якщо ордер відхилено RiskManager'ом
         """
         # Визначаємо відстань до стоп-лоссу
         stop_loss_distance = abs(price - stop_loss)
 
         # --- ВАЛІДАЦІЯ через RiskManager ---
-        valid, info = self.risk_manager.validate_order(stop_loss_distance, price)
+        valid, info = self.risk_manager.validate_order(
+            stop_loss_distance, price, trade_date
+        )
         if not valid:
             # info містить причину відмови
             return False, info
 
         # info містить розрахований розмір позиції
         size = info
-        order_id = str(uuid.uuid4())
-
-        order = {
-            "id": order_id,
-            "symbol": symbol,
-            "side": side.lower(),
-            "price": price,
-            "size": size,
-            "stop_loss": stop_loss,
-            "take_profit": take_profit,
-            "status": "OPEN",
-        }
+        if self.mode == "simulator":
+            order_id = self.next_order_id
+            self.next_order_id += 1
+        else:
+            order_id = str(uuid.uuid4())
+
+        order = Order(
+            id=order_id,
+            symbol=symbol,
+            side=side.lower(),
+            price=price,
+            size=size,
+            stop_loss=stop_loss,
+            take_profit=take_profit,
+            status="OPEN",
+        )
 
         # --- Режим симуляції ---
         if self.mode == "simulator":
@@ -84,10 +235,87 @@ class ExecutionEngine:
         # --- Захист від неправильного режиму ---
         return False, f"Unknown mode: {self.mode}"
 
+    # -----------------------------
+    # Відкладені limit/stop ордери
+    # -----------------------------
+    def place_pending_order(
+        self,
+        symbol: str,
+        side: str,
+        order_type: str,
+        price: float,
+        stop_loss: float,
+        take_profit: float | None = None,
+    ) -> tuple[bool, PendingOrder | str]:
+        """
+        Ставить limit або stop ордер у книгу; він виконується через
+        submit_order, коли бар (on_bar) або тик (on_tick) перетне price.
+        Валідація RiskManager'ом — на момент виконання.
+
+        Повертає:
+            (True, pending) — ордер у книзі (у симуляторі ID — з того ж
+                лічильника, що й ID ордерів)
+            (False, reason) — невідомий тип/сторона ордера
+        """
+        if self.mode == "simulator":
+            order_id = self.next_order_id
+        else:
+            order_id = str(uuid.uuid4())
+        try:
+            pending = PendingOrder(
+                order_id, symbol, side, order_type, price, stop_loss, take_profit
+            )
+        except ValueError as exc:
+            return False, str(exc)
+        if self.mode == "simulator":
+            self.next_order_id += 1
+        self.order_book.add(pending)
+        return True, pending
+
+    def cancel_order(self, order_id: int | str) -> bool:
+        """Скасовує відкладений ордер; False, якщо його немає в книзі."""
+        return self.order_book.cancel(order_id)
+
+    def on_bar(
+        self,
+        symbol: str,
+        open_price: float,
+        high: float,
+        low: float,
+        trade_date: datetime.date | None = None,
+    ) -> list[tuple[PendingOrder, bool, Order | str]]:
+        """
+        Виконує відкладені ордери symbol, ціну яких перетнув бар
+        (у порядку від найближчого до відкриття бару).
+
+        Повертає список (pending, ok, order_or_reason) — результат
+        submit_order для кожного спрацьованого ордера.
+        """
+        results = []
+        for pending, fill_price in self.order_book.match(symbol, open_price, high, low):
+            ok, info = self.submit_order(
+                pending.symbol,
+                pending.side,
+                fill_price,
+                pending.stop_loss,
+                pending.take_profit,
+                trade_date,
+            )
+            results.append((pending, ok, info))
+        return results
+
+    def on_tick(
+        self, symbol: str, price: float, trade_date: datetime.date | None = None
+    ) -> list[tuple[PendingOrder, bool, Order | str]]:
+        """on_bar для окремого тику."""
+        return self.on_bar(symbol, price, price, price, trade_date)
+
     # -----------------------------
     # Закриття ордера
     # -----------------------------
-    def close_order(self, order_id: str, exit_price: float) -> tuple[bool, float | str]:
+    def close_order(
+        self, order_id: int | str, exit_price: float
+    ) -> tuple[bool, float | str]:
         """
         Закриває ордер і реєструє результат у RiskManager.
         """
@@ -97,12 +325,12 @@ class ExecutionEngine:
         order = self.active_orders[order_id]
 
         # Розрахунок прибутку/збитку
-        if order["side"] == "long":
-            pnl = (exit_price - order["price"]) * order["size"]
+        if order.side == "long":
+            pnl = (exit_price - order.price) * order.size
         else:
-            pnl = (order["price"] - exit_price) * order["size"]
+            pnl = (order.price - exit_price) * order.size
 
-        order["status"] = "CLOSED"
+        order.status = "CLOSED"
         self.risk_manager.register_trade(pnl)
 
         if self.logger:
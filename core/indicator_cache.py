@@ -0,0 +1,161 @@
+# core\indicator_cache.py
+
+"""
+Спільний кеш пораховуваних індикаторів (мемоізація в межах набору даних).
+
+Кілька стратегій або наборів параметрів на тих самих барах (напр. SMA
+3/5, 3/8 і 5/8) рахують однакові ковзні середні. IndicatorCache зберігає
+кожен ряд один раз за ключем (індикатор, параметри, ідентифікатор даних)
+як масив лише для читання і віддає його всім, хто попросить.
+
+- Ідентифікатор даних — хеш вмісту масиву; рахується один раз на об'єкт
+  масиву (дані вважаються незмінними, поки вони в кеші).
+- Витіснення — LRU з обмеженням за сумарним розміром масивів (max_bytes).
+- default_cache() — спільний кеш процесу; VectorizedBacktester і
+  ParameterSweep беруть його за замовчуванням, а воркери перебору
+  отримують уже пораховані ряди через shared_memory (core.param_sweep).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+
+from core.indicators import sma
+
+# типовий бюджет пам'яті кешу (як у result_cache)
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def array_hash(values: np.ndarray) -> str:
+    """Хеш вмісту масиву (тип, форма і байти)."""
+    values = np.ascontiguousarray(values)
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{values.dtype.str}{values.shape}".encode())
+    digest.update(memoryview(values).cast("B"))
+    return "array:" + digest.hexdigest()
+
+
+class IndicatorCache:
+    """
+    LRU-кеш рядів індикаторів з обмеженням за пам'яттю.
+
+    :param max_bytes: Найбільший сумарний розмір збережених масивів;
+        масив, більший за бюджет, повертається без збереження.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = int(max_bytes)
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._series: OrderedDict[tuple, np.ndarray] = OrderedDict()
+        # id(масиву) -> (weakref на масив, ідентифікатор даних)
+        self._datasets: dict[int, tuple] = {}
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._series)
+
+    def __contains__(self, key: tuple) -> bool:
+        return key in self._series
+
+    # -----------------------------
+    # Ідентифікатори даних
+    # -----------------------------
+    def dataset_id(self, values: np.ndarray) -> str:
+        """Ідентифікатор даних масиву (хеш рахується раз на об'єкт)."""
+        entry = self._datasets.get(id(values))
+        if entry is not None and entry[0]() is values:
+            return entry[1]
+        dataset = array_hash(values)
+        self.register_dataset(values, dataset)
+        return dataset
+
+    def register_dataset(self, values: np.ndarray, dataset: str) -> None:
+        """Прив'язує до масиву вже відомий ідентифікатор (без хешування)."""
+        key = id(values)
+
+        def forget(_ref, key=key, datasets=self._datasets):
+            datasets.pop(key, None)
+
+        with self._lock:
+            self._datasets[key] = (weakref.ref(values, forget), dataset)
+
+    # -----------------------------
+    # Ряди
+    # -----------------------------
+    def get(self, key: tuple) -> np.ndarray | None:
+        """Ряд за ключем (індикатор, параметри, дані) або None."""
+        with self._lock:
+            array = self._series.get(key)
+            if array is None:
+                self.misses += 1
+                return None
+            self._series.move_to_end(key)
+            self.hits += 1
+            return array
+
+    def put(self, key: tuple, array: np.ndarray) -> np.ndarray:
+        """Зберігає ряд (робить його лише для читання) і повертає його."""
+        array.setflags(write=False)
+        size = array.nbytes
+        if size > self.max_bytes:
+            return array
+        with self._lock:
+            old = self._series.pop(key, None)
+            if old is not None:
+                self.nbytes -= old.nbytes
+            while self._series and self.nbytes + size > self.max_bytes:
+                _, evicted = self._series.popitem(last=False)
+                self.nbytes -= evicted.nbytes
+            self._series[key] = array
+            self.nbytes += size
+        return array
+
+    def series(
+        self,
+        name: str,
+        values: np.ndarray,
+        params: tuple,
+        compute,
+        dataset: str | None = None,
+    ) -> np.ndarray:
+        """
+        Ряд індикатора name з параметрами params над values.
+
+        :param compute: Функція без аргументів, що рахує ряд при промаху.
+        :param dataset: Готовий ідентифікатор даних (інакше — dataset_id).
+        """
+        if dataset is None:
+            dataset = self.dataset_id(values)
+        key = (name, params, dataset)
+        array = self.get(key)
+        if array is None:
+            array = self.put(key, np.asarray(compute(), dtype=np.float64))
+        return array
+
+    def sma(self, values: np.ndarray, period: int) -> np.ndarray:
+        """Кешована core.indicators.sma."""
+        period = int(period)
+        return self.series("sma", values, (period,), lambda: sma(values, period))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._series.clear()
+            self.nbytes = 0
+
+
+_default_cache: IndicatorCache | None = None
+
+
+def default_cache() -> IndicatorCache:
+    """Спільний кеш індикаторів поточного процесу."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = IndicatorCache()
+    return _default_cache
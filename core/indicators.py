@@ -0,0 +1,517 @@
+# core\indicators.py
+
+"""
+Інкрементальні технічні індикатори на кільцевих буферах.
+
+Кожен індикатор має дві форми з побітово однаковими числами:
+- клас з update(...) — O(1) на бар, для on_bar і живих стратегій
+  (RollingSMA, EMA, ATR, RSI, Bollinger);
+- функція над цілими масивами — для векторного бек-тесту й аналізу
+  (sma, ema, atr, rsi, bollinger).
+
+Ковзні суми оновлюються на зміну (нове значення мінус вибуле), а векторна
+форма накопичує ті самі зміни через np.cumsum (послідовне додавання),
+тому значення не розходяться. Щоб похибка округлення не накопичувалась
+на довгих рядах, кожні max(RESYNC_EVERY, period) значень суми вікна
+перераховуються наново (обидві форми — в одних і тих самих точках і в тому
+самому порядку додавання). Bollinger веде суми відхилень від зсуву (значення
+в точці перерахунку), а не самих цін, — без катастрофічного скорочення
+в sumsq / n - mean². Рекурсивні згладжування (EMA, Wilder
+у ATR/RSI) за природою послідовні: їхня векторна форма — один прохід
+по готових масивах без об'єктів на бар.
+"""
+
+from __future__ import annotations
+
+import math
+
+import numpy as np
+
+# як часто (у значеннях) ковзні суми перераховуються по вікну наново
+RESYNC_EVERY = 1024
+
+
+def _resync_every(period: int) -> int:
+    return max(RESYNC_EVERY, int(period))
+
+
+class RingBuffer:
+    """Кільцевий буфер фіксованої місткості (без зсуву елементів)."""
+
+    __slots__ = ("capacity", "_items", "_pos", "_count")
+
+    def __init__(self, capacity: int):
+        if capacity < 1:
+            raise ValueError("capacity must be positive")
+        self.capacity = int(capacity)
+        self._items = [0.0] * self.capacity
+        self._pos = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self):
+        """Значення від найстарішого до найновішого."""
+        start = self._pos - self._count
+        for i in range(start, self._pos):
+            yield self._items[i % self.capacity]
+
+    @property
+    def full(self) -> bool:
+        return self._count == self.capacity
+
+    def push(self, value: float) -> float | None:
+        """Додає значення; повертає витіснене (None, поки буфер не заповнений)."""
+        old = self._items[self._pos] if self._count == self.capacity else None
+        self._items[self._pos] = value
+        self._pos += 1
+        if self._pos == self.capacity:
+            self._pos = 0
+        if old is None:
+            self._count += 1
+        return old
+
+    def replace_last(self, value: float) -> float:
+        """Замінює останнє значення; повертає попереднє."""
+        if not self._count:
+            raise IndexError("replace_last on empty buffer")
+        pos = self._pos - 1
+        old = self._items[pos]
+        self._items[pos] = value
+        return old
+
+    def total(self) -> float:
+        """
+        Сума значень послідовним додаванням від найстарішого до найновішого
+        (той самий порядок, що й np.cumsum по вікну у векторних формах).
+        """
+        total = 0.0
+        for value in self:
+            total += value
+        return total
+
+    def clear(self) -> None:
+        self._pos = 0
+        self._count = 0
+
+
+# -----------------------------
+# Інкрементальні індикатори
+# -----------------------------
+class RollingSMA:
+    """
+    Просте ковзне середнє за period значень.
+
+    value — сума вікна / period; поки вікно неповне, це середнє
+    неповного вікна (сума / period), як у векторній sma. Сума ведеться
+    на зміну і перераховується по вікну кожні max(RESYNC_EVERY, period)
+    значень.
+    """
+
+    __slots__ = ("period", "value", "_buffer", "_sum", "_every", "_step")
+
+    def __init__(self, period: int):
+        self.period = int(period)
+        self._buffer = RingBuffer(self.period)
+        self._every = _resync_every(self.period)
+        self.reset()
+
+    def reset(self) -> None:
+        self._buffer.clear()
+        self._sum = 0.0
+        self._step = 0
+        self.value = None
+
+    @property
+    def ready(self) -> bool:
+        """Чи вікно вже повне."""
+        return self._buffer.full
+
+    def update(self, value: float) -> float:
+        """Додає значення (float) і повертає нове середнє."""
+        old = self._buffer.push(value)
+        if self._step:
+            self._sum += value if old is None else value - old
+        else:
+            self._sum = self._buffer.total()
+        self._step += 1
+        if self._step == self._every:
+            self._step = 0
+        self.value = self._sum / self.period
+        return self.value
+
+    def replace(self, value: float) -> float:
+        """
+        Замінює останнє значення (бар, що ще формується) і повертає середнє.
+
+        Після заміни числа можуть відрізнятися від векторної sma в останньому
+        знаку, бо сума оновлюється іншою послідовністю додавань.
+        """
+        old = self._buffer.replace_last(value)
+        self._sum += value - old
+        self.value = self._sum / self.period
+        return self.value
+
+
+class EMA:
+    """
+    Експоненційне ковзне середнє: ema += alpha * (x - ema), alpha = 2 / (period + 1).
+
+    Перше значення — перше x (як pandas ewm(adjust=False)); ready — після
+    period значень.
+    """
+
+    __slots__ = ("period", "alpha", "value", "_count")
+
+    def __init__(self, period: int, alpha: float | None = None):
+        self.period = int(period)
+        self.alpha = 2.0 / (self.period + 1) if alpha is None else float(alpha)
+        self.reset()
+
+    def reset(self) -> None:
+        self.value = None
+        self._count = 0
+
+    @property
+    def ready(self) -> bool:
+        return self._count >= self.period
+
+    def update(self, value: float) -> float:
+        self._count += 1
+        if self.value is None:
+            self.value = value
+        else:
+            self.value += self.alpha * (value - self.value)
+        return self.value
+
+
+def _true_range(high: float, low: float, prev_close: float | None) -> float:
+    if prev_close is None:
+        return high - low
+    return max(high - low, abs(high - prev_close), abs(low - prev_close))
+
+
+class _WilderAverage:
+    """
+    Середнє Wilder: перше значення — середнє перших period значень,
+    далі avg = (avg * (period - 1) + x) / period. До того — None.
+    """
+
+    __slots__ = ("period", "value", "_count", "_sum")
+
+    def __init__(self, period: int):
+        self.period = period
+        self.reset()
+
+    def reset(self) -> None:
+        self.value = None
+        self._count = 0
+        self._sum = 0.0
+
+    def update(self, x: float) -> float | None:
+        period = self.period
+        if self._count < period:
+            self._count += 1
+            self._sum += x
+            if self._count == period:
+                self.value = self._sum / period
+        else:
+            self.value = (self.value * (period - 1) + x) / period
+        return self.value
+
+
+class ATR:
+    """Average True Range зі згладжуванням Wilder (None, поки немає period барів)."""
+
+    __slots__ = ("period", "value", "_avg", "_prev_close")
+
+    def __init__(self, period: int = 14):
+        self.period = int(period)
+        self._avg = _WilderAverage(self.period)
+        self.reset()
+
+    def reset(self) -> None:
+        self.value = None
+        self._prev_close = None
+        self._avg.reset()
+
+    @property
+    def ready(self) -> bool:
+        return self.value is not None
+
+    def update(self, high: float, low: float, close: float) -> float | None:
+        tr = _true_range(high, low, self._prev_close)
+        self._prev_close = close
+        self.value = self._avg.update(tr)
+        return self.value
+
+
+def _rsi_value(avg_gain: float, avg_loss: float) -> float:
+    if avg_loss == 0:
+        return 100.0 if avg_gain > 0 else 50.0
+    return 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+
+class RSI:
+    """
+    Relative Strength Index (Wilder).
+
+    Середні зростання і падіння згладжуються як в ATR; перше значення —
+    після period + 1 закриттів. Без падінь RSI = 100, без жодних змін — 50.
+    """
+
+    __slots__ = ("period", "value", "_prev", "_gain", "_loss")
+
+    def __init__(self, period: int = 14):
+        self.period = int(period)
+        self._gain = _WilderAverage(self.period)
+        self._loss = _WilderAverage(self.period)
+        self.reset()
+
+    def reset(self) -> None:
+        self.value = None
+        self._prev = None
+        self._gain.reset()
+        self._loss.reset()
+
+    @property
+    def ready(self) -> bool:
+        return self.value is not None
+
+    def update(self, close: float) -> float | None:
+        prev, self._prev = self._prev, close
+        if prev is None:
+            return None
+        change = close - prev
+        gain = self._gain.update(change if change > 0 else 0.0)
+        loss = self._loss.update(-change if change < 0 else 0.0)
+        self.value = None if gain is None else _rsi_value(gain, loss)
+        return self.value
+
+
+class Bollinger:
+    """
+    Смуги Боллінджера: SMA ± k стандартних відхилень (генеральна сукупність)
+    за period значень.
+
+    Сума і сума квадратів відхилень вікна від зсуву ведуться
+    інкрементально; кожні max(RESYNC_EVERY, period) значень зсув стає
+    поточним значенням, а суми перераховуються по вікну. update повертає
+    (middle, upper, lower) або None, поки вікно неповне.
+    """
+
+    __slots__ = (
+        "period",
+        "k",
+        "value",
+        "_buffer",
+        "_shift",
+        "_sum",
+        "_sumsq",
+        "_every",
+        "_step",
+    )
+
+    def __init__(self, period: int = 20, k: float = 2.0):
+        self.period = int(period)
+        self.k = float(k)
+        self._buffer = RingBuffer(self.period)
+        self._every = _resync_every(self.period)
+        self.reset()
+
+    def reset(self) -> None:
+        self._buffer.clear()
+        self._shift = 0.0
+        self._sum = 0.0
+        self._sumsq = 0.0
+        self._step = 0
+        self.value = None
+
+    @property
+    def ready(self) -> bool:
+        return self._buffer.full
+
+    def update(self, value: float) -> tuple[float, float, float] | None:
+        old = self._buffer.push(value)
+        if self._step:
+            dev = value - self._shift
+            if old is None:
+                self._sum += dev
+                self._sumsq += dev * dev
+            else:
+                dev_old = old - self._shift
+                self._sum += dev - dev_old
+                self._sumsq += dev * dev - dev_old * dev_old
+        else:
+            self._resync(value)
+        self._step += 1
+        if self._step == self._every:
+            self._step = 0
+        if not self._buffer.full:
+            return None
+        mean_dev = self._sum / self.period
+        var = self._sumsq / self.period - mean_dev * mean_dev
+        mean = self._shift + mean_dev
+        width = self.k * math.sqrt(var if var > 0 else 0.0)
+        self.value = (mean, mean + width, mean - width)
+        return self.value
+
+    def _resync(self, shift: float) -> None:
+        """Новий зсув і суми відхилень вікна від нього (від старого до нового)."""
+        self._shift = shift
+        total = total_sq = 0.0
+        for value in self._buffer:
+            dev = value - shift
+            total += dev
+            total_sq += dev * dev
+        self._sum = total
+        self._sumsq = total_sq
+
+
+# -----------------------------
+# Векторні форми
+# -----------------------------
+def _window_changes(values: np.ndarray, period: int) -> np.ndarray:
+    """Зміни ковзної суми: x[i] для перших period значень, далі x[i] - x[i - period]."""
+    changes = values.copy()
+    if len(values) > period:
+        changes[period:] = values[period:] - values[:-period]
+    return changes
+
+
+def _windows(values: np.ndarray, period: int, ends: np.ndarray):
+    """
+    Вікна period значень, що закінчуються на ends (рядок на вікно), і маска
+    наявних значень (на початку ряду вікно неповне).
+    """
+    index = ends[:, None] + np.arange(1 - period, 1)
+    return values[np.maximum(index, 0)], index >= 0
+
+
+def _window_sums(rows: np.ndarray) -> np.ndarray:
+    """Суми рядків послідовним додаванням (як RingBuffer.total)."""
+    if not rows.size:
+        return np.zeros(len(rows))
+    return np.cumsum(rows, axis=1)[:, -1]
+
+
+def _resync_cumsum(changes: np.ndarray, totals: np.ndarray, every: int):
+    """
+    np.cumsum змін, що починається наново кожні every значень: у точці
+    перерахунку j * every сума дорівнює totals[j].
+    """
+    size = len(changes)
+    blocks = np.zeros(len(totals) * every)
+    blocks[:size] = changes
+    blocks = blocks.reshape(-1, every)
+    blocks[:, 0] = totals
+    np.cumsum(blocks, axis=1, out=blocks)
+    return blocks.ravel()[:size]
+
+
+def sma(values, period: int) -> np.ndarray:
+    """
+    Ковзне середнє (як RollingSMA.update по кожному значенню).
+
+    Для i < period - 1 — середнє неповного вікна (сума / period).
+    """
+    values = np.asarray(values, dtype=np.float64)
+    every = _resync_every(period)
+    rows, present = _windows(values, period, np.arange(0, len(values), every))
+    totals = _window_sums(np.where(present, rows, 0.0))
+    return _resync_cumsum(_window_changes(values, period), totals, every) / period
+
+
+def ema(values, period: int, alpha: float | None = None) -> np.ndarray:
+    """EMA по всьому ряду (як EMA.update по кожному значенню)."""
+    alpha = 2.0 / (period + 1) if alpha is None else float(alpha)
+    out = np.empty(len(values), dtype=np.float64)
+    value = None
+    for i, x in enumerate(np.asarray(values, dtype=np.float64).tolist()):
+        value = x if value is None else value + alpha * (x - value)
+        out[i] = value
+    return out
+
+
+def true_range(high, low, close) -> np.ndarray:
+    """True range по барах (для першого бару — high - low)."""
+    high = np.asarray(high, dtype=np.float64)
+    low = np.asarray(low, dtype=np.float64)
+    close = np.asarray(close, dtype=np.float64)
+    tr = high - low
+    if len(tr) > 1:
+        prev = close[:-1]
+        tr[1:] = np.maximum(
+            tr[1:], np.maximum(np.abs(high[1:] - prev), np.abs(low[1:] - prev))
+        )
+    return tr
+
+
+def _wilder(values: np.ndarray, period: int) -> np.ndarray:
+    """Згладжування Wilder; NaN до першого повного вікна."""
+    out = np.full(len(values), np.nan)
+    total = 0.0
+    value = None
+    for i, x in enumerate(values.tolist()):
+        if i < period:
+            total += x
+            if i == period - 1:
+                value = total / period
+        else:
+            value = (value * (period - 1) + x) / period
+        if value is not None:
+            out[i] = value
+    return out
+
+
+def atr(high, low, close, period: int = 14) -> np.ndarray:
+    """ATR по барах (як ATR.update); NaN, поки значення ще немає."""
+    return _wilder(true_range(high, low, close), period)
+
+
+def rsi(close, period: int = 14) -> np.ndarray:
+    """RSI по барах (як RSI.update); NaN для перших period барів."""
+    close = np.asarray(close, dtype=np.float64)
+    out = np.full(len(close), np.nan)
+    if len(close) <= period:
+        return out
+    change = np.diff(close)
+    avg_gain = _wilder(np.where(change > 0, change, 0.0), period)
+    avg_loss = _wilder(np.where(change < 0, -change, 0.0), period)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        values = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    values = np.where(avg_loss == 0, np.where(avg_gain > 0, 100.0, 50.0), values)
+    out[1:] = np.where(np.isnan(avg_gain), np.nan, values)
+    return out
+
+
+def bollinger(values, period: int = 20, k: float = 2.0):
+    """
+    Смуги Боллінджера по всьому ряду (як Bollinger.update).
+
+    Повертає (middle, upper, lower); NaN, поки вікно неповне.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    size = len(values)
+    every = _resync_every(period)
+    starts = np.arange(0, size, every)
+    # зсув кожного значення — значення в точці перерахунку його блоку
+    shift = np.repeat(values[starts], every)[:size]
+    dev = values - shift
+    dev_sq = dev * dev
+    if size > period:
+        dev_old = values[:-period] - shift[period:]
+        dev[period:] -= dev_old
+        dev_sq[period:] -= dev_old * dev_old
+    rows, present = _windows(values, period, starts)
+    rows = np.where(present, rows - values[starts][:, None], 0.0)
+    mean_dev = _resync_cumsum(dev, _window_sums(rows), every) / period
+    sumsq = _resync_cumsum(dev_sq, _window_sums(rows * rows), every)
+    var = sumsq / period - mean_dev * mean_dev
+    mean = shift + mean_dev
+    width = float(k) * np.sqrt(np.maximum(var, 0.0))
+    middle, upper, lower = mean, mean + width, mean - width
+    for band in (middle, upper, lower):
+        band[: period - 1] = np.nan
+    return middle, upper, lower
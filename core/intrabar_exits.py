@@ -0,0 +1,234 @@
+# core\intrabar_exits.py
+
+"""
+Пошук внутрішньобарового спрацювання стоп-лоссу і тейк-профіту.
+
+Для кожного ордера шукається перший бар після входу, чий high/low торкається
+SL або TP. Пошук векторний: для пачки ордерів береться блок наступних барів
+(матриця ордер × бар) і знаходиться перший збіг; блок подвоюється лише
+для ордерів, які ще не закрилися. Python-циклу по барах немає.
+
+Правила:
+- Якщо бар торкається і SL, і TP — песимістично вважається, що спрацював SL.
+- SL при гепі через рівень виконується за ціною відкриття бару (гірше за SL),
+  TP — точно за рівнем.
+- Якщо до бару виходу за часом (close_after_bars) рівні не зачеплено,
+  ордер закривається за ціною close цього бару або останнього бару даних.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+from core.bar_data import BarSeries
+
+EXIT_STOP_LOSS = "stop_loss"
+EXIT_TAKE_PROFIT = "take_profit"
+EXIT_TIME = "time"
+EXIT_END = "end"
+
+FIRST_BLOCK = 8
+
+
+def find_first_touch(
+    open_: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
+    entry_index: np.ndarray,
+    direction: np.ndarray,
+    stop_loss: np.ndarray,
+    take_profit: np.ndarray,
+    last_index: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Знаходить перший бар торкання SL/TP для пачки ордерів.
+
+    :param entry_index: Бар входу кожного ордера (пошук з наступного бару).
+    :param direction: 1 для long, -1 для short.
+    :param last_index: Останній бар (включно), на якому ще шукати торкання.
+    :return: (exit_index, exit_price, is_stop). Для ордерів без торкання
+        exit_index = -1, exit_price = nan.
+    """
+    entry_index = np.asarray(entry_index, dtype=np.int64)
+    count = len(entry_index)
+    exit_index = np.full(count, -1, dtype=np.int64)
+    exit_price = np.full(count, np.nan, dtype=np.float64)
+    is_stop = np.zeros(count, dtype=bool)
+
+    direction = np.asarray(direction)
+    stop_loss = np.asarray(stop_loss, dtype=np.float64)
+    take_profit = np.asarray(take_profit, dtype=np.float64)
+    last_index = np.minimum(np.asarray(last_index, dtype=np.int64), len(high) - 1)
+
+    pending = np.flatnonzero(last_index > entry_index)
+    offset, block = 1, FIRST_BLOCK
+    while pending.size:
+        starts = entry_index[pending] + offset
+        ends = last_index[pending]
+        span = int(min(block, (ends - starts).max() + 1))
+
+        cols = starts[:, None] + np.arange(span)[None, :]
+        valid = cols <= ends[:, None]
+        cols = np.minimum(cols, len(high) - 1)
+        bar_high, bar_low = high[cols], low[cols]
+
+        is_long = (direction[pending] > 0)[:, None]
+        sl = stop_loss[pending][:, None]
+        tp = take_profit[pending][:, None]
+        sl_hit = np.where(is_long, bar_low <= sl, bar_high >= sl) & valid
+        tp_hit = np.where(is_long, bar_high >= tp, bar_low <= tp) & valid
+        any_hit = sl_hit | tp_hit
+
+        hit_rows = np.flatnonzero(any_hit.any(axis=1))
+        if hit_rows.size:
+            first_col = any_hit[hit_rows].argmax(axis=1)
+            orders = pending[hit_rows]
+            bars = starts[hit_rows] + first_col
+            stop = sl_hit[hit_rows, first_col]  # песимістично: SL має пріоритет
+
+            gap_open = open_[bars]
+            sl_price = np.where(
+                direction[orders] > 0,
+                np.minimum(gap_open, stop_loss[orders]),
+                np.maximum(gap_open, stop_loss[orders]),
+            )
+            exit_index[orders] = bars
+            exit_price[orders] = np.where(stop, sl_price, take_profit[orders])
+            is_stop[orders] = stop
+
+        still_open = ~any_hit.any(axis=1) & (starts + span <= ends)
+        pending = pending[still_open]
+        offset += span
+        block *= 2
+
+    return exit_index, exit_price, is_stop
+
+
+def schedule_exit(
+    data: BarSeries,
+    entry_index: int,
+    side: str,
+    stop_loss: float,
+    take_profit: float | None,
+    close_after_bars: int,
+    intrabar: bool = True,
+) -> tuple[int, float, str]:
+    """
+    Визначає бар, ціну і причину закриття одного ордера.
+
+    Повертає (exit_index, exit_price, reason); exit_index == len(data)
+    означає закриття наприкінці тесту за останньою ціною.
+    """
+    size = len(data)
+    time_exit = entry_index + max(int(close_after_bars), 1)
+    if intrabar:
+        exit_index, exit_price, is_stop = find_first_touch(
+            data.open,
+            data.high,
+            data.low,
+            np.array([entry_index]),
+            np.array([1 if side == "long" else -1]),
+            np.array([stop_loss]),
+            np.array([np.nan if take_profit is None else take_profit]),
+            np.array([min(time_exit, size - 1)]),
+        )
+        if exit_index[0] >= 0:
+            reason = EXIT_STOP_LOSS if is_stop[0] else EXIT_TAKE_PROFIT
+            return int(exit_index[0]), float(exit_price[0]), reason
+
+    if time_exit < size:
+        return time_exit, float(data.close[time_exit]), EXIT_TIME
+    return size, float(data.close[-1]), EXIT_END
+
+
+class ExitCloser:
+    """
+    Закриття ордерів за записами купи виходів — спільне для Backtester,
+    VectorizedBacktester і PortfolioBacktester.
+
+    Запис купи: (бар виходу, №, ціна виходу, причина, ордер). Клас-нащадок
+    має атрибут execution (ExecutionEngine); _close_order можна
+    перевизначити (напр. закриття без ExecutionEngine), а поля виходу
+    в журналі заповнює _record_exit.
+    """
+
+    def _close_exit(self, item: tuple) -> None:
+        """Закриває ордер за записом купи виходів."""
+        exit_index, _, exit_price, reason, order = item
+        self._close_order(exit_price, reason, order, exit_index)
+
+    def _close_order(
+        self, exit_price: float, reason: str, order, exit_index: int
+    ) -> None:
+        """Закриває ордер через ExecutionEngine і заносить вихід у журнал."""
+        ok, pnl = self.execution.close_order(order.id, exit_price=exit_price)
+        if ok:
+            self._record_exit(order, exit_index, exit_price, reason, pnl)
+
+    @staticmethod
+    def _record_exit(
+        order, exit_index: int, exit_price: float, reason: str, pnl: float
+    ) -> None:
+        """Зберігає бар і ціну виходу, причину та прибуток у записі угоди."""
+        order.exit_index = exit_index
+        order.exit_price = exit_price
+        order.exit_reason = reason
+        order.profit = pnl
+
+
+def resolve_exits(
+    data: BarSeries,
+    offset: int,
+    pending: list[tuple],
+    close_after_bars: int,
+    intrabar: bool = True,
+) -> tuple[list[tuple], list[tuple]]:
+    """
+    Шукає виходи відкритих ордерів у порції барів (для потокового режиму).
+
+    :param data: Порція барів; її перший бар має глобальний індекс offset.
+    :param pending: Список (seq, order, entry_index) з глобальним індексом входу.
+        Пошук у порції йде з бару після входу (або з її початку, якщо вхід
+        був у попередній порції).
+    :return: (resolved, waiting): resolved — кортежі
+        (exit_index, seq, exit_price, reason, order) з глобальним exit_index;
+        waiting — ордери, вихід яких лежить за межами порції.
+    """
+    size = len(data)
+    if not pending or size == 0:
+        return [], list(pending)
+
+    hold = max(int(close_after_bars), 1)
+    entry = np.array([p[2] for p in pending], dtype=np.int64)
+    time_exit = entry + hold - offset  # локальний індекс виходу за часом
+    hit_index = np.full(len(pending), -1, dtype=np.int64)
+    if intrabar:
+        orders = [p[1] for p in pending]
+        take_profit = [o["take_profit"] for o in orders]
+        hit_index, hit_price, is_stop = find_first_touch(
+            data.open,
+            data.high,
+            data.low,
+            np.maximum(entry - offset, -1),
+            np.array([1 if o["side"] == "long" else -1 for o in orders]),
+            np.array([o["stop_loss"] for o in orders], dtype=np.float64),
+            np.array([np.nan if tp is None else tp for tp in take_profit]),
+            np.minimum(time_exit, size - 1),
+        )
+
+    resolved, waiting = [], []
+    for k, item in enumerate(pending):
+        seq, order = item[0], item[1]
+        if hit_index[k] >= 0:
+            reason = EXIT_STOP_LOSS if is_stop[k] else EXIT_TAKE_PROFIT
+            resolved.append(
+                (offset + int(hit_index[k]), seq, float(hit_price[k]), reason, order)
+            )
+        elif time_exit[k] < size:
+            local = int(time_exit[k])
+            resolved.append(
+                (offset + local, seq, float(data.close[local]), EXIT_TIME, order)
+            )
+        else:
+            waiting.append(item)
+    return resolved, waiting
@@ -0,0 +1,301 @@
+# core\metrics.py
+
+"""
+Метрики результатів бек-тесту за журналом угод і кривою балансу.
+
+Векторні функції (NumPy, без циклу по угодах/барах):
+- trade_metrics — прибуток, win rate, profit factor, очікування;
+- equity_curve / exposure — крива балансу і частка барів у ринку
+  з журналу угод (open_index / exit_index);
+- equity_metrics — Sharpe, Sortino, максимальна просадка і її тривалість;
+- compute_metrics — усе разом.
+
+MetricsTracker рахує ті самі метрики інкрементально (O(1) на бар або
+угоду) для живих моніторів.
+"""
+
+from __future__ import annotations
+
+import math
+
+import numpy as np
+
+from core.execution import trades_to_array
+
+# періодів (барів) на рік для річних Sharpe/Sortino; 252 — денні бари
+PERIODS_PER_YEAR = 252
+
+
+def _ledger(trades) -> np.ndarray:
+    """Журнал угод як structured array (список угод або готовий масив)."""
+    if isinstance(trades, np.ndarray) and trades.dtype.names:
+        return trades
+    return trades_to_array(trades)
+
+
+def _profit_factor(gross_profit: float, gross_loss: float) -> float:
+    if gross_loss > 0:
+        return float(gross_profit / gross_loss)
+    return float("inf") if gross_profit > 0 else 0.0
+
+
+def trade_metrics(trades) -> dict:
+    """
+    Метрики за прибутками угод (угоди без 'profit' рахуються з нулем).
+
+    :param trades: Список угод (Order/словники) або structured array
+        з trades_to_array.
+    """
+    profits = np.nan_to_num(_ledger(trades)["profit"])
+    wins = profits[profits > 0]
+    losses = profits[profits < 0]
+    gross_profit, gross_loss = float(wins.sum()), float(-losses.sum())
+    count = len(profits)
+    return {
+        "trades": count,
+        "net_profit": float(profits.sum()),
+        "gross_profit": gross_profit,
+        "gross_loss": gross_loss,
+        "win_rate": len(wins) / count if count else 0.0,
+        "profit_factor": _profit_factor(gross_profit, gross_loss),
+        "expectancy": float(profits.mean()) if count else 0.0,
+        "avg_win": float(wins.mean()) if len(wins) else 0.0,
+        "avg_loss": float(losses.mean()) if len(losses) else 0.0,
+    }
+
+
+def equity_curve(trades, n_bars: int, start_balance: float) -> np.ndarray:
+    """
+    Реалізований баланс на кожному барі: прибуток угоди додається
+    на її барі виходу (exit_index; вихід після останнього бару — на останньому).
+    Угоди без 'exit_index' або 'profit' не враховуються.
+    """
+    ledger = _ledger(trades)
+    closed = (ledger["exit_index"] >= 0) & ~np.isnan(ledger["profit"])
+    bars = np.minimum(ledger["exit_index"][closed], n_bars - 1)
+    pnl = np.bincount(bars, weights=ledger["profit"][closed], minlength=n_bars)
+    return start_balance + np.cumsum(pnl[:n_bars])
+
+
+def exposure(trades, n_bars: int) -> float:
+    """
+    Частка барів з хоча б однією відкритою позицією.
+
+    Позиція відкривається на закритті бару open_index і тримається на
+    барах open_index + 1 .. exit_index.
+    """
+    if n_bars <= 0:
+        return 0.0
+    ledger = _ledger(trades)
+    valid = (ledger["open_index"] >= 0) & (ledger["exit_index"] >= 0)
+    start = np.minimum(ledger["open_index"][valid] + 1, n_bars)
+    stop = np.minimum(ledger["exit_index"][valid] + 1, n_bars)
+    depth = np.zeros(n_bars + 1, dtype=np.int64)
+    np.add.at(depth, start, 1)
+    np.add.at(depth, stop, -1)
+    return float(np.count_nonzero(np.cumsum(depth[:n_bars]) > 0) / n_bars)
+
+
+def _ratios(mean: float, std: float, downside: float, periods: float) -> tuple:
+    """Річні Sharpe і Sortino (нуль, якщо розкид нульовий)."""
+    scale = math.sqrt(periods)
+    sharpe = mean / std * scale if std > 0 else 0.0
+    sortino = mean / downside * scale if downside > 0 else 0.0
+    return sharpe, sortino
+
+
+def equity_metrics(equity, periods_per_year: float = PERIODS_PER_YEAR) -> dict:
+    """
+    Метрики кривої балансу (значення на кожному барі).
+
+    Доходності — прості, бар до бару. Sharpe — середня / стандартне
+    відхилення (ddof=1), Sortino — середня / sqrt(mean(min(r, 0)²)),
+    обидва у річному вимірі через periods_per_year. Тривалість просадки —
+    найбільша кількість барів від піку до поточного бару нижче нього.
+    """
+    equity = np.asarray(equity, dtype=np.float64)
+    if len(equity) == 0:
+        return {
+            "max_drawdown": 0.0,
+            "max_drawdown_pct": 0.0,
+            "max_drawdown_duration": 0,
+            "sharpe": 0.0,
+            "sortino": 0.0,
+        }
+
+    peaks = np.maximum.accumulate(equity)
+    depth = peaks - equity
+    with np.errstate(divide="ignore", invalid="ignore"):
+        depth_pct = np.where(peaks > 0, depth / peaks, 0.0)
+        returns = equity[1:] / equity[:-1] - 1.0
+    index = np.arange(len(equity))
+    last_peak = np.maximum.accumulate(np.where(equity >= peaks, index, 0))
+
+    if len(returns) > 1:
+        mean, std = float(returns.mean()), float(returns.std(ddof=1))
+        downside = math.sqrt(float(np.mean(np.minimum(returns, 0.0) ** 2)))
+    else:
+        mean = std = downside = 0.0
+    sharpe, sortino = _ratios(mean, std, downside, periods_per_year)
+    return {
+        "max_drawdown": float(depth.max()),
+        "max_drawdown_pct": float(depth_pct.max() * 100),
+        "max_drawdown_duration": int((index - last_peak).max()),
+        "sharpe": sharpe,
+        "sortino": sortino,
+    }
+
+
+def compute_metrics(
+    trades,
+    start_balance: float,
+    n_bars: int | None = None,
+    equity=None,
+    periods_per_year: float = PERIODS_PER_YEAR,
+) -> dict:
+    """
+    Повний набір метрик бек-тесту.
+
+    :param trades: Журнал угод або structured array.
+    :param start_balance: Баланс на початку прогону.
+    :param n_bars: Кількість барів прогону — для кривої балансу по барах
+        і exposure. None — крива будується по угодах (після кожної угоди),
+        exposure не рахується.
+    :param equity: Готова крива балансу по барах (замість побудови з угод).
+    """
+    ledger = _ledger(trades)
+    result = trade_metrics(ledger)
+    if equity is None:
+        if n_bars is None:
+            profits = np.nan_to_num(ledger["profit"])
+            equity = start_balance + np.concatenate(([0.0], np.cumsum(profits)))
+        else:
+            equity = equity_curve(ledger, n_bars, start_balance)
+    equity = np.asarray(equity, dtype=np.float64)
+    result["final_balance"] = float(equity[-1]) if len(equity) else float(start_balance)
+    result.update(equity_metrics(equity, periods_per_year))
+    if n_bars is not None:
+        result["exposure"] = exposure(ledger, n_bars)
+    return result
+
+
+def summarize_trades(trades: list[dict], start_balance: float) -> dict:
+    """Рахує основні метрики за журналом закритих угод."""
+    metrics = compute_metrics(trades, start_balance)
+    keys = (
+        "trades",
+        "net_profit",
+        "final_balance",
+        "win_rate",
+        "profit_factor",
+        "expectancy",
+        "max_drawdown_pct",
+    )
+    return {key: metrics[key] for key in keys}
+
+
+class MetricsTracker:
+    """
+    Інкрементальні метрики для живого моніторингу (O(1) на виклик).
+
+    add_trade(profit) — після закриття угоди; update(balance, in_market) —
+    на кожному барі. metrics() повертає ті самі ключі, що й
+    trade_metrics + equity_metrics + exposure; для однакових даних
+    значення збігаються з векторними (з точністю до округлення).
+    """
+
+    def __init__(self, periods_per_year: float = PERIODS_PER_YEAR):
+        self.periods_per_year = periods_per_year
+        self.reset()
+
+    def reset(self) -> None:
+        # угоди
+        self.trades = 0
+        self.wins = 0
+        self.losses = 0
+        self.gross_profit = 0.0
+        self.gross_loss = 0.0
+        # крива балансу
+        self.bars = 0
+        self.bars_in_market = 0
+        self.balance = None
+        self.peak = None
+        self.max_drawdown = 0.0
+        self.max_drawdown_pct = 0.0
+        self.max_drawdown_duration = 0
+        self._peak_bar = 0
+        # доходності (Welford: середня і сума квадратів відхилень)
+        self._returns = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._downside = 0.0
+
+    def add_trade(self, profit: float) -> None:
+        """Враховує закриту угоду."""
+        self.trades += 1
+        if profit > 0:
+            self.wins += 1
+            self.gross_profit += profit
+        elif profit < 0:
+            self.losses += 1
+            self.gross_loss -= profit
+
+    def update(self, balance: float, in_market: bool = False) -> None:
+        """Враховує баланс чергового бару (і чи була відкрита позиція)."""
+        if self.balance is not None and self.balance != 0:
+            r = balance / self.balance - 1.0
+            self._returns += 1
+            delta = r - self._mean
+            self._mean += delta / self._returns
+            self._m2 += delta * (r - self._mean)
+            if r < 0:
+                self._downside += r * r
+
+        if self.peak is None or balance >= self.peak:
+            self.peak = balance
+            self._peak_bar = self.bars
+        depth = self.peak - balance
+        self.max_drawdown = max(self.max_drawdown, depth)
+        if self.peak > 0:
+            self.max_drawdown_pct = max(self.max_drawdown_pct, depth / self.peak * 100)
+        self.max_drawdown_duration = max(
+            self.max_drawdown_duration, self.bars - self._peak_bar
+        )
+
+        self.balance = balance
+        self.bars += 1
+        self.bars_in_market += bool(in_market)
+
+    @property
+    def net_profit(self) -> float:
+        return self.gross_profit - self.gross_loss
+
+    @property
+    def win_rate(self) -> float:
+        return self.wins / self.trades if self.trades else 0.0
+
+    def metrics(self) -> dict:
+        if self._returns > 1:
+            std = math.sqrt(self._m2 / (self._returns - 1))
+            downside = math.sqrt(self._downside / self._returns)
+        else:
+            std = downside = 0.0
+        mean = self._mean if self._returns > 1 else 0.0
+        sharpe, sortino = _ratios(mean, std, downside, self.periods_per_year)
+        return {
+            "trades": self.trades,
+            "net_profit": self.net_profit,
+            "gross_profit": self.gross_profit,
+            "gross_loss": self.gross_loss,
+            "win_rate": self.win_rate,
+            "profit_factor": _profit_factor(self.gross_profit, self.gross_loss),
+            "expectancy": self.net_profit / self.trades if self.trades else 0.0,
+            "avg_win": self.gross_profit / self.wins if self.wins else 0.0,
+            "avg_loss": -self.gross_loss / self.losses if self.losses else 0.0,
+            "max_drawdown": self.max_drawdown,
+            "max_drawdown_pct": self.max_drawdown_pct,
+            "max_drawdown_duration": self.max_drawdown_duration,
+            "sharpe": sharpe,
+            "sortino": sortino,
+            "exposure": self.bars_in_market / self.bars if self.bars else 0.0,
+        }
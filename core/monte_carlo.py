@@ -0,0 +1,193 @@
+# core\monte_carlo.py
+
+"""
+Monte Carlo аналіз стійкості послідовності угод бек-тесту.
+
+Після Backtester.run журнал угод перетворюється на R-множники
+(прибуток угоди / ризик, закладений при відкритті). Послідовність
+R перемішується (shuffle) або вибирається з поверненням (bootstrap)
+тисячі разів, і для кожного шляху рахуються:
+- фінальний баланс (позиція — risk_per_trade від поточного балансу,
+  як у RiskManager.calc_position_size);
+- максимальна просадка від піку;
+- руїна — баланс опустився нижче межі RiskManager
+  (start_balance * (1 - max_drawdown)); після неї торгівля зупиняється.
+
+Обчислення пакетні: шляхи — рядки 2-D матриці, кумулятивна сума
+логарифмів балансу і біжучий максимум рахуються NumPy вздовж рядків,
+без Python-циклу по шляхах (цикл лише по пакетах рядків для обмеження пам'яті).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from core.config_trades import RISK_MANAGER
+from core.risk_manager import RiskManager
+
+METHODS = ("bootstrap", "shuffle")
+# елементів матриці в одному пакеті (~32 МБ float64)
+BATCH_ELEMENTS = 4_000_000
+
+
+def r_multiples(trades: list[dict]) -> np.ndarray:
+    """
+    R-множники закритих угод: profit / (size * |price - stop_loss|).
+
+    Угоди без прибутку ('profit') або з нульовим ризиком пропускаються.
+    """
+    values = []
+    for trade in trades:
+        if "profit" not in trade:
+            continue
+        risk = trade["size"] * abs(trade["price"] - trade["stop_loss"])
+        if risk > 0:
+            values.append(trade["profit"] / risk)
+    return np.asarray(values, dtype=np.float64)
+
+
+@dataclass
+class MonteCarloResult:
+    """Розподіли метрик по змодельованих шляхах."""
+
+    method: str
+    start_balance: float
+    ruin_balance: float
+    final_balance: np.ndarray = field(repr=False)
+    max_drawdown_pct: np.ndarray = field(repr=False)
+    ruined: np.ndarray = field(repr=False)
+
+    @property
+    def simulations(self) -> int:
+        return len(self.final_balance)
+
+    @property
+    def risk_of_ruin(self) -> float:
+        """Частка шляхів, що опустилися нижче межі просадки RiskManager."""
+        return float(self.ruined.mean()) if self.simulations else 0.0
+
+    def percentiles(self, q=(5, 25, 50, 75, 95)) -> dict:
+        """Перцентилі фінального балансу і просадки (у %)."""
+        return {
+            "final_balance": dict(zip(q, np.percentile(self.final_balance, q))),
+            "max_drawdown_pct": dict(zip(q, np.percentile(self.max_drawdown_pct, q))),
+        }
+
+    def summary(self) -> dict:
+        """Коротке зведення для логів і таблиць."""
+        return {
+            "simulations": self.simulations,
+            "mean_final_balance": float(self.final_balance.mean()),
+            "median_final_balance": float(np.median(self.final_balance)),
+            "p5_final_balance": float(np.percentile(self.final_balance, 5)),
+            "mean_max_drawdown_pct": float(self.max_drawdown_pct.mean()),
+            "p95_max_drawdown_pct": float(np.percentile(self.max_drawdown_pct, 95)),
+            "risk_of_ruin": self.risk_of_ruin,
+        }
+
+
+def _sample_paths(rng, log_growth: np.ndarray, rows: int, method: str):
+    """Матриця (rows × угоди) лог-змін балансу для bootstrap або shuffle."""
+    size = len(log_growth)
+    if method == "bootstrap":
+        return log_growth[rng.integers(0, size, (rows, size))]
+    return rng.permuted(np.broadcast_to(log_growth, (rows, size)), axis=1)
+
+
+def simulate(
+    r: np.ndarray,
+    simulations: int = 10_000,
+    method: str = "bootstrap",
+    start_balance: float = RISK_MANAGER["balance"],
+    risk_per_trade: float = RISK_MANAGER["risk_per_trade"],
+    max_drawdown: float = RISK_MANAGER["max_drawdown"],
+    seed: int | None = None,
+) -> MonteCarloResult:
+    """
+    Моделює simulations шляхів з послідовності R-множників.
+
+    Баланс шляху: start_balance * prod(1 + risk_per_trade * R), у
+    лог-просторі — кумулятивна сума вздовж рядка. Просадка — від біжучого
+    максимуму (включно зі стартовим балансом). На руїні шлях зупиняється:
+    фінальний баланс і просадка беруться на першій угоді нижче межі.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown method: {method!r}")
+    r = np.asarray(r, dtype=np.float64)
+    size = len(r)
+    ruin_balance = start_balance * (1 - max_drawdown)
+    # у циклі: лог-баланс і лог-глибина просадки; у кінці — баланс і %
+    final = np.zeros(simulations)
+    drawdown = np.zeros(simulations)
+    ruined = np.zeros(simulations, dtype=bool)
+    if size == 0 or simulations == 0:
+        return MonteCarloResult(
+            method, start_balance, ruin_balance, final + start_balance, drawdown, ruined
+        )
+
+    # лог-зміна балансу на угоду; повна втрата — -inf (шлях точно руїна)
+    growth = 1.0 + risk_per_trade * r
+    with np.errstate(divide="ignore"):
+        log_growth = np.where(growth > 0, np.log(np.maximum(growth, 1e-300)), -np.inf)
+    log_floor = np.log1p(-max_drawdown) if max_drawdown < 1 else -np.inf
+
+    rng = np.random.default_rng(seed)
+    batch = max(1, BATCH_ELEMENTS // size)
+    for start in range(0, simulations, batch):
+        rows = min(batch, simulations - start)
+        log_equity = np.cumsum(_sample_paths(rng, log_growth, rows, method), axis=1)
+        peak = np.maximum.accumulate(log_equity, axis=1)
+        np.maximum(peak, 0.0, out=peak)  # пік включає стартовий баланс
+        depth = np.subtract(peak, log_equity, out=peak)
+
+        out = slice(start, start + rows)
+        final[out] = log_equity[:, -1]
+        drawdown[out] = depth.max(axis=1)
+        hit = np.flatnonzero(log_equity.min(axis=1) < log_floor)
+        if hit.size:
+            # після руїни RiskManager не відкриває угод — метрики до неї
+            first = (log_equity[hit] < log_floor).argmax(axis=1)
+            final[out][hit] = log_equity[hit, first]
+            mask = np.arange(size) <= first[:, None]
+            drawdown[out][hit] = np.where(mask, depth[hit], 0.0).max(axis=1)
+            ruined[out][hit] = True
+
+    final = start_balance * np.exp(final)
+    drawdown = -np.expm1(-drawdown) * 100.0
+    return MonteCarloResult(
+        method, start_balance, ruin_balance, final, drawdown, ruined
+    )
+
+
+def monte_carlo(
+    trades: list[dict],
+    risk_manager: RiskManager | None = None,
+    simulations: int = 10_000,
+    method: str = "bootstrap",
+    seed: int | None = None,
+) -> MonteCarloResult:
+    """
+    Monte Carlo по журналу угод Backtester.run.
+
+    Стартовий баланс, ризик на угоду і межа просадки беруться з risk_manager
+    (його start_balance), інакше — з config_trades.RISK_MANAGER.
+    """
+    if risk_manager is None:
+        limits = RISK_MANAGER
+    else:
+        limits = {
+            "balance": risk_manager.start_balance,
+            "risk_per_trade": risk_manager.risk_per_trade,
+            "max_drawdown": risk_manager.max_drawdown,
+        }
+    return simulate(
+        r_multiples(trades),
+        simulations=simulations,
+        method=method,
+        start_balance=limits["balance"],
+        risk_per_trade=limits["risk_per_trade"],
+        max_drawdown=limits["max_drawdown"],
+        seed=seed,
+    )
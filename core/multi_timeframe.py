@@ -0,0 +1,105 @@
+# core\multi_timeframe.py
+
+"""
+Доступ стратегій до кількох таймфреймів (напр. сигнали M5 з фільтром H1).
+
+MultiTimeframe тримає базову серію і серії вищих таймфреймів разом
+з картами індексів, порахованими один раз (np.searchsorted на всю історію):
+для кожного базового бару i карта дає індекс останнього ЗАВЕРШЕНОГО бару
+вищого таймфрейму. Бар вищого таймфрейму [T, T + tf) вважається
+завершеним, коли закрився базовий бар, тобто T + tf <= t_i + base —
+жодного заглядання в майбутнє. Пошук з on_bar / generate_signal — O(1)
+(індекс у масиві).
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+from core.bar_data import Bar, BarSeries
+from core.resampler import resample, timeframe_seconds
+
+
+def infer_timeframe(times: np.ndarray) -> int:
+    """Тривалість базового бару, секунди: найменший додатний крок часу."""
+    steps = np.diff(np.asarray(times, dtype=np.int64))
+    steps = steps[steps > 0]
+    if not len(steps):
+        raise ValueError("Cannot infer base timeframe; pass base_timeframe")
+    return int(steps.min())
+
+
+class MultiTimeframe:
+    """
+    Базова серія і вирівняні з нею вищі таймфрейми.
+
+    :param base: Базова серія (відсортована за часом).
+    :param higher: Таймфрейм ("H1", 3600, "1 hour") -> серія цього таймфрейму
+        (час бару — його початок, як у core.resampler.resample).
+    :param base_timeframe: Таймфрейм базової серії (None — з кроку часу).
+    """
+
+    def __init__(
+        self,
+        base: BarSeries,
+        higher: dict[object, BarSeries],
+        base_timeframe=None,
+    ):
+        self.base = base
+        if base_timeframe is None:
+            self.base_seconds = infer_timeframe(base.time)
+        else:
+            self.base_seconds = timeframe_seconds(base_timeframe)
+        self.series: dict[object, BarSeries] = {}
+        self._maps: dict[object, np.ndarray] = {}
+        base_close_time = base.time + self.base_seconds
+        for timeframe, series in higher.items():
+            end = series.time + timeframe_seconds(timeframe)
+            index = np.searchsorted(end, base_close_time, side="right") - 1
+            index.setflags(write=False)
+            self.series[timeframe] = series
+            self._maps[timeframe] = index
+
+    @classmethod
+    def from_base(
+        cls, base: BarSeries, timeframes, base_timeframe=None
+    ) -> "MultiTimeframe":
+        """Вищі таймфрейми будуються з базової серії (core.resampler.resample)."""
+        return cls(base, {tf: resample(base, tf) for tf in timeframes}, base_timeframe)
+
+    def __len__(self) -> int:
+        return len(self.base)
+
+    def index_map(self, timeframe) -> np.ndarray:
+        """
+        Карта індексів (лише для читання): для кожного базового бару —
+        індекс останнього завершеного бару timeframe або -1.
+        """
+        return self._maps[timeframe]
+
+    def index(self, timeframe, i: int) -> int:
+        """Індекс останнього завершеного бару timeframe на барі i (-1 — ще немає)."""
+        return int(self._maps[timeframe][i])
+
+    def bar(self, timeframe, i: int) -> Bar | None:
+        """Останній завершений бар timeframe на базовому барі i або None."""
+        j = self._maps[timeframe][i]
+        return None if j < 0 else self.series[timeframe][int(j)]
+
+    def value(self, timeframe, field: str, i: int) -> float | None:
+        """Поле (напр. 'close') останнього завершеного бару timeframe або None."""
+        j = self._maps[timeframe][i]
+        return None if j < 0 else float(getattr(self.series[timeframe], field)[j])
+
+    def align(self, timeframe, values, fill: float = np.nan) -> np.ndarray:
+        """
+        Переносить ряд рівня timeframe (напр. індикатор над його закриттями)
+        на базові бари: значення останнього завершеного бару або fill.
+        """
+        values = np.asarray(values)
+        index = self._maps[timeframe]
+        if not len(values):
+            return np.full(len(index), fill)
+        out = values[np.maximum(index, 0)].astype(np.result_type(values, type(fill)))
+        out[index < 0] = fill
+        return out
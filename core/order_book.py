@@ -0,0 +1,185 @@
+# core\order_book.py
+
+"""
+Книга відкладених limit/stop ордерів для симулятора виконання.
+
+Відкладені ордери лежать у купах за ціною спрацювання — окремо для
+кожного символу, сторони і типу:
+- buy limit, sell stop — спрацьовують, коли low <= ціни (купа за спаданням);
+- sell limit, buy stop — спрацьовують, коли high >= ціни (купа за зростанням).
+
+На новому барі (або тику) з кожної купи знімаються лише ордери, чию ціну
+перетнуто: вершина купи — найближчий до спрацювання ордер, тож перевірка
+зупиняється на першому неперетнутому, а кожне виконання коштує O(log n).
+Скасування — ліниве (запис у купі пропускається при знятті), купи
+перебудовуються, коли скасованих записів стає більше, ніж активних.
+
+Ціна виконання: ціна ордера або ціна відкриття бару, якщо бар відкрився
+за нею (гепом) — limit отримує кращу ціну, stop — гіршу.
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+
+ORDER_TYPES = ("limit", "stop")
+SIDES = ("long", "short")
+# скасовані записи, до яких купи не перебудовуються
+_MIN_STALE = 64
+
+
+class PendingOrder:
+    """Відкладений ордер (limit або stop) до виконання."""
+
+    __slots__ = (
+        "id",
+        "symbol",
+        "side",
+        "order_type",
+        "price",
+        "stop_loss",
+        "take_profit",
+        "seq",
+    )
+
+    def __init__(
+        self,
+        id,
+        symbol: str,
+        side: str,
+        order_type: str,
+        price: float,
+        stop_loss: float,
+        take_profit: float | None = None,
+    ):
+        side = side.lower()
+        order_type = order_type.lower()
+        if side not in SIDES:
+            raise ValueError(f"Unknown side: {side!r}")
+        if order_type not in ORDER_TYPES:
+            raise ValueError(f"Unknown order type: {order_type!r}")
+        self.id = id
+        self.symbol = symbol
+        self.side = side
+        self.order_type = order_type
+        self.price = float(price)
+        self.stop_loss = stop_loss
+        self.take_profit = take_profit
+        self.seq = 0
+
+    @property
+    def triggers_below(self) -> bool:
+        """True — спрацьовує, коли ціна опускається до рівня (buy limit, sell stop)."""
+        return (self.side == "long") == (self.order_type == "limit")
+
+    def fill_price(self, open_price: float) -> float:
+        """Ціна виконання з урахуванням гепу на відкритті бару."""
+        if self.triggers_below:
+            return min(open_price, self.price)
+        return max(open_price, self.price)
+
+    def __repr__(self) -> str:
+        return (
+            f"PendingOrder(id={self.id!r}, {self.symbol} {self.side} "
+            f"{self.order_type} @ {self.price})"
+        )
+
+
+class OrderBook:
+    """
+    Відкладені ордери, впорядковані за ціною спрацювання.
+
+    add / cancel — O(log n); match(symbol, open, high, low) знімає
+    і повертає лише перетнуті ордери.
+    """
+
+    def __init__(self):
+        # символ -> (сторона, тип) -> купа (ключ ціни, seq, ордер)
+        self._books: dict[str, dict[tuple[str, str], list]] = {}
+        self._orders: dict = {}
+        self._seq = itertools.count()
+        self._stale = 0
+
+    def __len__(self) -> int:
+        return len(self._orders)
+
+    def __contains__(self, order_id) -> bool:
+        return order_id in self._orders
+
+    def get(self, order_id) -> PendingOrder | None:
+        return self._orders.get(order_id)
+
+    def orders(self, symbol: str | None = None) -> list[PendingOrder]:
+        """Активні відкладені ордери (у порядку подання)."""
+        found = (o for o in self._orders.values() if symbol in (None, o.symbol))
+        return sorted(found, key=lambda o: o.seq)
+
+    def add(self, order: PendingOrder) -> None:
+        if order.id in self._orders:
+            raise ValueError(f"Duplicate pending order id: {order.id!r}")
+        order.seq = next(self._seq)
+        self._orders[order.id] = order
+        heapq.heappush(self._heap(order), self._entry(order))
+
+    def cancel(self, order_id) -> bool:
+        """Скасовує ордер; False, якщо його немає серед активних."""
+        if self._orders.pop(order_id, None) is None:
+            return False
+        self._stale += 1
+        if self._stale > max(_MIN_STALE, len(self._orders)):
+            self._compact()
+        return True
+
+    def match(
+        self, symbol: str, open_price: float, high: float, low: float
+    ) -> list[tuple[PendingOrder, float]]:
+        """
+        Знімає ордери symbol, перетнуті баром, і повертає (ордер, ціна
+        виконання) — від найближчого до відкриття бару.
+        """
+        book = self._books.get(symbol)
+        if not book:
+            return []
+        fills = []
+        for (side, order_type), heap in book.items():
+            below = (side == "long") == (order_type == "limit")
+            while heap:
+                key, _, order = heap[0]
+                if self._orders.get(order.id) is not order:
+                    heapq.heappop(heap)  # скасований запис
+                    self._stale -= 1
+                    continue
+                # ключ "нижніх" ордерів — мінус ціна (купа за спаданням ціни)
+                if (-key < low) if below else (key > high):
+                    break
+                heapq.heappop(heap)
+                del self._orders[order.id]
+                fills.append((order, order.fill_price(open_price)))
+        fills.sort(key=lambda fill: (abs(fill[1] - open_price), fill[0].seq))
+        return fills
+
+    def match_price(
+        self, symbol: str, price: float
+    ) -> list[tuple[PendingOrder, float]]:
+        """match для тику (open = high = low = price)."""
+        return self.match(symbol, price, price, price)
+
+    def _heap(self, order: PendingOrder) -> list:
+        book = self._books.setdefault(order.symbol, {})
+        return book.setdefault((order.side, order.order_type), [])
+
+    @staticmethod
+    def _entry(order: PendingOrder) -> tuple:
+        key = -order.price if order.triggers_below else order.price
+        return (key, order.seq, order)
+
+    def _compact(self) -> None:
+        """Перебудовує купи без скасованих записів."""
+        self._books = {}
+        for order in self._orders.values():
+            self._heap(order).append(self._entry(order))
+        for book in self._books.values():
+            for heap in book.values():
+                heapq.heapify(heap)
+        self._stale = 0
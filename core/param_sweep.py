@@ -0,0 +1,531 @@
+# core\param_sweep.py
+
+"""
+Паралельний перебір параметрів SMAStrategy / RiskManager.
+
+Можливості:
+- grid_params / random_params — генерація наборів параметрів
+  (sma_fast, sma_slow, sl_coef, rr_ratio, risk_per_trade тощо).
+- ParameterSweep — запускає бек-тести у ProcessPoolExecutor за кількістю ядер.
+  Ціни передаються воркерам один раз через multiprocessing.shared_memory,
+  тому кожне завдання містить лише словник параметрів.
+- Результати повертаються рейтингованою таблицею метрик.
+- З result_cache (core.result_cache) вже пораховані набори беруться
+  з кешу, у пул ідуть лише промахи.
+- Ряди SMA всіх періодів перебору рахуються один раз (core.indicator_cache)
+  і передаються воркерам через shared_memory разом із цінами.
+- Сигнали всіх наборів рахуються пакетом (core.signal_batch): одна
+  матриця пара × бар на блок наборів замість окремого проходу на кожен.
+
+CLI:
+    python -m core.param_sweep data/test_backtester_sma_data.csv \\
+        --grid sma_fast=2,3,5 sma_slow=5,8,13 --top 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from core.backtester_vectorized import VectorizedBacktester
+from core.bar_cache import load_cached_bars
+from core.bar_data import BAR_FIELDS, BarSeries
+from core.config_trades import RISK_MANAGER, STRATEGY, TRADES
+from core.indicator_cache import default_cache
+from core.metrics import summarize_trades
+from core.result_cache import (
+    ResultCache,
+    data_hash,
+    result_key,
+    risk_fingerprint,
+    strategy_fingerprint,
+)
+from core.risk_manager import RiskManager
+from core.signal_batch import MAX_BLOCK_BYTES, sma_cross_matrix
+from strategies.strategy_sma import SMAStrategy
+
+STRATEGY_KEYS = ("sma_fast", "sma_slow", "sl_coef", "rr_ratio")
+RISK_KEYS = ("balance", "risk_per_trade", "max_drawdown", "max_trades_per_day")
+INT_KEYS = ("sma_fast", "sma_slow", "max_trades_per_day")
+METRIC_KEYS = (
+    "trades",
+    "net_profit",
+    "final_balance",
+    "win_rate",
+    "profit_factor",
+    "expectancy",
+    "max_drawdown_pct",
+)
+
+
+# -----------------------------
+# Генерація наборів параметрів
+# -----------------------------
+def _is_valid(params: dict) -> bool:
+    """Відкидає набори, де швидка SMA не коротша за повільну."""
+    fast = params.get("sma_fast", STRATEGY["sma_fast"])
+    slow = params.get("sma_slow", STRATEGY["sma_slow"])
+    return 0 < fast < slow
+
+
+def grid_params(space: dict[str, list]) -> list[dict]:
+    """Повний перебір: декартів добуток значень кожного параметра."""
+    keys = list(space)
+    combos = (dict(zip(keys, values)) for values in itertools.product(*space.values()))
+    return [params for params in combos if _is_valid(params)]
+
+
+def random_params(space: dict, count: int, seed: int | None = None) -> list[dict]:
+    """
+    Випадковий пошук.
+
+    Значення простору — список (вибір з нього) або кортеж (low, high)
+    (рівномірно; для цілих параметрів — randint).
+    """
+    rng = random.Random(seed)
+    result: list[dict] = []
+    attempts = 0
+    while len(result) < count and attempts < count * 100:
+        attempts += 1
+        params = {}
+        for key, values in space.items():
+            if isinstance(values, tuple):
+                low, high = values
+                if key in INT_KEYS:
+                    params[key] = rng.randint(int(low), int(high))
+                else:
+                    params[key] = rng.uniform(low, high)
+            else:
+                params[key] = rng.choice(list(values))
+        if _is_valid(params):
+            result.append(params)
+    return result
+
+
+# -----------------------------
+# Спільна пам'ять для цін
+# -----------------------------
+class SharedBars:
+    """
+    Копія BarSeries в одному блоці shared_memory.
+
+    Батьківський процес створює блок (with SharedBars(data) as shared),
+    воркери підключаються за shared.spec без копіювання масивів.
+    """
+
+    def __init__(self, data: BarSeries):
+        size = len(data)
+        self._shm = shared_memory.SharedMemory(
+            create=True, size=max(1, size * 8 * len(BAR_FIELDS))
+        )
+        self.spec = (self._shm.name, size)
+        view = attach_bars(self._shm, size)
+        for name in BAR_FIELDS:
+            getattr(view, name)[:] = getattr(data, name)
+
+    def close(self) -> None:
+        """Закриває і видаляє блок спільної пам'яті."""
+        self._shm.close()
+        self._shm.unlink()
+
+    def __enter__(self) -> "SharedBars":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def attach_bars(shm: shared_memory.SharedMemory, size: int) -> BarSeries:
+    """Повертає BarSeries, колонки якої є представленнями блоку shm."""
+    columns = []
+    for k, name in enumerate(BAR_FIELDS):
+        dtype = np.int64 if name == "time" else np.float64
+        columns.append(
+            np.ndarray((size,), dtype=dtype, buffer=shm.buf, offset=k * size * 8)
+        )
+    return BarSeries(*columns)
+
+
+class SharedSeries:
+    """
+    Пораховані ряди індикаторів в одному блоці shared_memory.
+
+    spec — (ім'я блоку, довжина ряду, ключі IndicatorCache у порядку рядів).
+    """
+
+    def __init__(self, series: dict[tuple, np.ndarray]):
+        keys = list(series)
+        size = len(next(iter(series.values()))) if keys else 0
+        self._shm = shared_memory.SharedMemory(
+            create=True, size=max(1, size * 8 * len(keys))
+        )
+        self.spec = (self._shm.name, size, keys)
+        for key, view in zip(keys, attach_series(self._shm, size, len(keys))):
+            view[:] = series[key]
+
+    def close(self) -> None:
+        """Закриває і видаляє блок спільної пам'яті."""
+        self._shm.close()
+        self._shm.unlink()
+
+    def __enter__(self) -> "SharedSeries":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def attach_series(
+    shm: shared_memory.SharedMemory, size: int, count: int
+) -> list[np.ndarray]:
+    """Ряди float64 довжини size, що є представленнями блоку shm."""
+    return [
+        np.ndarray((size,), dtype=np.float64, buffer=shm.buf, offset=k * size * 8)
+        for k in range(count)
+    ]
+
+
+def _open_shared(name: str) -> shared_memory.SharedMemory:
+    """
+    Підключається до існуючого блоку.
+
+    Блок належить батьківському процесу: з Python 3.13 воркер не реєструє
+    його у resource_tracker; у старіших версіях повторна реєстрація у спільному
+    трекері нічого не змінює, а unlink робить лише батьківський процес.
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:  # Python < 3.13
+        return shared_memory.SharedMemory(name=name)
+
+
+# --- стан воркера (один на процес) ---
+_worker_shm = None
+_worker_series_shm = None
+_worker_data: BarSeries | None = None
+
+
+def init_shared_worker(
+    spec: tuple[str, int],
+    series_spec: tuple | None = None,
+    dataset: str | None = None,
+) -> None:
+    """
+    Ініціалізатор процесу пулу: підключає спільні ціни за SharedBars.spec.
+
+    :param series_spec: SharedSeries.spec — готові ряди індикаторів, що
+        додаються до кешу індикаторів процесу.
+    :param dataset: Ідентифікатор даних цін у кеші індикаторів батьківського
+        процесу (щоб воркер не хешував ціни заново).
+    """
+    global _worker_shm, _worker_series_shm, _worker_data
+    name, size = spec
+    _worker_shm = _open_shared(name)
+    _worker_data = attach_bars(_worker_shm, size)
+
+    cache = default_cache()
+    if dataset is not None:
+        cache.register_dataset(_worker_data.close, dataset)
+    if series_spec is not None:
+        name, size, keys = series_spec
+        _worker_series_shm = _open_shared(name)
+        for key, view in zip(keys, attach_series(_worker_series_shm, size, len(keys))):
+            cache.put(key, view)
+
+
+def shared_worker_data() -> BarSeries:
+    """Повертає ціни, підключені в init_shared_worker поточного процесу."""
+    if _worker_data is None:
+        raise RuntimeError("Shared bars are not attached in this process")
+    return _worker_data
+
+
+def _evaluate_task(task: tuple[list[dict], dict, int | None]) -> list[dict]:
+    """Завдання пулу: бек-тести блоку наборів параметрів на спільних даних."""
+    param_list, base, close_after_bars = task
+    return evaluate_batch(shared_worker_data(), param_list, base, close_after_bars)
+
+
+# -----------------------------
+# Оцінка одного набору
+# -----------------------------
+def _build_run(params: dict, base: dict | None) -> tuple[SMAStrategy, RiskManager]:
+    """Стратегія і RiskManager для набору параметрів (поверх базових)."""
+    merged = {**STRATEGY, **RISK_MANAGER, **(base or {}), **params}
+    strategy = SMAStrategy(**{k: merged[k] for k in STRATEGY_KEYS})
+    return strategy, RiskManager(**{k: merged[k] for k in RISK_KEYS})
+
+
+def evaluate_params(
+    data: BarSeries,
+    params: dict,
+    base: dict | None = None,
+    close_after_bars: int | None = None,
+    signals: np.ndarray | None = None,
+) -> dict:
+    """
+    Запускає VectorizedBacktester для одного набору параметрів.
+
+    :param data: Ціни (звичайна або спільна BarSeries).
+    :param params: Параметри, що перебираються.
+    :param base: Базові значення для решти параметрів (STRATEGY + RISK_MANAGER).
+    :param signals: Готові сигнали набору (рядок sma_cross_matrix).
+    :return: Словник параметрів разом із метриками.
+    """
+    strategy, rm = _build_run(params, base)
+    bt = VectorizedBacktester("", strategy, rm, close_after_bars)
+    trades = bt.run(data=data, signals=signals)
+    return {**params, **summarize_trades(trades, rm.start_balance)}
+
+
+def evaluate_batch(
+    data: BarSeries,
+    param_list: list[dict],
+    base: dict | None = None,
+    close_after_bars: int | None = None,
+) -> list[dict]:
+    """
+    evaluate_params для списку наборів: сигнали всіх наборів рахуються
+    матрицею sma_cross_matrix (блоками в межах MAX_BLOCK_BYTES).
+    """
+    pairs = []
+    for params in param_list:
+        strategy, _ = _build_run(params, base)
+        pairs.append((int(strategy.sma_fast), int(strategy.sma_slow)))
+
+    results = []
+    block = max(1, MAX_BLOCK_BYTES // max(len(data), 1))
+    cache = default_cache()
+    for start in range(0, len(param_list), block):
+        signals = sma_cross_matrix(
+            data.close, pairs[start : start + block], cache  # noqa
+        )
+        for params, row in zip(param_list[start : start + block], signals):  # noqa
+            results.append(evaluate_params(data, params, base, close_after_bars, row))
+    return results
+
+
+# -----------------------------
+# Перебір
+# -----------------------------
+class ParameterSweep:
+    """
+    Перебір параметрів на одному наборі цін.
+
+    Атрибути:
+        data (BarSeries): ціни для всіх бек-тестів.
+        base (dict): фіксовані параметри стратегії/ризику.
+        max_workers (int): кількість процесів (типово os.cpu_count()).
+        close_after_bars (int | None): утримання угоди в барах.
+        result_cache (ResultCache | None): кеш метрик уже оцінених наборів.
+    """
+
+    def __init__(
+        self,
+        data: BarSeries,
+        base: dict | None = None,
+        max_workers: int | None = None,
+        close_after_bars: int | None = None,
+        result_cache: ResultCache | None = None,
+    ):
+        self.data = data
+        self.base = base or {}
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.close_after_bars = close_after_bars
+        self.result_cache = result_cache
+
+    def run(self, param_list: list[dict], sort_by: str = "net_profit") -> list[dict]:
+        """
+        Оцінює всі набори і повертає їх, відсортовані за sort_by (спадання).
+        Набори, знайдені в result_cache, не перераховуються.
+        """
+        keys = self._cache_keys(param_list)
+        results = [None] * len(param_list)
+        if keys:
+            for i, key in enumerate(keys):
+                cached = self.result_cache.get(key)
+                if cached is not None:
+                    results[i] = cached.metrics
+
+        misses = [i for i, row in enumerate(results) if row is None]
+        todo = [param_list[i] for i in misses]
+        if self.max_workers <= 1 or len(todo) <= 1:
+            computed = evaluate_batch(self.data, todo, self.base, self.close_after_bars)
+        else:
+            computed = self._run_parallel(todo)
+
+        for i, row in zip(misses, computed):
+            results[i] = row
+            if keys:
+                self.result_cache.put(keys[i], [], row)
+        return sorted(results, key=lambda r: r[sort_by], reverse=True)
+
+    def _cache_keys(self, param_list: list[dict]) -> list[str] | None:
+        """Ключі result_cache для наборів (None, якщо кеш вимкнено)."""
+        if self.result_cache is None or not param_list:
+            return None
+        dataset = data_hash(self.data)
+        close_after_bars = self.close_after_bars
+        if close_after_bars is None:
+            close_after_bars = TRADES["close_after_bars"]
+        keys = []
+        for params in param_list:
+            strategy, rm = _build_run(params, self.base)
+            fingerprint = strategy_fingerprint(strategy)
+            if fingerprint is None:
+                return None
+            engine = {
+                "class": type(self).__qualname__,
+                "close_after_bars": close_after_bars,
+                # рядок результату містить і самі параметри набору
+                "row_params": sorted(params),
+            }
+            keys.append(
+                result_key(
+                    dataset,
+                    fingerprint,
+                    risk_fingerprint(rm),
+                    engine,
+                )
+            )
+        return keys
+
+    def _shared_indicators(self, param_list: list[dict]) -> tuple[dict, str]:
+        """
+        Ряди SMA усіх періодів перебору (з кешу індикаторів процесу)
+        у межах його бюджету пам'яті і ідентифікатор даних.
+        """
+        cache = default_cache()
+        closes = self.data.close
+        dataset = cache.dataset_id(closes)
+        periods = set()
+        for params in param_list:
+            strategy, _ = _build_run(params, self.base)
+            periods.update((int(strategy.sma_fast), int(strategy.sma_slow)))
+
+        series = {}
+        budget = cache.max_bytes // max(closes.nbytes, 1)
+        for period in sorted(periods)[:budget]:
+            series[("sma", (period,), dataset)] = cache.sma(closes, period)
+        return series, dataset
+
+    def _run_parallel(self, param_list: list[dict]) -> list[dict]:
+        """
+        Розподіляє набори між процесами; ціни і ряди SMA лежать
+        у shared_memory, тож кожен період рахується один раз на весь перебір.
+        """
+        workers = min(self.max_workers, len(param_list))
+        # блоки наборів: сигнали блоку рахуються у воркері однією матрицею
+        size = max(1, len(param_list) // (workers * 4))
+        tasks = [
+            (param_list[i : i + size], self.base, self.close_after_bars)  # noqa
+            for i in range(0, len(param_list), size)
+        ]
+        series, dataset = self._shared_indicators(param_list)
+        with SharedBars(self.data) as shared, SharedSeries(series) as indicators:
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=init_shared_worker,
+                initargs=(shared.spec, indicators.spec, dataset),
+            ) as pool:
+                batches = pool.map(_evaluate_task, tasks)
+                return [row for batch in batches for row in batch]
+
+    def grid(self, space: dict[str, list], sort_by: str = "net_profit") -> list[dict]:
+        """Grid search за простором значень."""
+        return self.run(grid_params(space), sort_by)
+
+    def random(
+        self,
+        space: dict,
+        count: int,
+        seed: int | None = None,
+        sort_by: str = "net_profit",
+    ) -> list[dict]:
+        """Random search: count випадкових наборів."""
+        return self.run(random_params(space, count, seed), sort_by)
+
+
+def format_table(results: list[dict], limit: int | None = None) -> str:
+    """Форматує рейтинг результатів у текстову таблицю."""
+    rows = results[:limit] if limit else results
+    if not rows:
+        return "No results"
+    columns = [k for k in rows[0] if k not in METRIC_KEYS] + list(METRIC_KEYS)
+    cells = [
+        [f"{r[c]:.4g}" if isinstance(r[c], float) else str(r[c]) for c in columns]
+        for r in rows
+    ]
+    widths = [
+        max(len(c), *(len(row[i]) for row in cells)) for i, c in enumerate(columns)
+    ]
+    lines = [" | ".join(c.rjust(w) for c, w in zip(columns, widths))]
+    lines.append("-+-".join("-" * w for w in widths))
+    lines += [" | ".join(v.rjust(w) for v, w in zip(row, widths)) for row in cells]
+    return "\n".join(lines)
+
+
+# -----------------------------
+# CLI
+# -----------------------------
+def _parse_space(items: list[str]) -> dict:
+    """Розбирає 'key=v1,v2,v3' (список) або 'key=low:high' (діапазон)."""
+    space = {}
+    for item in items:
+        key, _, raw = item.partition("=")
+        cast = int if key in INT_KEYS else float
+        if ":" in raw:
+            low, high = raw.split(":", 1)
+            space[key] = (cast(low), cast(high))
+        else:
+            space[key] = [cast(v) for v in raw.split(",")]
+    return space
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Перебір параметрів SMAStrategy")
+    parser.add_argument("data_file", help="CSV з цінами (time,open,high,low,close)")
+    parser.add_argument(
+        "--grid", nargs="+", default=[], help="параметри: key=v1,v2 або key=lo:hi"
+    )
+    parser.add_argument(
+        "--random", type=int, default=0, help="кількість випадкових наборів"
+    )
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--close-after-bars", type=int, default=None)
+    parser.add_argument("--sort-by", default="net_profit", choices=METRIC_KEYS)
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument(
+        "--no-cache", action="store_true", help="не використовувати бінарний кеш CSV"
+    )
+    parser.add_argument(
+        "--result-cache",
+        action="store_true",
+        help="брати вже пораховані набори з кешу результатів",
+    )
+    args = parser.parse_args(argv)
+
+    data = load_cached_bars(args.data_file, use_cache=not args.no_cache)
+    sweep = ParameterSweep(
+        data,
+        max_workers=args.workers,
+        close_after_bars=args.close_after_bars,
+        result_cache=ResultCache() if args.result_cache else None,
+    )
+    space = _parse_space(args.grid)
+    if args.random:
+        results = sweep.random(space, args.random, args.seed, args.sort_by)
+    else:
+        results = sweep.grid(space, args.sort_by)
+    print(format_table(results, args.top))
+
+
+if __name__ == "__main__":
+    main()
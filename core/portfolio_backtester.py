@@ -0,0 +1,178 @@
+# core\portfolio_backtester.py
+
+"""
+Портфельний бек-тест: кілька символів на одному рахунку.
+
+PortfolioBacktester:
+- Завантажує ряд BarSeries для кожного символу.
+- Зливає бари всіх символів у єдину чергу подій за часом
+  (heapq.merge по вже відсортованих масивах часу, без злиття даних у пам'яті).
+- Передає кожен бар стратегії свого символу (on_bar) і відкриває ордери
+  через спільний ExecutionEngine.
+- Усі символи ділять один RiskManager: баланс, контроль просадки і денний
+  ліміт угод (день визначається за датою бару).
+"""
+
+from __future__ import annotations
+
+import heapq
+from pathlib import Path
+
+from core.bar_cache import load_cached_bars
+from core.bar_data import BarSeries, bar_date
+from core.config_trades import TRADES
+from core.execution import ExecutionEngine
+from core.intrabar_exits import ExitCloser, schedule_exit
+from core.risk_manager import RiskManager
+from strategies.strategy_base import as_streaming
+
+MERGE_CHUNK = 4096
+
+
+def _time_events(times, symbol_index: int):
+    """
+    Генерує події (time, symbol_index, bar_index) одного символу.
+
+    Масив часу читається порціями, тому в пам'яті немає списку
+    Python-об'єктів на весь ряд.
+    """
+    for start in range(0, len(times), MERGE_CHUNK):
+        chunk = times[start : start + MERGE_CHUNK].tolist()  # noqa
+        for offset, timestamp in enumerate(chunk):
+            yield timestamp, symbol_index, start + offset
+
+
+def merge_events(series_list: list[BarSeries]):
+    """Зливає відсортовані за часом ряди в одну чергу подій (heap merge)."""
+    return heapq.merge(
+        *(_time_events(series.time, k) for k, series in enumerate(series_list))
+    )
+
+
+def _pending_exits(times, symbol_exits: list, symbol_index: int):
+    """
+    Залишені на кінець прогону виходи символу як події
+    (час бару виходу, symbol_index, бар виходу, №, запис купи) за зростанням.
+    Вихід після останнього бару датується часом останнього бару.
+    """
+    last = len(times) - 1
+    for item in sorted(symbol_exits, key=lambda item: item[:2]):
+        exit_index = item[0]
+        yield int(times[min(exit_index, last)]), symbol_index, exit_index, item[1], item
+
+
+class PortfolioBacktester(ExitCloser):
+    """
+    Бек-тест кошика символів зі спільним RiskManager.
+
+    :param data_files: Словник symbol -> CSV-файл (відносно data/ або абсолютний).
+    :param strategies: Словник symbol -> стратегія або фабрика strategy(symbol).
+    :param risk_manager: Спільний RiskManager для всіх символів.
+    :param close_after_bars: Утримання угоди в барах свого символу.
+    """
+
+    def __init__(
+        self,
+        data_files: dict[str, str],
+        strategies,
+        risk_manager: RiskManager,
+        close_after_bars: int | None = None,
+        intrabar_exits: bool = True,
+        use_cache: bool = True,
+    ):
+        base_dir = Path(__file__).parent.resolve()
+        self.data_files = {
+            symbol: base_dir.parent / "data" / path
+            for symbol, path in data_files.items()
+        }
+        self.symbols = list(data_files)
+        if callable(strategies):
+            strategies = {symbol: strategies(symbol) for symbol in self.symbols}
+        self.strategies = strategies
+        self.risk_manager = risk_manager
+        self.execution = ExecutionEngine(risk_manager, mode="simulator")
+        if close_after_bars is None:
+            close_after_bars = TRADES["close_after_bars"]
+        self.close_after_bars = close_after_bars
+        self.intrabar_exits = intrabar_exits
+        self.use_cache = use_cache
+        self.trades_log = []
+
+    def load_data(self) -> dict[str, BarSeries]:
+        """Завантажує BarSeries для кожного символу (через бінарний кеш CSV)."""
+        return {
+            symbol: load_cached_bars(path, self.use_cache)
+            for symbol, path in self.data_files.items()
+        }
+
+    def run(self, data: dict[str, BarSeries] | None = None):
+        """
+        Запуск портфельного бек-тесту.
+
+        Логіка для кожної події (бар символу) у порядку часу:
+        - Закриває ордери цього символу, чий бар виходу настав (торкання SL/TP
+          або close_after_bars барів після відкриття).
+        - Передає бар стратегії символу через on_bar.
+        - Відкриває ордер через спільний ExecutionEngine (денний ліміт
+          рахується за датою бару).
+        В кінці закриває залишені ордери (за часом виходу, для всіх символів
+        разом) — за ціною виходу або останньою ціною свого символу.
+
+        Повертає список усіх угод (з ключем 'symbol').
+        """
+        if data is None:
+            data = self.load_data()
+        series_list = [data[symbol] for symbol in self.symbols]
+        closes = [series.close for series in series_list]
+        strategies = [as_streaming(self.strategies[s]) for s in self.symbols]
+        # купа виходів на кожен символ: (бар виходу, номер, ціна, причина, ордер)
+        exits = [[] for _ in self.symbols]
+
+        for timestamp, k, i in merge_events(series_list):
+            price = float(closes[k][i])
+            symbol_exits = exits[k]
+
+            # Закриття ордерів символу, чий бар виходу настав
+            while symbol_exits and symbol_exits[0][0] <= i:
+                self._close_exit(heapq.heappop(symbol_exits))
+
+            signal = strategies[k].on_bar(series_list[k][i])
+            if signal:
+                side, stop_loss, take_profit = signal
+                ok, order = self.execution.submit_order(
+                    symbol=self.symbols[k],
+                    side=side,
+                    price=price,
+                    stop_loss=stop_loss,
+                    take_profit=take_profit,
+                    trade_date=bar_date(timestamp),
+                )
+                if ok:
+                    order["open_index"] = i
+                    exit_index, exit_price, reason = schedule_exit(
+                        series_list[k],
+                        i,
+                        order["side"],
+                        stop_loss,
+                        take_profit,
+                        self.close_after_bars,
+                        self.intrabar_exits,
+                    )
+                    heapq.heappush(
+                        symbol_exits,
+                        (exit_index, len(self.trades_log), exit_price, reason, order),
+                    )
+                    self.trades_log.append(order)
+
+        # Закриття всіх відкритих ордерів у кінці тесту — у порядку часу
+        # виходу через те саме злиття, що й під час прогону (heap merge)
+        remaining = heapq.merge(
+            *(
+                _pending_exits(series.time, symbol_exits, k)
+                for k, (series, symbol_exits) in enumerate(zip(series_list, exits))
+            )
+        )
+        for *_, item in remaining:
+            self._close_exit(item)
+
+        return self.trades_log
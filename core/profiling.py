@@ -0,0 +1,254 @@
+# core\profiling.py
+
+"""
+Профілювання бек-тесту по фазах (опційне).
+
+RunProfiler підключається до Backtester (Backtester(..., profiler=True))
+і на час run() підміняє методи об'єктів прогону обгортками з таймерами:
+- load — завантаження даних (load_data або читання порцій CSV);
+- signal — стратегія (on_bar / generate_signal);
+- risk — RiskManager.validate_order;
+- execution — ExecutionEngine.submit_order / close_order;
+- logging — LoggerMonitor.log_trade;
+- engine — решта роботи Backtester на барі (купа виходів, пошук SL/TP).
+
+Час фаз — ексклюзивний (вкладені фази віднімаються від зовнішньої),
+окремо — wall і CPU. Для кожного бару записується затримка (p50/p99).
+Без профайлера Backtester нічого не підміняє, тому вимкнене профілювання
+не додає роботи в циклі по барах.
+
+Результат — ProfileStats (profiler.stats), за потреби — JSON і файл
+cProfile (pstats).
+"""
+
+from __future__ import annotations
+
+import cProfile
+import json
+import time
+from array import array
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+
+PHASES = ("load", "signal", "risk", "execution", "logging", "engine")
+
+
+@dataclass
+class PhaseStats:
+    """Накопичені показники однієї фази."""
+
+    wall: float = 0.0
+    cpu: float = 0.0
+    calls: int = 0
+
+
+@dataclass
+class ProfileStats:
+    """Підсумок профілювання прогону."""
+
+    wall: float
+    cpu: float
+    bars: int
+    phases: dict[str, PhaseStats] = field(default_factory=dict)
+    bar_latency: np.ndarray = field(default_factory=lambda: np.empty(0), repr=False)
+
+    def latency(self, q: float) -> float:
+        """Перцентиль затримки бару, секунди."""
+        if len(self.bar_latency) == 0:
+            return 0.0
+        return float(np.percentile(self.bar_latency, q))
+
+    def to_dict(self) -> dict:
+        return {
+            "wall": self.wall,
+            "cpu": self.cpu,
+            "bars": self.bars,
+            "bars_per_sec": self.bars / self.wall if self.wall > 0 else 0.0,
+            "bar_latency": {
+                "p50": self.latency(50),
+                "p99": self.latency(99),
+                "max": float(self.bar_latency.max()) if self.bars else 0.0,
+            },
+            "phases": {
+                name: {"wall": p.wall, "cpu": p.cpu, "calls": p.calls}
+                for name, p in self.phases.items()
+            },
+        }
+
+    def dump_json(self, path: str | Path) -> None:
+        Path(path).write_text(json.dumps(self.to_dict(), indent=2), encoding="utf-8")
+
+    def summary(self) -> str:
+        """Таблиця фаз для консолі."""
+        lines = [f"{'phase':<10} {'wall, s':>10} {'cpu, s':>10} {'calls':>10} {'%':>6}"]
+        for name, p in self.phases.items():
+            share = p.wall / self.wall * 100 if self.wall > 0 else 0.0
+            lines.append(
+                f"{name:<10} {p.wall:>10.4f} {p.cpu:>10.4f} {p.calls:>10} {share:>6.1f}"
+            )
+        lines.append(
+            f"total {self.wall:.4f} s, {self.bars} bars, "
+            f"p50 {self.latency(50) * 1e6:.1f} us, p99 {self.latency(99) * 1e6:.1f} us"
+        )
+        return "\n".join(lines)
+
+
+class _StrategyProbe:
+    """Обгортка стратегії з таймером на on_bar (стан лишається в оригіналі)."""
+
+    def __init__(self, strategy, on_bar):
+        self.strategy = strategy
+        self.on_bar = on_bar
+
+
+class RunProfiler:
+    """
+    Збирач часу фаз для одного або кількох прогонів.
+
+    :param json_path: Куди записати ProfileStats у JSON після run().
+    :param cprofile_path: Куди записати статистику cProfile (pstats) після run().
+    """
+
+    def __init__(
+        self,
+        json_path: str | Path | None = None,
+        cprofile_path: str | Path | None = None,
+    ):
+        self.json_path = json_path
+        self.cprofile_path = cprofile_path
+        self.stats: ProfileStats | None = None
+        self._reset()
+
+    def _reset(self) -> None:
+        self._phases = {name: PhaseStats() for name in PHASES}
+        self._latency = array("d")
+        # стек активних фаз: [wall0, cpu0, час вкладених wall, cpu]
+        self._stack = []
+
+    # -----------------------------
+    # Таймери
+    # -----------------------------
+    def _enter(self) -> None:
+        self._stack.append([time.perf_counter(), time.process_time(), 0.0, 0.0])
+
+    def _exit(self, phase: PhaseStats) -> float:
+        """Закриває фазу; повертає її повний (інклюзивний) wall-час."""
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        wall0, cpu0, child_wall, child_cpu = self._stack.pop()
+        wall -= wall0
+        cpu -= cpu0
+        phase.wall += wall - child_wall
+        phase.cpu += cpu - child_cpu
+        phase.calls += 1
+        if self._stack:
+            parent = self._stack[-1]
+            parent[2] += wall
+            parent[3] += cpu
+        return wall
+
+    def timed(self, name: str, func):
+        """Обгортка func, що рахує час у фазі name."""
+        phase = self._phases[name]
+
+        def wrapper(*args, **kwargs):
+            self._enter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self._exit(phase)
+
+        return wrapper
+
+    def timed_bar(self, func):
+        """Обгортка обробки бару: фаза engine + затримка бару."""
+        phase = self._phases["engine"]
+        latency = self._latency
+
+        def wrapper(*args, **kwargs):
+            self._enter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                latency.append(self._exit(phase))
+
+        return wrapper
+
+    def timed_iter(self, name: str, iterable):
+        """Генератор, що рахує час отримання кожного елемента у фазі name."""
+        iterator = iter(iterable)
+        next_item = self.timed(name, next)
+        while True:
+            try:
+                item = next_item(iterator)
+            except StopIteration:
+                return
+            yield item
+
+    def wrap_strategy(self, strategy):
+        """Стратегія з таймером на on_bar (фаза signal)."""
+        return _StrategyProbe(strategy, self.timed("signal", strategy.on_bar))
+
+    # -----------------------------
+    # Підключення до Backtester
+    # -----------------------------
+    @contextmanager
+    def attach(self, backtester):
+        """
+        На час блоку підміняє методи прогону обгортками з таймерами
+        (атрибути екземплярів; після блоку відновлюються).
+        """
+        self._reset()
+        execution = backtester.execution
+        patches = [
+            (backtester, "load_data", "load"),
+            (backtester, "_process_bar", None),
+            (execution, "submit_order", "execution"),
+            (execution, "close_order", "execution"),
+            (backtester.risk_manager, "validate_order", "risk"),
+        ]
+        if getattr(execution, "logger", None) is not None:
+            patches.append((execution.logger, "log_trade", "logging"))
+
+        saved = []
+        for obj, attr, name in patches:
+            if not hasattr(obj, attr):
+                continue
+            saved.append((obj, attr, vars(obj).get(attr)))
+            method = getattr(obj, attr)
+            setattr(
+                obj,
+                attr,
+                self.timed_bar(method) if name is None else self.timed(name, method),
+            )
+
+        profile = cProfile.Profile() if self.cprofile_path else None
+        wall0, cpu0 = time.perf_counter(), time.process_time()
+        if profile is not None:
+            profile.enable()
+        try:
+            yield self
+        finally:
+            if profile is not None:
+                profile.disable()
+            wall = time.perf_counter() - wall0
+            cpu = time.process_time() - cpu0
+            for obj, attr, original in reversed(saved):
+                if original is None:
+                    delattr(obj, attr)
+                else:
+                    setattr(obj, attr, original)
+            self.stats = ProfileStats(
+                wall=wall,
+                cpu=cpu,
+                bars=len(self._latency),
+                phases=self._phases,
+                bar_latency=np.frombuffer(self._latency, dtype=np.float64).copy(),
+            )
+            if profile is not None:
+                profile.dump_stats(str(self.cprofile_path))
+            if self.json_path:
+                self.stats.dump_json(self.json_path)
@@ -0,0 +1,194 @@
+# core\resampler.py
+
+"""
+Перетворення таймфрейму: бари вищого таймфрейму з базової серії.
+
+- resample(series, timeframe) — векторно для історії: межі кошиків
+  знаходяться одним проходом, OHLCV рахуються через ufunc.reduceat.
+- resample_chunks(chunks, timeframe) — те саме для потокового читання
+  порціями (незавершений кошик переноситься в наступну порцію).
+- Resampler — інкрементально, по одному базовому бару (живий потік):
+  повертає завершений бар вищого таймфрейму, щойно почався наступний.
+
+Кошики вирівняні від epoch (D1 — з 00:00 UTC), тижневі (W1) — від
+понеділка 00:00 UTC (WEEK_ORIGIN). Таймфрейм задається
+секундами, назвою ("M5", "H1", "D1") або у форматі IB ("5 mins", "1 hour").
+"""
+
+from __future__ import annotations
+
+import re
+
+import numpy as np
+
+from core.bar_data import BAR_FIELDS, BarSeries
+
+TIMEFRAMES = {
+    "S1": 1,
+    "M1": 60,
+    "M5": 300,
+    "M15": 900,
+    "M30": 1800,
+    "H1": 3600,
+    "H4": 14_400,
+    "D1": 86_400,
+    "W1": 604_800,
+}
+
+WEEK_SECONDS = 604_800
+# 1970-01-05 — перший понеділок після epoch (1970-01-01 — четвер)
+WEEK_ORIGIN = 4 * 86_400
+
+# одиниці формату IB barSizeSetting ("30 secs", "5 mins", "1 hour", "1 day")
+_IB_UNITS = {"sec": 1, "min": 60, "hour": 3600, "day": 86_400, "week": 604_800}
+_IB_PATTERN = re.compile(r"^\s*(\d+)\s*(sec|min|hour|day|week)s?\s*$", re.IGNORECASE)
+
+
+def timeframe_seconds(timeframe) -> int:
+    """
+    Тривалість таймфрейму в секундах.
+
+    :param timeframe: int (секунди), назва з TIMEFRAMES або рядок IB.
+    """
+    if isinstance(timeframe, (int, np.integer)):
+        seconds = int(timeframe)
+    elif str(timeframe).upper() in TIMEFRAMES:
+        seconds = TIMEFRAMES[str(timeframe).upper()]
+    else:
+        match = _IB_PATTERN.match(str(timeframe))
+        if not match:
+            raise ValueError(f"Unknown timeframe: {timeframe!r}")
+        seconds = int(match.group(1)) * _IB_UNITS[match.group(2).lower()]
+    if seconds <= 0:
+        raise ValueError(f"Timeframe must be positive: {timeframe!r}")
+    return seconds
+
+
+def bucket_origin(seconds: int) -> int:
+    """Початок відліку кошиків: понеділок для тижневих, інакше epoch."""
+    return WEEK_ORIGIN if seconds % WEEK_SECONDS == 0 else 0
+
+
+def resample(series: BarSeries, timeframe) -> BarSeries:
+    """
+    Будує бари вищого таймфрейму з відсортованої за часом серії.
+
+    open — перший бар кошика, close — останній, high/low — екстремуми,
+    volume — сума. Час бару — початок кошика.
+    """
+    seconds = timeframe_seconds(timeframe)
+    if len(series) == 0:
+        return BarSeries([], [], [], [], [], [])
+
+    origin = bucket_origin(seconds)
+    bucket = (series.time - origin) // seconds
+    starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+    ends = np.r_[starts[1:], len(series)] - 1
+    return BarSeries(
+        time=bucket[starts] * seconds + origin,
+        open_=series.open[starts],
+        high=np.maximum.reduceat(series.high, starts),
+        low=np.minimum.reduceat(series.low, starts),
+        close=series.close[ends],
+        volume=np.add.reduceat(series.volume, starts),
+    )
+
+
+def _concat(first: BarSeries, second: BarSeries) -> BarSeries:
+    """Склеює дві серії (копія колонок)."""
+    return BarSeries(
+        *(np.concatenate([getattr(first, f), getattr(second, f)]) for f in BAR_FIELDS)
+    )
+
+
+def resample_chunks(chunks, timeframe):
+    """
+    Генерує порції вищого таймфрейму з потоку порцій базової серії.
+
+    Останній (можливо незавершений) кошик кожної порції переноситься
+    в наступну, тому результат збігається з resample() на всьому ряді.
+    """
+    seconds = timeframe_seconds(timeframe)
+    origin = bucket_origin(seconds)
+    tail = None
+    for chunk in chunks:
+        if tail is not None and len(tail):
+            chunk = _concat(tail, chunk)
+        if len(chunk) == 0:
+            continue
+        bucket = (chunk.time - origin) // seconds
+        cut = int(np.searchsorted(bucket, bucket[-1]))
+        if cut:
+            yield resample(chunk.window(0, cut), seconds)
+        tail = chunk.window(cut)
+    if tail is not None and len(tail):
+        yield resample(tail, seconds)
+
+
+def _bar_seconds(value) -> int:
+    """Час бару в секундах epoch (з int або рядка ISO, як у Bar['time'])."""
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    return int(np.datetime64(value, "s").astype(np.int64))
+
+
+class Resampler:
+    """
+    Інкрементальне перетворення таймфрейму для живого потоку барів.
+
+    update(bar) приймає базовий бар (Bar або словник з 'time', 'open',
+    'high', 'low', 'close'[, 'volume']) і повертає завершений бар вищого
+    таймфрейму (словник, як Bar.to_dict()) або None.
+    """
+
+    def __init__(self, timeframe):
+        self.seconds = timeframe_seconds(timeframe)
+        self.origin = bucket_origin(self.seconds)
+        self._bucket = None
+        self._bar = None
+
+    @property
+    def current(self) -> dict | None:
+        """Незавершений бар поточного кошика (копія) або None."""
+        return None if self._bar is None else self._finish(dict(self._bar))
+
+    def reset(self) -> None:
+        self._bucket = None
+        self._bar = None
+
+    def update(self, bar) -> dict | None:
+        bucket = (_bar_seconds(bar["time"]) - self.origin) // self.seconds
+        volume = bar.get("volume", 0.0) or 0.0
+        completed = None
+        if self._bar is not None and bucket != self._bucket:
+            completed = self._finish(self._bar)
+            self._bar = None
+
+        if self._bar is None:
+            self._bucket = bucket
+            self._bar = {
+                "time": bucket * self.seconds + self.origin,
+                "open": bar["open"],
+                "high": bar["high"],
+                "low": bar["low"],
+                "close": bar["close"],
+                "volume": volume,
+            }
+        else:
+            current = self._bar
+            current["high"] = max(current["high"], bar["high"])
+            current["low"] = min(current["low"], bar["low"])
+            current["close"] = bar["close"]
+            current["volume"] += volume
+        return completed
+
+    def flush(self) -> dict | None:
+        """Повертає останній незавершений бар (кінець потоку) і скидає стан."""
+        bar = None if self._bar is None else self._finish(self._bar)
+        self.reset()
+        return bar
+
+    @staticmethod
+    def _finish(bar: dict) -> dict:
+        bar["time"] = str(np.datetime64(int(bar["time"]), "s"))
+        return bar
@@ -0,0 +1,280 @@
+# core\result_cache.py
+
+"""
+Постійний кеш результатів бек-тестів (SQLite).
+
+Ключ результату — SHA-256 від канонічного JSON з:
+- хешем вмісту даних (файл CSV або колонки BarSeries);
+- класом стратегії, її параметрами (аргументи __init__) і хешем повного
+  стану (pickle, з приватним станом на кшталт ковзних вікон SMA);
+- налаштуваннями і станом RiskManager;
+- налаштуваннями рушія (клас бек-тестера, close_after_bars тощо)
+  і ENGINE_VERSION.
+
+Значення — журнал угод, метрики і кінцевий стан RiskManager
+(JSON, стиснений zlib). Розмір сховища обмежено кількістю записів
+і байтами; при перевищенні видаляються записи, які найдовше
+не читалися (LRU).
+"""
+
+from __future__ import annotations
+
+import datetime
+import hashlib
+import inspect
+import json
+import pickle
+import sqlite3
+import time
+import zlib
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+
+from core.app_paths import BASE_DIR
+from core.bar_cache import cached_content_hash
+from core.bar_data import BAR_FIELDS, BarSeries
+from core.risk_manager import RiskManager
+
+# Збільшувати при зміні логіки симуляції (старі записи стають недосяжними)
+ENGINE_VERSION = 3
+
+DEFAULT_CACHE_PATH = BASE_DIR / "cache" / "backtest_results.sqlite"
+MAX_ENTRIES = 10_000
+MAX_BYTES = 256 * 1024 * 1024
+
+
+# -----------------------------
+# Складові ключа
+# -----------------------------
+def data_hash(source) -> str:
+    """
+    Хеш вмісту даних.
+
+    Для CSV використовується хеш з ключа бінарного кешу (core.bar_cache),
+    якщо розмір і mtime файлу не змінилися, інакше файл хешується заново.
+    Для BarSeries хешуються байти колонок.
+    """
+    if isinstance(source, BarSeries):
+        digest = hashlib.blake2b(digest_size=16)
+        for name in BAR_FIELDS:
+            digest.update(memoryview(np.ascontiguousarray(getattr(source, name))))
+        return "bars:" + digest.hexdigest()
+
+    return "file:" + cached_content_hash(source)
+
+
+def _is_plain(value) -> bool:
+    """Значення, яке можна однозначно записати в JSON ключа."""
+    if value is None or isinstance(value, (bool, int, float, str, np.generic)):
+        return True
+    if isinstance(value, (list, tuple)):
+        return all(_is_plain(v) for v in value)
+    return False
+
+
+def strategy_fingerprint(strategy) -> dict | None:
+    """
+    Клас стратегії, її параметри (аргументи __init__), публічний стан
+    і хеш усього стану (pickle, через __getstate__): стратегія, що вже
+    бачила бари (ковзні вікна, лічильники), не отримає результат холодного
+    прогону. None — стан не серіалізується, результат не кешується.
+    """
+    try:
+        state = pickle.dumps(strategy, protocol=pickle.HIGHEST_PROTOCOL)
+    except (pickle.PicklingError, TypeError, AttributeError):
+        return None
+    cls = type(strategy)
+    params = {}
+    for name in inspect.signature(cls.__init__).parameters:
+        if name != "self" and hasattr(strategy, name):
+            params[name] = getattr(strategy, name)
+    for name, value in getattr(strategy, "__dict__", {}).items():
+        if not name.startswith("_") and _is_plain(value):
+            params[name] = value
+    return {
+        "class": f"{cls.__module__}.{cls.__qualname__}",
+        "params": params,
+        "state": hashlib.blake2b(state, digest_size=16).hexdigest(),
+    }
+
+
+def risk_fingerprint(risk_manager: RiskManager) -> dict:
+    """Налаштування і поточний стан RiskManager, що впливають на результат."""
+    return {
+        "start_balance": risk_manager.start_balance,
+        "risk_per_trade": risk_manager.risk_per_trade,
+        "max_drawdown": risk_manager.max_drawdown,
+        "max_trades_per_day": risk_manager.max_trades_per_day,
+        **risk_state(risk_manager),
+    }
+
+
+def result_key(data: str, strategy: dict, risk: dict, engine: dict) -> str:
+    """SHA-256 канонічного JSON зі складових ключа."""
+    payload = {
+        "engine_version": ENGINE_VERSION,
+        "data": data,
+        "strategy": strategy,
+        "risk": risk,
+        "engine": engine,
+    }
+    text = json.dumps(payload, sort_keys=True, default=_json_default)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _json_default(value):
+    """Перетворення NumPy-скалярів, дат і ордерів (Order) для JSON."""
+    if isinstance(value, Mapping):
+        return dict(value)
+    if isinstance(value, np.generic):
+        return value.item()
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    raise TypeError(f"Not JSON serializable: {type(value).__name__}")
+
+
+# -----------------------------
+# Сховище
+# -----------------------------
+@dataclass
+class CachedResult:
+    """Збережений результат бек-тесту."""
+
+    trades: list[dict]
+    metrics: dict = field(default_factory=dict)
+    state: dict = field(default_factory=dict)
+
+
+class ResultCache:
+    """
+    SQLite-сховище результатів з обмеженням розміру (LRU).
+
+    :param path: Файл бази (типово cache/backtest_results.sqlite у корені).
+    :param max_entries: Максимальна кількість записів.
+    :param max_bytes: Максимальний сумарний розмір значень у байтах.
+    """
+
+    def __init__(
+        self,
+        path: str | Path | None = None,
+        max_entries: int = MAX_ENTRIES,
+        max_bytes: int = MAX_BYTES,
+    ):
+        self.path = Path(path) if path else DEFAULT_CACHE_PATH
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, timeout=30)
+        with self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                " key TEXT PRIMARY KEY,"
+                " value BLOB NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " accessed REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed)"
+            )
+
+    def get(self, key: str) -> CachedResult | None:
+        """Повертає результат за ключем (і позначає його як щойно використаний)."""
+        row = self._conn.execute(
+            "SELECT value FROM results WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        with self._conn:
+            self._conn.execute(
+                "UPDATE results SET accessed = ? WHERE key = ?", (time.time(), key)
+            )
+        return CachedResult(**json.loads(zlib.decompress(row[0])))
+
+    def put(
+        self,
+        key: str,
+        trades: list[dict],
+        metrics: dict | None = None,
+        state: dict | None = None,
+    ) -> None:
+        """Зберігає результат і за потреби витісняє найстаріші записи."""
+        value = {"trades": trades, "metrics": metrics or {}, "state": state or {}}
+        blob = zlib.compress(json.dumps(value, default=_json_default).encode("utf-8"))
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results (key, value, size, accessed)"
+                " VALUES (?, ?, ?, ?)",
+                (key, blob, len(blob), time.time()),
+            )
+            self._evict()
+
+    def _evict(self) -> None:
+        """Видаляє записи з найстарішим доступом понад ліміти."""
+        count, total = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results"
+        ).fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+        rows = self._conn.execute(
+            "SELECT key, size FROM results ORDER BY accessed"
+        ).fetchall()
+        doomed = []
+        for key, size in rows[:-1]:  # найсвіжіший запис лишається завжди
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            doomed.append((key,))
+            count -= 1
+            total -= size
+        self._conn.executemany("DELETE FROM results WHERE key = ?", doomed)
+
+    def __contains__(self, key: str) -> bool:
+        row = self._conn.execute("SELECT 1 FROM results WHERE key = ?", (key,))
+        return row.fetchone() is not None
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    @property
+    def total_bytes(self) -> int:
+        """Сумарний розмір збережених значень."""
+        row = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM results")
+        return row.fetchone()[0]
+
+    def clear(self) -> None:
+        with self._conn:
+            self._conn.execute("DELETE FROM results")
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> "ResultCache":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def risk_state(risk_manager: RiskManager) -> dict:
+    """Кінцевий стан RiskManager для збереження разом з результатом."""
+    last_date = risk_manager.last_trade_date
+    return {
+        "balance": risk_manager.balance,
+        "trades_today": risk_manager.trades_today,
+        "last_trade_date": last_date.isoformat() if last_date else None,
+    }
+
+
+def apply_risk_state(risk_manager: RiskManager, state: dict) -> None:
+    """Відновлює кінцевий стан RiskManager зі збереженого результату."""
+    if not state:
+        return
+    risk_manager.balance = state["balance"]
+    risk_manager.trades_today = state["trades_today"]
+    last_date = state["last_trade_date"]
+    risk_manager.last_trade_date = (
+        datetime.date.fromisoformat(last_date) if last_date else None
+    )
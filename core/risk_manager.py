@@ -25,9 +25,12 @@ class RiskManager:
         self.last_trade_date = None
 
     # --- допоміжне ---
-    def _reset_daily_counter(self) -> None:
-        """Скидає лічильник угод, якщо настав новий день."""
-        today = datetime.date.today()
+    def _reset_daily_counter(self, today: datetime.date | None = None) -> None:
+        """
+        Скидає лічильник угод, якщо настав новий день.
+        today — дата угоди (у бек-тесті — дата бару); типово поточна дата.
+        """
+        today = today or datetime.date.today()
         if self.last_trade_date != today:
             self.trades_today = 0
             self.last_trade_date = today
@@ -55,16 +58,20 @@ class RiskManager:
         return round(size, 6)
 
     # --- перевірка ордера ---
-    def validate_order(self, stop_loss_distance: float, price: float) -> tuple:
+    def validate_order(
+        self,
+        stop_loss_distance: float,
+        price: float,
+        today: datetime.date | None = None,
+    ) -> tuple:
         """
         Перевіряє, чи можна відкрити угоду.
+        today — дата угоди для денного ліміту (типово поточна дата).
         Повертає (True/False, size або повідомлення).
         """
-        """Перевірка чи дозволено відкрити нову угоду."""
-        if self.trades_today >= self.max_trades_per_day:
-            return False, "Max trades per day reached"
-
-        self._reset_daily_counter()
+        # Спершу скидаємо лічильник, інакше після досягнення ліміту
+        # угоди блокувалися б і в наступні дні
+        self._reset_daily_counter(today)
 
         if not self.check_drawdown():
             return False, "❌ Max drawdown exceeded"
@@ -0,0 +1,115 @@
+# core\signal_batch.py
+
+"""
+Пакетне обчислення сигналів SMAStrategy по осі параметрів.
+
+Замість окремого прогону на кожну пару (sma_fast, sma_slow):
+- sma_matrix — усі потрібні вікна SMA однією матрицею (вікно × бар):
+  кожен рядок рахується core.indicators.sma (або береться з кешу), тож
+  побітово збігається з нею;
+- sma_cross_matrix — матриця сигналів (пара × бар) для всіх пар одним
+  векторним проходом, рядок за рядком така сама, як sma_cross_signals.
+
+Рядки матриці сигналів передаються у VectorizedBacktester.run(signals=...)
+(див. evaluate_batch у core.param_sweep), тож перебір тисяч пар зводиться
+до кількох матричних операцій і циклу RiskManager лише по сигналах.
+Проміжні матриці рахуються блоками пар у межах max_bytes.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+from core.indicator_cache import IndicatorCache
+from core.indicators import sma
+
+LONG = 1
+SHORT = -1
+# бюджет пам'яті проміжних матриць одного блоку пар
+MAX_BLOCK_BYTES = 64 * 1024 * 1024
+
+
+def sma_matrix(
+    closes, windows, cache: IndicatorCache | None = None
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    SMA для кількох вікон однією матрицею.
+
+    :param closes: Ціни закриття (1-D).
+    :param windows: Періоди SMA (повтори відкидаються).
+    :param cache: Кеш індикаторів: наявні ряди беруться з нього,
+        пораховані — записуються.
+    :return: (відсортовані унікальні вікна, матриця вікно × бар).
+    """
+    closes = np.asarray(closes, dtype=np.float64)
+    windows = np.unique(np.asarray(windows, dtype=np.int64))
+    if len(windows) and windows[0] < 1:
+        raise ValueError("SMA windows must be positive")
+    size = len(closes)
+    matrix = np.empty((len(windows), size), dtype=np.float64)
+
+    missing = list(range(len(windows)))
+    if cache is not None:
+        dataset = cache.dataset_id(closes)
+        missing = []
+        for row, window in enumerate(windows.tolist()):
+            cached = cache.get(("sma", (window,), dataset))
+            if cached is None:
+                missing.append(row)
+            else:
+                matrix[row] = cached
+
+    for row in missing:
+        window = int(windows[row])
+        matrix[row] = sma(closes, window)
+        if cache is not None:
+            cache.put(("sma", (window,), dataset), matrix[row].copy())
+    return windows, matrix
+
+
+def sma_cross_matrix(
+    closes,
+    pairs,
+    cache: IndicatorCache | None = None,
+    max_bytes: int = MAX_BLOCK_BYTES,
+) -> np.ndarray:
+    """
+    Сигнали перетину SMA для всіх пар: 1 (long), -1 (short), 0.
+
+    :param closes: Ціни закриття (1-D).
+    :param pairs: Послідовність (sma_fast, sma_slow).
+    :param cache: Кеш індикаторів для рядів SMA.
+    :param max_bytes: Бюджет проміжних матриць; пари обробляються блоками.
+    :return: Матриця int8 (пара × бар); рядок k дорівнює
+        sma_cross_signals(closes, *pairs[k]).
+    """
+    closes = np.asarray(closes, dtype=np.float64)
+    pairs = np.asarray(pairs, dtype=np.int64).reshape(-1, 2)
+    size = len(closes)
+    signals = np.zeros((len(pairs), size), dtype=np.int8)
+    if size < 2 or not len(pairs):
+        return signals
+
+    bar = np.arange(size)
+    # на пару: рядки SMA (до двох) і різниця fast - slow
+    block = max(1, int(max_bytes) // (size * 8 * 3))
+    for start in range(0, len(pairs), block):
+        chunk = pairs[start : start + block]  # noqa
+        windows, matrix = sma_matrix(closes, chunk.ravel(), cache)
+        fast = matrix[np.searchsorted(windows, chunk[:, 0])]
+        # fast - slow має той самий знак, що й порівняння fast із slow
+        diff = np.subtract(
+            fast, matrix[np.searchsorted(windows, chunk[:, 1])], out=fast
+        )
+        del matrix
+        prev, cur = diff[:, :-1], diff[:, 1:]
+        long_mask = (prev <= 0) & (cur > 0)
+        short_mask = ~long_mask & (prev >= 0) & (cur < 0)
+
+        out = signals[start : start + block, 1:]  # noqa
+        out[long_mask] = LONG
+        out[short_mask] = SHORT
+        # як у SMAStrategy: перше повне значення повільної SMA лише
+        # запам'ятовується, сигнали можливі з бару sma_slow
+        signals[start : start + block][bar < chunk[:, 1:2]] = 0  # noqa
+    return signals
@@ -0,0 +1,305 @@
+# core\synthetic_data.py
+
+"""
+Генератор синтетичних ринкових даних для тестів і бенчмарків.
+
+Усе векторно (NumPy), без циклів по барах або тіках; 10M барів
+генеруються за секунди.
+
+Модель ціни — геометричний броунівський рух (GBM) з:
+- перемиканням режимів волатильності (ланцюг Маркова: на кожному барі
+  з імовірністю regime_switch вибирається новий режим із regime_scale);
+- вихідними: субота і неділя пропускаються, торговий час неперервний
+  з понеділка 00:00 до п'ятниці 24:00 UTC;
+- гепами: після перерви (вихідні) ціна відкриття зсувається на дифузію
+  за час перерви, а з імовірністю gap_prob — на випадковий стрибок.
+
+Формати запису — ті, що читають Backtester і TickReplay:
+- write_bars_csv — CSV time,open,high,low,close,volume (+ бінарний кеш
+  core.bar_cache, щоб перше завантаження не розбирало текст);
+- write_ticks — .npy зі структурним масивом або CSV time,price,volume.
+
+Приклад:
+    python -m core.synthetic_data --bars 1M --timeframe M5 --symbols EURUSD
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+from core.bar_cache import save_cache
+from core.bar_data import BarSeries
+from core.resampler import WEEK_ORIGIN, WEEK_SECONDS, timeframe_seconds
+
+SECONDS_PER_YEAR = 365.25 * 86_400
+DAY = 86_400
+TRADING_WEEK = 5 * DAY
+# рядків CSV, що форматуються за один запис у файл
+WRITE_BLOCK = 250_000
+# суфікси кількостей у командному рядку ("100k", "1M")
+_COUNT_SUFFIXES = {"k": 1_000, "m": 1_000_000}
+
+TICK_DTYPE = np.dtype([("time", "datetime64[ms]"), ("price", "f8"), ("volume", "f8")])
+
+
+def _epoch_seconds(start) -> int:
+    """Початок ряду в секундах epoch (рядок ISO, datetime64 або int)."""
+    if isinstance(start, (int, np.integer)):
+        return int(start)
+    return int(np.datetime64(start, "s").astype(np.int64))
+
+
+def trading_to_calendar(trading: np.ndarray, start: int, weekends: bool = True):
+    """
+    Переводить торговий час (секунди від start без вихідних) у календарний.
+
+    Кожні 5 торгових днів додається 2 дні вихідних; якщо start припадає
+    на вихідні, ряд починається з найближчого понеділка.
+    """
+    trading = np.asarray(trading, dtype=np.int64)
+    if not weekends:
+        return start + trading
+    # торгові тижні рахуються від понеділка, як тижневі бари resampler
+    monday = start - (start - WEEK_ORIGIN) % WEEK_SECONDS
+    trading = trading + min(start - monday, TRADING_WEEK)
+    weeks, within = np.divmod(trading, TRADING_WEEK)
+    return monday + weeks * WEEK_SECONDS + within
+
+
+def _regime_scale(rng, size: int, scales, switch: float) -> np.ndarray:
+    """Множник волатильності на кожному кроці (ланцюг Маркова режимів)."""
+    scales = np.asarray(scales, dtype=np.float64)
+    if len(scales) == 1 or switch <= 0:
+        return np.full(size, scales[0])
+    changes = np.cumsum(rng.random(size) < switch)
+    choices = rng.integers(0, len(scales), changes[-1] + 1)
+    choices[0] = 0  # ряд починається зі спокійного режиму
+    return scales[choices[changes]]
+
+
+def _gbm_log_returns(rng, elapsed, volatility, drift, scale) -> np.ndarray:
+    """Лог-доходності GBM за проміжки elapsed (секунди)."""
+    dt = np.asarray(elapsed, dtype=np.float64) / SECONDS_PER_YEAR
+    sigma = volatility * scale
+    noise = rng.standard_normal(len(dt))
+    return (drift - 0.5 * sigma**2) * dt + sigma * np.sqrt(dt) * noise
+
+
+def generate_bars(
+    size: int,
+    timeframe="M1",
+    start="2024-01-01",
+    price: float = 1.1,
+    volatility: float = 0.1,
+    drift: float = 0.0,
+    regime_scale=(1.0, 2.5),
+    regime_switch: float = 1e-3,
+    weekends: bool = True,
+    gap_prob: float = 1e-4,
+    gap_size: float = 0.005,
+    volume: float = 1_000.0,
+    digits: int = 5,
+    seed=None,
+) -> BarSeries:
+    """
+    Генерує OHLCV-бари.
+
+    :param size: Кількість барів.
+    :param timeframe: Таймфрейм (як у core.resampler: "M5", "1 hour", секунди).
+    :param start: Час першого бару (ISO-рядок, datetime64 або секунди epoch).
+    :param price: Початкова ціна.
+    :param volatility: Річна волатильність GBM (спокійний режим).
+    :param drift: Річний дрейф GBM.
+    :param regime_scale: Множники волатильності режимів.
+    :param regime_switch: Імовірність зміни режиму на барі.
+    :param weekends: True — пропускати суботу і неділю.
+    :param gap_prob: Імовірність стрибка ціни відкриття на барі.
+    :param gap_size: Стандартне відхилення стрибка (частка ціни).
+    :param volume: Середній обсяг бару в спокійному режимі.
+    :param digits: Знаків після коми для цін (CSV читається без втрат).
+    :param seed: Seed або np.random.Generator.
+    """
+    rng = np.random.default_rng(seed)
+    seconds = timeframe_seconds(timeframe)
+    times = trading_to_calendar(
+        np.arange(size, dtype=np.int64) * seconds, _epoch_seconds(start), weekends
+    )
+    scale = _regime_scale(rng, size, regime_scale, regime_switch)
+
+    # перерва перед баром (вихідні) — дифузія за весь пропущений час
+    pause = np.diff(times, prepend=times[:1]) - seconds
+    pause[0] = 0
+    gap = np.zeros(size)
+    paused = np.flatnonzero(pause > 0)
+    gap[paused] = _gbm_log_returns(rng, pause[paused], volatility, drift, scale[paused])
+    jumps = np.flatnonzero(rng.random(size) < gap_prob)
+    gap[jumps] += rng.normal(0.0, gap_size, len(jumps))
+
+    body = _gbm_log_returns(rng, np.full(size, seconds), volatility, drift, scale)
+    log_close = np.log(price) + np.cumsum(gap + body)
+    close = np.exp(log_close)
+    open_ = np.exp(log_close - body)
+
+    # тіні: півнормальні відхилення масштабу волатильності бару
+    bar_sigma = volatility * scale * np.sqrt(seconds / SECONDS_PER_YEAR)
+    wick = np.abs(rng.standard_normal((2, size))) * bar_sigma * 0.5
+    high = np.maximum(open_, close) * (1 + wick[0])
+    low = np.minimum(open_, close) * (1 - wick[1])
+    volumes = np.round(volume * scale * rng.lognormal(0.0, 0.5, size))
+
+    open_, high, low, close = (np.round(x, digits) for x in (open_, high, low, close))
+    # після округлення high/low мають охоплювати open/close
+    high = np.maximum(high, np.maximum(open_, close))
+    low = np.minimum(low, np.minimum(open_, close))
+    return BarSeries(times, open_, high, low, close, volumes)
+
+
+def generate_universe(symbols, size: int, prices: dict | None = None, seed=None, **kw):
+    """
+    Незалежні ряди для кількох символів (окремі потоки випадкових чисел
+    з одного seed через SeedSequence.spawn).
+
+    :return: Словник symbol -> BarSeries.
+    """
+    prices = prices or {}
+    default_price = kw.pop("price", 1.1)
+    streams = np.random.SeedSequence(seed).spawn(len(symbols))
+    return {
+        symbol: generate_bars(
+            size, price=prices.get(symbol, default_price), seed=stream, **kw
+        )
+        for symbol, stream in zip(symbols, streams)
+    }
+
+
+def generate_ticks(
+    size: int,
+    start="2024-01-01",
+    price: float = 1.1,
+    volatility: float = 0.1,
+    mean_interval_ms: float = 250.0,
+    regime_scale=(1.0, 2.5),
+    regime_switch: float = 1e-4,
+    weekends: bool = True,
+    digits: int = 5,
+    seed=None,
+) -> np.ndarray:
+    """
+    Генерує тіки: пуассонівський потік (експоненційні інтервали),
+    ціна — GBM за інтервал, обсяг — ціле від 1.
+
+    :return: Структурний масив TICK_DTYPE (time у мс, price, volume).
+    """
+    rng = np.random.default_rng(seed)
+    intervals = np.maximum(np.round(rng.exponential(mean_interval_ms, size)), 1)
+    intervals[0] = 0
+    trading_ms = np.cumsum(intervals.astype(np.int64))
+    start_ms = _epoch_seconds(start) * 1000
+    trading_s, ms = np.divmod(trading_ms, 1000)
+    times = trading_to_calendar(trading_s, start_ms // 1000, weekends) * 1000 + ms
+
+    scale = _regime_scale(rng, size, regime_scale, regime_switch)
+    elapsed = np.diff(times, prepend=times[:1]) / 1000.0
+    log_price = np.log(price) + np.cumsum(
+        _gbm_log_returns(rng, elapsed, volatility, 0.0, scale)
+    )
+
+    ticks = np.empty(size, dtype=TICK_DTYPE)
+    ticks["time"] = times.astype("datetime64[ms]")
+    ticks["price"] = np.round(np.exp(log_price), digits)
+    ticks["volume"] = 1 + rng.poisson(scale * 2)
+    return ticks
+
+
+# -----------------------------
+# Запис у формати Backtester / TickReplay
+# -----------------------------
+def _write_rows(path: Path, header: str, columns: list) -> None:
+    """Пише CSV блоками: час — ISO-рядок, числа — repr (без втрати точності)."""
+    size = len(columns[0])
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write(header + "\n")
+        for begin in range(0, size, WRITE_BLOCK):
+            block = [column[begin : begin + WRITE_BLOCK] for column in columns]
+            times = np.datetime_as_string(block[0]).tolist()
+            rows = zip(times, *(column.tolist() for column in block[1:]))
+            f.write("\n".join(",".join(map(str, row)) for row in rows))
+            f.write("\n")
+
+
+def write_bars_csv(series: BarSeries, path, cache: bool = True) -> Path:
+    """
+    Записує бари у CSV, який читає Backtester (time,open,high,low,close,volume).
+
+    :param cache: True — одразу записати бінарний кеш (core.bar_cache),
+        щоб Backtester відкривав ряд через mmap без розбору CSV.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    columns = [series.time.astype("datetime64[s]")]
+    columns += [series.open, series.high, series.low, series.close, series.volume]
+    _write_rows(path, "time,open,high,low,close,volume", columns)
+    if cache:
+        save_cache(series, path)
+    return path
+
+
+def write_ticks(ticks: np.ndarray, path) -> Path:
+    """
+    Записує тіки для TickReplay: .npy (mmap без розбору) або CSV
+    time,price,volume — за розширенням path.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.suffix == ".npy":
+        np.save(path, ticks)
+    else:
+        _write_rows(
+            path, "time,price,volume", [ticks["time"], ticks["price"], ticks["volume"]]
+        )
+    return path
+
+
+def parse_count(text: str) -> int:
+    """Кількість барів/тіків: '10000', '100k', '1M' (також для dev_tools)."""
+    text = text.strip().lower().replace("_", "")
+    if text and text[-1] in _COUNT_SUFFIXES:
+        return int(float(text[:-1]) * _COUNT_SUFFIXES[text[-1]])
+    return int(text)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Синтетичні бари або тіки")
+    parser.add_argument("--bars", type=parse_count, help="кількість барів")
+    parser.add_argument("--ticks", type=parse_count, help="кількість тіків")
+    parser.add_argument("--timeframe", default="M1")
+    parser.add_argument("--symbols", default="SYNTH", help="символи через кому")
+    parser.add_argument("--start", default="2024-01-01")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", type=Path, default=Path("data") / "synthetic")
+    parser.add_argument(
+        "--tick-format", choices=("npy", "csv"), default="npy", help="формат тіків"
+    )
+    args = parser.parse_args(argv)
+    if not args.bars and not args.ticks:
+        parser.error("задайте --bars або --ticks")
+
+    symbols = [s.strip() for s in args.symbols.split(",") if s.strip()]
+    streams = np.random.SeedSequence(args.seed).spawn(len(symbols))
+    for symbol, stream in zip(symbols, streams):
+        bars_rng, ticks_rng = (np.random.default_rng(s) for s in stream.spawn(2))
+        if args.bars:
+            series = generate_bars(args.bars, args.timeframe, args.start, seed=bars_rng)
+            path = write_bars_csv(series, args.out / f"{symbol}_{args.timeframe}.csv")
+            print(f"{symbol}: {len(series):,} барів -> {path}")
+        if args.ticks:
+            ticks = generate_ticks(args.ticks, args.start, seed=ticks_rng)
+            path = write_ticks(ticks, args.out / f"{symbol}_ticks.{args.tick_format}")
+            print(f"{symbol}: {len(ticks):,} тіків -> {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,469 @@
+# core\tick_replay.py
+
+"""
+Подієвий бек-тест на тіках.
+
+TickReplay:
+- Читає тіки (time, price, volume) з диска порціями, тому пам'ять
+  обмежена розміром порції, а не довжиною файлу (десятки мільйонів тіків).
+- Тримає єдину чергу подій (heapq), упорядковану за часом:
+  таймери, ордери і курсори тікових потоків (по одному на символ).
+- Передає кожен тік стратегії символу (on_tick); сигнал стає подією
+  ордера, яка виконується через ExecutionEngine у режимі 'simulator'.
+- Закриває позиції при торканні SL/TP тіковою ціною і за часом утримання.
+
+Час подій — ціле число мілісекунд epoch.
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+from functools import partial
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+
+from core.bar_data import bar_date
+from core.execution import ExecutionEngine
+from core.intrabar_exits import EXIT_END, EXIT_STOP_LOSS, EXIT_TAKE_PROFIT, EXIT_TIME
+from core.risk_manager import RiskManager
+
+TICK_FIELDS = ("time", "price", "volume")
+TICK_CHUNK = 1_000_000
+
+# Пріоритет подій з однаковим часом: таймери, потім ордери, потім тіки
+EVENT_TIMER = 0
+EVENT_ORDER = 1
+EVENT_TICK = 2
+# застарілі записи _ExitBook, до яких купи не перебудовуються
+_MIN_STALE = 64
+
+
+class Tick(NamedTuple):
+    """Один тік символу."""
+
+    symbol: str
+    time: int
+    price: float
+    volume: float
+
+
+def _tick_dtype(fields: int) -> np.dtype:
+    """Структурний dtype рядка тікового CSV (2 або 3 колонки)."""
+    columns = [("time", "datetime64[ms]"), ("price", "f8"), ("volume", "f8")]
+    return np.dtype(columns[:fields])
+
+
+def _chunk_arrays(records) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Колонки порції: час у мс (int64), ціна, обсяг (нулі, якщо немає)."""
+    times = records["time"]
+    if times.dtype.kind == "M":
+        times = times.astype("datetime64[ms]")
+    times = times.astype(np.int64)
+    prices = np.ascontiguousarray(records["price"], dtype=np.float64)
+    if "volume" in records.dtype.names:
+        volumes = np.ascontiguousarray(records["volume"], dtype=np.float64)
+    else:
+        volumes = np.zeros(len(prices), dtype=np.float64)
+    return times, prices, volumes
+
+
+def iter_tick_chunks(path: str | Path, chunk_size: int = TICK_CHUNK):
+    """
+    Генерує порції тіків (time_ms, price, volume) з файлу.
+
+    Підтримує:
+    - CSV із заголовком time,price[,volume] — читається по chunk_size рядків;
+    - .npy зі структурним масивом (поля time, price[, volume]) — відкривається
+      через mmap, порції є зрізами без читання всього файлу.
+    """
+    path = Path(path)
+    if path.suffix == ".npy":
+        records = np.load(path, mmap_mode="r")
+        for start in range(0, len(records), chunk_size):
+            yield _chunk_arrays(records[start : start + chunk_size])  # noqa
+        return
+
+    with open(path, newline="") as f:
+        header = f.readline().strip().split(",")
+        dtype = _tick_dtype(min(len(header), len(TICK_FIELDS)))
+        usecols = tuple(range(len(dtype)))
+        while True:
+            lines = list(itertools.islice(f, chunk_size))
+            if not lines:
+                return
+            records = np.loadtxt(
+                lines, delimiter=",", dtype=dtype, usecols=usecols, ndmin=1
+            )
+            yield _chunk_arrays(records)
+
+
+class _TickCursor:
+    """Позиція в тіковому потоці одного символу (поточна порція як списки)."""
+
+    __slots__ = ("symbol", "strategy", "chunks", "times", "prices", "volumes", "pos")
+
+    def __init__(self, symbol: str, strategy, chunks):
+        self.symbol = symbol
+        self.strategy = strategy
+        self.chunks = chunks
+        self.times = self.prices = self.volumes = ()
+        self.pos = 0
+
+    def advance(self) -> bool:
+        """Переходить до наступної непорожньої порції; False — потік вичерпано."""
+        while self.pos >= len(self.times):
+            chunk = next(self.chunks, None)
+            if chunk is None:
+                return False
+            self.times, self.prices, self.volumes = (a.tolist() for a in chunk)
+            self.pos = 0
+        return True
+
+
+class _ExitBook:
+    """
+    Рівні SL/TP відкритих позицій символу у чотирьох купах.
+
+    Вершина кожної купи — рівень, який спрацює першим, тому перевірка
+    тіку займає O(1), а закриття — O(log n). Записи закритих ордерів
+    видаляються з куп ліниво; коли їх стає більше, ніж живих, купи
+    перебудовуються (як OrderBook._compact у core.order_book).
+    """
+
+    __slots__ = ("long_stop", "long_take", "short_stop", "short_take", "_size", "_live")
+
+    def __init__(self):
+        self.long_stop = []  # (-sl, seq, order): спрацьовує при price <= sl
+        self.long_take = []  # (tp, seq, order): price >= tp
+        self.short_stop = []  # (sl, seq, order): price >= sl
+        self.short_take = []  # (-tp, seq, order): price <= tp
+        self._size = 0  # записів у купах
+        self._live = 0  # записів відкритих ордерів (закритий — через discard)
+
+    def add(self, order: dict, seq: int) -> None:
+        stop_loss, take_profit = order["stop_loss"], order["take_profit"]
+        if order["side"] == "long":
+            heapq.heappush(self.long_stop, (-stop_loss, seq, order))
+            if take_profit is not None:
+                heapq.heappush(self.long_take, (take_profit, seq, order))
+        else:
+            heapq.heappush(self.short_stop, (stop_loss, seq, order))
+            if take_profit is not None:
+                heapq.heappush(self.short_take, (-take_profit, seq, order))
+        entries = _entries(order)
+        self._size += entries
+        self._live += entries
+
+    def discard(self, order: dict) -> None:
+        """Позначає записи закритого ордера застарілими (купи — ліниво)."""
+        self._live -= _entries(order)
+        if self._size - self._live > max(_MIN_STALE, self._live):
+            self._compact()
+
+    def triggered(self, price: float):
+        """Генерує (order, reason) для рівнів, зачеплених ціною price."""
+        # Стопи першими: якщо тік зачепив обидва рівні — спрацьовує SL
+        for book, sign, reason in (
+            (self.long_stop, -1.0, EXIT_STOP_LOSS),
+            (self.short_stop, 1.0, EXIT_STOP_LOSS),
+            (self.long_take, 1.0, EXIT_TAKE_PROFIT),
+            (self.short_take, -1.0, EXIT_TAKE_PROFIT),
+        ):
+            # ключ купи — sign * рівень, спрацювання: sign * price >= ключа
+            while book and sign * price >= book[0][0]:
+                order = heapq.heappop(book)[2]
+                self._size -= 1
+                if order["status"] == "OPEN":
+                    yield order, reason
+
+    def _compact(self) -> None:
+        """Прибирає записи закритих ордерів (на місці: triggered тримає купи)."""
+        for book in (self.long_stop, self.long_take, self.short_stop, self.short_take):
+            book[:] = [entry for entry in book if entry[2]["status"] == "OPEN"]
+            heapq.heapify(book)
+        self._size = self._live = sum(
+            map(len, (self.long_stop, self.long_take, self.short_stop, self.short_take))
+        )
+
+
+def _entries(order: dict) -> int:
+    """Кількість записів ордера в купах _ExitBook (SL і, якщо є, TP)."""
+    return 1 if order["take_profit"] is None else 2
+
+
+class TickReplay:
+    """
+    Подієвий бек-тест на тікових даних.
+
+    :param tick_files: Шлях до файлу тіків (символ 'TEST') або словник
+        symbol -> файл (відносно data/ або абсолютний).
+    :param strategies: Стратегія (для одного символу), словник symbol -> стратегія
+        або фабрика strategy(symbol). Стратегія має on_tick(tick) або on_bar(bar).
+    :param risk_manager: Спільний RiskManager.
+    :param hold_ms: Максимальне утримання позиції в мс (None — без виходу за часом).
+    :param latency_ms: Затримка між сигналом і виконанням ордера.
+    :param bar_ms: Для стратегій з on_bar — тривалість бару, з якого
+        збираються тіки (None — кожен тік передається як бар).
+    :param chunk_size: Кількість тіків у порції читання.
+    """
+
+    def __init__(
+        self,
+        tick_files,
+        strategies,
+        risk_manager: RiskManager,
+        hold_ms: int | None = None,
+        latency_ms: int = 0,
+        bar_ms: int | None = None,
+        chunk_size: int = TICK_CHUNK,
+    ):
+        if not isinstance(tick_files, dict):
+            tick_files = {"TEST": tick_files}
+        base_dir = Path(__file__).parent.resolve()
+        self.tick_files = {
+            symbol: base_dir.parent / "data" / path
+            for symbol, path in tick_files.items()
+        }
+        self.symbols = list(tick_files)
+        if isinstance(strategies, dict):
+            pass
+        elif callable(strategies):
+            strategies = {symbol: strategies(symbol) for symbol in self.symbols}
+        elif len(self.symbols) == 1:
+            strategies = {self.symbols[0]: strategies}
+        else:
+            raise ValueError("Потрібна окрема стратегія для кожного символу")
+        self.strategies = {
+            symbol: as_tick_strategy(strategy, bar_ms)
+            for symbol, strategy in strategies.items()
+        }
+        self.risk_manager = risk_manager
+        self.execution = ExecutionEngine(risk_manager, mode="simulator")
+        self.hold_ms = hold_ms
+        self.latency_ms = latency_ms
+        self.chunk_size = chunk_size
+        self.trades_log = []
+        self.now = 0
+        self._queue = []
+        self._streams = 0
+        self._seq = itertools.count()
+        self._last_price: dict[str, float] = {}
+        self._books = {symbol: _ExitBook() for symbol in self.symbols}
+
+    # -----------------------------
+    # Черга подій
+    # -----------------------------
+    def _push(self, time: int, kind: int, payload) -> None:
+        heapq.heappush(self._queue, (time, kind, next(self._seq), payload))
+
+    def add_timer(self, time: int, callback, interval: int | None = None) -> None:
+        """
+        Планує виклик callback(time) на момент time (мс).
+        interval — період повторення (None — одноразовий таймер).
+        """
+        if interval:
+            callback = partial(self._periodic, callback, interval)
+        self._push(time, EVENT_TIMER, callback)
+
+    def _periodic(self, callback, interval: int, time: int) -> None:
+        # повторюється, поки є тікові потоки
+        if self._streams:
+            callback(time)
+            self._push(
+                time + interval,
+                EVENT_TIMER,
+                partial(self._periodic, callback, interval),
+            )
+
+    # -----------------------------
+    # Прогін
+    # -----------------------------
+    def run(self):
+        """
+        Запуск подієвого бек-тесту.
+
+        Логіка:
+        - Курсор кожного символу стоїть у черзі з часом свого наступного тіку.
+        - Знятий з черги курсор обробляє тіки підряд, доки наступна подія
+          в черзі не настала, і повертається в чергу.
+        - Тік: перевірка SL/TP відкритих позицій символу, потім on_tick
+          стратегії; сигнал ставиться в чергу як ордер на time + latency_ms.
+        - Ордер виконується за останньою ціною символу через ExecutionEngine.
+        - Таймери: вихід за часом утримання і користувацькі add_timer.
+        В кінці закриває відкриті позиції за останньою ціною символу.
+
+        Повертає список угод (з 'open_time', 'close_time', 'exit_reason').
+        """
+        for symbol in self.symbols:
+            chunks = iter_tick_chunks(self.tick_files[symbol], self.chunk_size)
+            cursor = _TickCursor(symbol, self.strategies[symbol], chunks)
+            if cursor.advance():
+                self._streams += 1
+                self._push(cursor.times[0], EVENT_TICK, cursor)
+
+        queue = self._queue
+        while queue:
+            time, kind, _, payload = heapq.heappop(queue)
+            self.now = time
+            if kind == EVENT_TICK:
+                if self._replay(payload):
+                    self._push(payload.times[payload.pos], EVENT_TICK, payload)
+                else:
+                    self._streams -= 1
+            elif kind == EVENT_ORDER:
+                self._fill(*payload)
+            else:
+                payload(time)
+
+        for order in self.trades_log:
+            if order["status"] == "OPEN":
+                self._close(order, self._last_price[order["symbol"]], EXIT_END)
+        return self.trades_log
+
+    def _replay(self, cursor: _TickCursor) -> bool:
+        """
+        Обробляє тіки курсора, доки не настане інша подія черги.
+        Повертає True, якщо в потоці ще є тіки.
+        """
+        queue = self._queue
+        symbol, strategy = cursor.symbol, cursor.strategy
+        book = self._books[symbol]
+        latency = self.latency_ms
+        first = True
+        while cursor.advance():
+            times, prices, volumes = cursor.times, cursor.prices, cursor.volumes
+            pos, size = cursor.pos, len(times)
+            while pos < size:
+                time = times[pos]
+                # перший тік завжди наш: курсор щойно знято з вершини черги
+                if not first and queue and queue[0][0] <= time:
+                    cursor.pos = pos
+                    return True
+                first = False
+                price = prices[pos]
+                pos += 1
+                self.now = time
+                self._last_price[symbol] = price
+
+                for order, reason in book.triggered(price):
+                    self._close(order, price, reason)
+
+                signal = strategy.on_tick(Tick(symbol, time, price, volumes[pos - 1]))
+                if signal:
+                    self._push(time + latency, EVENT_ORDER, (symbol, signal))
+            cursor.pos = pos
+        return False
+
+    # -----------------------------
+    # Ордери
+    # -----------------------------
+    def _fill(self, symbol: str, signal) -> None:
+        """Виконує сигнал за останньою ціною символу."""
+        side, stop_loss, take_profit = signal
+        ok, order = self.execution.submit_order(
+            symbol=symbol,
+            side=side,
+            price=self._last_price[symbol],
+            stop_loss=stop_loss,
+            take_profit=take_profit,
+            trade_date=bar_date(self.now // 1000),
+        )
+        if not ok:
+            return
+        order["open_time"] = self.now
+        self._books[symbol].add(order, len(self.trades_log))
+        if self.hold_ms is not None:
+            self._push(
+                self.now + self.hold_ms, EVENT_TIMER, partial(self._expire, order)
+            )
+        self.trades_log.append(order)
+
+    def _expire(self, order: dict, time: int) -> None:
+        """Вихід за часом утримання."""
+        if order["status"] == "OPEN":
+            self._close(order, self._last_price[order["symbol"]], EXIT_TIME)
+
+    def _close(self, order: dict, exit_price: float, reason: str) -> None:
+        """Закриває ордер і зберігає ціну, час, причину виходу та прибуток."""
+        ok, pnl = self.execution.close_order(order["id"], exit_price=exit_price)
+        if ok:
+            order["exit_price"] = exit_price
+            order["exit_reason"] = reason
+            order["close_time"] = self.now
+            order["profit"] = pnl
+            self._books[order["symbol"]].discard(order)
+
+
+class BarAggregator:
+    """
+    Збирає тіки в часові бари для стратегій з on_bar.
+
+    Бар закривається першим тіком наступного періоду; сигнал стратегії
+    повертається на цьому тіку (виконання — за його ціною).
+    """
+
+    def __init__(self, strategy, bar_ms: int):
+        self.strategy = strategy
+        self.bar_ms = bar_ms
+        self._bar = None
+        self._bar_start = None
+
+    def reset(self) -> None:
+        self._bar = self._bar_start = None
+        if hasattr(self.strategy, "reset"):
+            self.strategy.reset()
+
+    def on_tick(self, tick: Tick):
+        start = tick.time - tick.time % self.bar_ms
+        bar, signal = self._bar, None
+        if bar is not None and start != self._bar_start:
+            signal = self.strategy.on_bar(bar)
+            bar = None
+        if bar is None:
+            self._bar_start = start
+            self._bar = {
+                "time": start,
+                "open": tick.price,
+                "high": tick.price,
+                "low": tick.price,
+                "close": tick.price,
+                "volume": tick.volume,
+            }
+        else:
+            bar["high"] = max(bar["high"], tick.price)
+            bar["low"] = min(bar["low"], tick.price)
+            bar["close"] = tick.price
+            bar["volume"] += tick.volume
+        return signal
+
+
+class TickAsBar:
+    """Передає кожен тік стратегії з on_bar як бар з однією ціною."""
+
+    def __init__(self, strategy):
+        self.strategy = strategy
+
+    def on_tick(self, tick: Tick):
+        price = tick.price
+        return self.strategy.on_bar(
+            {
+                "time": tick.time,
+                "open": price,
+                "high": price,
+                "low": price,
+                "close": price,
+                "volume": tick.volume,
+            }
+        )
+
+
+def as_tick_strategy(strategy, bar_ms: int | None = None):
+    """Повертає стратегію з on_tick (барові стратегії обгортаються)."""
+    if hasattr(strategy, "on_tick"):
+        return strategy
+    if bar_ms:
+        return BarAggregator(strategy, bar_ms)
+    return TickAsBar(strategy)
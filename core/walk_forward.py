@@ -0,0 +1,220 @@
+# core\walk_forward.py
+
+"""
+Walk-forward оптимізація SMAStrategy на базі Backtester.
+
+Схема:
+- Ряд барів ділиться на ковзні вікна: in-sample (оптимізація) і наступне
+  за ним out-of-sample (перевірка).
+- Для кожного вікна перебираються параметри на in-sample зрізі,
+  найкращий набір проганяється на out-of-sample зрізі.
+- Криві балансу out-of-sample склеюються в одну.
+
+Усі вікна працюють з одним завантаженим BarSeries за діапазонами індексів
+(зрізи без копіювання); паралельні вікна отримують ціни через shared_memory.
+"""
+
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from core.backtester_vectorized import VectorizedBacktester
+from core.bar_data import BarSeries
+from core.config_trades import RISK_MANAGER, STRATEGY
+from core.metrics import summarize_trades
+from core.param_sweep import (
+    RISK_KEYS,
+    STRATEGY_KEYS,
+    SharedBars,
+    evaluate_batch,
+    init_shared_worker,
+    shared_worker_data,
+)
+from core.risk_manager import RiskManager
+from strategies.strategy_sma import SMAStrategy
+
+
+@dataclass
+class WindowResult:
+    """Результат одного вікна walk-forward."""
+
+    in_sample: tuple[int, int]
+    out_sample: tuple[int, int]
+    params: dict
+    in_sample_metrics: dict
+    out_sample_metrics: dict
+    # баланс після кожної out-of-sample угоди, відносно стартового (1.0 = старт)
+    equity: np.ndarray = field(repr=False)
+
+
+@dataclass
+class WalkForwardResult:
+    """Підсумок walk-forward: вікна і склеєна out-of-sample крива балансу."""
+
+    windows: list[WindowResult]
+    equity: np.ndarray = field(repr=False)
+    start_balance: float = 0.0
+
+    @property
+    def final_balance(self) -> float:
+        return float(self.equity[-1]) if len(self.equity) else self.start_balance
+
+
+def walk_forward_windows(
+    size: int,
+    in_sample: int,
+    out_sample: int,
+    step: int | None = None,
+    anchored: bool = False,
+) -> list[tuple[int, int, int, int]]:
+    """
+    Будує межі вікон (is_start, is_end, oos_start, oos_end) по індексах барів.
+
+    :param size: Кількість барів у ряді.
+    :param in_sample: Довжина in-sample частини.
+    :param out_sample: Довжина out-of-sample частини.
+    :param step: Зсув між вікнами (типово out_sample — OOS не перекриваються).
+    :param anchored: Якщо True, in-sample завжди починається з 0 (розширюється).
+    """
+    step = step or out_sample
+    windows = []
+    start = 0
+    while start + in_sample < size:
+        is_start = 0 if anchored else start
+        is_end = start + in_sample
+        oos_end = min(is_end + out_sample, size)
+        windows.append((is_start, is_end, is_end, oos_end))
+        start += step
+    return windows
+
+
+def run_window(
+    data: BarSeries,
+    window: tuple[int, int, int, int],
+    param_list: list[dict],
+    base: dict | None = None,
+    close_after_bars: int | None = None,
+    sort_by: str = "net_profit",
+) -> WindowResult:
+    """
+    Оптимізує параметри на in-sample і перевіряє їх на out-of-sample.
+
+    Out-of-sample бек-тест стартує раніше на sma_slow барів (розгін SMA),
+    але сигнали на цих барах ігноруються.
+    """
+    is_start, is_end, oos_start, oos_end = window
+    in_data = data.window(is_start, is_end)
+    scores = evaluate_batch(in_data, param_list, base, close_after_bars)
+    best = max(scores, key=lambda r: r[sort_by])
+    params = {k: best[k] for k in param_list[0]}
+
+    merged = {**STRATEGY, **RISK_MANAGER, **(base or {}), **params}
+    warmup = min(int(merged["sma_slow"]), oos_start)
+    rm = RiskManager(**{k: merged[k] for k in RISK_KEYS})
+    bt = VectorizedBacktester(
+        "", SMAStrategy(**{k: merged[k] for k in STRATEGY_KEYS}), rm, close_after_bars
+    )
+    trades = bt.run(data=data.window(oos_start - warmup, oos_end), warmup=warmup)
+
+    start_balance = merged["balance"]
+    profits = np.array([t["profit"] for t in trades], dtype=np.float64)
+    equity = 1.0 + np.cumsum(profits) / start_balance
+
+    return WindowResult(
+        in_sample=(is_start, is_end),
+        out_sample=(oos_start, oos_end),
+        params=params,
+        in_sample_metrics={k: v for k, v in best.items() if k not in params},
+        out_sample_metrics=summarize_trades(trades, start_balance),
+        equity=equity,
+    )
+
+
+def _window_task(task) -> WindowResult:
+    """Завдання пулу: одне вікно на спільних цінах."""
+    return run_window(shared_worker_data(), *task)
+
+
+class WalkForward:
+    """
+    Walk-forward раннер.
+
+    Атрибути:
+        data (BarSeries): ціни (завантажуються один раз).
+        in_sample, out_sample, step, anchored: геометрія вікон.
+        base (dict): фіксовані параметри стратегії/ризику.
+        max_workers (int): кількість процесів для вікон.
+    """
+
+    def __init__(
+        self,
+        data: BarSeries,
+        in_sample: int,
+        out_sample: int,
+        step: int | None = None,
+        anchored: bool = False,
+        base: dict | None = None,
+        max_workers: int | None = None,
+        close_after_bars: int | None = None,
+    ):
+        self.data = data
+        self.in_sample = in_sample
+        self.out_sample = out_sample
+        self.step = step
+        self.anchored = anchored
+        self.base = base or {}
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.close_after_bars = close_after_bars
+
+    def windows(self) -> list[tuple[int, int, int, int]]:
+        return walk_forward_windows(
+            len(self.data), self.in_sample, self.out_sample, self.step, self.anchored
+        )
+
+    def run(self, param_list: list[dict], sort_by: str = "net_profit"):
+        """
+        Проганяє всі вікна (паралельно) і склеює out-of-sample криві.
+
+        Розмір позиції пропорційний балансу, тому кожне вікно рахується
+        з базового балансу, а при склеюванні крива вікна масштабується
+        на баланс наприкінці попереднього вікна.
+        """
+        tasks = [
+            (w, param_list, self.base, self.close_after_bars, sort_by)
+            for w in self.windows()
+        ]
+        if self.max_workers <= 1 or len(tasks) <= 1:
+            results = [run_window(self.data, *task) for task in tasks]
+        else:
+            with SharedBars(self.data) as shared:
+                with ProcessPoolExecutor(
+                    max_workers=min(self.max_workers, len(tasks)),
+                    initializer=init_shared_worker,
+                    initargs=(shared.spec,),
+                ) as pool:
+                    results = list(pool.map(_window_task, tasks))
+
+        start_balance = float({**RISK_MANAGER, **self.base}["balance"])
+        return WalkForwardResult(
+            windows=results,
+            equity=stitch_equity(results, start_balance),
+            start_balance=start_balance,
+        )
+
+
+def stitch_equity(results: list[WindowResult], start_balance: float) -> np.ndarray:
+    """Склеює відносні криві вікон у криву балансу від start_balance."""
+    parts = []
+    level = start_balance
+    for result in results:
+        if len(result.equity):
+            curve = level * result.equity
+            parts.append(curve)
+            level = float(curve[-1])
+    if not parts:
+        return np.empty(0, dtype=np.float64)
+    return np.concatenate(parts)
@@ -0,0 +1,335 @@
+# benchmark.py
+"""
+Бенчмарк масштабованості торгового ядра (без мережі).
+
+Сценарії на синтетичному ряді (core.synthetic_data) розміром 10k, 100k,
+1M і 10M барів:
+- backtester_run — Backtester.run зі SMAStrategy (бари/с);
+- sma_generate_signal — SMAStrategy.generate_signal на префіксах ряду (бари/с);
+- execution_submit_close — ExecutionEngine.submit_order + close_order (ордери/с);
+- risk_validate_order — RiskManager.validate_order (ордери/с).
+
+Для кожного сценарію записуються час, пропускна здатність, пікова RSS
+процесу і кількість збірок GC. Виділення пам'яті міряються tracemalloc
+в окремому (повторному) прогоні сценарію, щоб трасування не впливало
+на час: пік і залишок трасованої пам'яті. Для рядів понад --alloc-max-size
+цей прогін пропускається (поля None). Кожен замір виконується в окремому
+процесі, тому пікова RSS не накопичується.
+
+Результати пишуться в JSON і порівнюються з базовими (baseline,
+dev_tools/benchmark_baseline.json у репозиторії): падіння пропускної
+здатності більше за допуск — регресія, код виходу 1. Baseline порівнюється
+лише з того самого середовища (CPU, ОС, архітектура, версія Python —
+environment()). Код виходу 2, якщо порівняти нема з чим: немає файлу
+baseline, він з іншого середовища або в ньому немає заміряного сценарію
+чи розміру (порівняння вимикається явно: --no-compare).
+
+Приклади:
+    python dev_tools/benchmark.py --sizes 10k,100k
+    python dev_tools/benchmark.py --save-baseline
+    python dev_tools/benchmark.py --baseline dev_tools/benchmark_baseline.json
+    python dev_tools/benchmark.py --sizes 10M --no-compare
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime
+import gc
+import json
+import multiprocessing
+import platform
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from core.backtester import Backtester  # noqa: E402
+from core.bar_data import BarSeries  # noqa: E402
+from core.execution import ExecutionEngine  # noqa: E402
+from core.risk_manager import RiskManager  # noqa: E402
+from core.synthetic_data import generate_bars, parse_count  # noqa: E402
+from strategies.strategy_sma import SMAStrategy  # noqa: E402
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+SIZES = (10_000, 100_000, 1_000_000, 10_000_000)
+DEFAULT_OUTPUT = PROJECT_ROOT / "benchmark_results.json"
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "benchmark_baseline.json"
+# допустиме падіння пропускної здатності відносно baseline
+TOLERANCE = 0.2
+# найбільший ряд, для якого виділення міряються tracemalloc
+ALLOC_MAX_SIZE = 1_000_000
+
+
+def synthetic_series(size: int, seed: int = 7) -> BarSeries:
+    """Хвилинні бари GBM (core.synthetic_data, без читання файлів)."""
+    return generate_bars(size, "M1", seed=seed)
+
+
+def _risk_manager() -> RiskManager:
+    """RiskManager без спрацювання лімітів (щоб міряти лише обчислення)."""
+    return RiskManager(
+        10_000, risk_per_trade=0.01, max_drawdown=1.0, max_trades_per_day=10**12
+    )
+
+
+# -----------------------------
+# Сценарії: повертають кількість оброблених одиниць
+# -----------------------------
+def bench_backtester_run(size: int) -> int:
+    series = synthetic_series(size)
+    bt = Backtester("benchmark.csv", SMAStrategy(5, 20, 0.001), _risk_manager())
+    bt.load_data = lambda: series  # ряд у пам'яті замість CSV
+    bt.run()
+    return size
+
+
+def bench_sma_generate_signal(size: int) -> int:
+    series = synthetic_series(size)
+    strategy = SMAStrategy(5, 20, 0.001)
+    for i in range(size):
+        strategy.generate_signal(series.window(0, i + 1))
+    return size
+
+
+def bench_execution_submit_close(size: int) -> int:
+    engine = ExecutionEngine(_risk_manager(), mode="simulator")
+    closes = synthetic_series(size).close.tolist()
+    for price in closes:
+        ok, order = engine.submit_order("TEST", "long", price, price * 0.99)
+        if ok:
+            engine.close_order(order["id"], exit_price=price)
+    return size
+
+
+def bench_risk_validate_order(size: int) -> int:
+    rm = _risk_manager()
+    closes = synthetic_series(size).close.tolist()
+    for price in closes:
+        rm.validate_order(price * 0.01, price)
+    return size
+
+
+CASES = {
+    "backtester_run": (bench_backtester_run, "bars_per_sec"),
+    "sma_generate_signal": (bench_sma_generate_signal, "bars_per_sec"),
+    "execution_submit_close": (bench_execution_submit_close, "orders_per_sec"),
+    "risk_validate_order": (bench_risk_validate_order, "orders_per_sec"),
+}
+
+
+def _peak_rss_mb() -> float | None:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux — КБ, macOS — байти
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def _cpu_model() -> str:
+    """Модель процесора (Linux — з /proc/cpuinfo)."""
+    try:
+        with open("/proc/cpuinfo", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("model name"):
+                    return line.partition(":")[2].strip()
+    except OSError:
+        pass
+    return platform.processor()
+
+
+def environment() -> dict:
+    """Середовище, в якому заміри порівнювані між собою."""
+    return {
+        "python": ".".join(platform.python_version_tuple()[:2]),
+        "system": platform.system(),
+        "machine": platform.machine(),
+        "cpu": _cpu_model(),
+    }
+
+
+def _traced_allocations(func, size: int) -> dict:
+    """Пік і залишок трасованої пам'яті (tracemalloc) за прогін сценарію."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func(size)
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"alloc_peak_mb": peak / 2**20, "alloc_retained_mb": current / 2**20}
+
+
+def measure(name: str, size: int, alloc_max_size: int = ALLOC_MAX_SIZE) -> dict:
+    """Виконує сценарій у поточному процесі і повертає метрики."""
+    func, unit = CASES[name]
+    gc.collect()
+    collections = gc.get_stats()[0]["collections"]
+    start = time.perf_counter()
+    units = func(size)
+    seconds = time.perf_counter() - start
+    row = {
+        "size": size,
+        "seconds": seconds,
+        unit: units / seconds if seconds > 0 else float("inf"),
+        "peak_rss_mb": _peak_rss_mb(),
+        "gc_collections": gc.get_stats()[0]["collections"] - collections,
+        "alloc_peak_mb": None,
+        "alloc_retained_mb": None,
+    }
+    if size <= alloc_max_size:
+        row.update(_traced_allocations(func, size))
+    return row
+
+
+def measure_isolated(name: str, size: int, alloc_max_size: int = ALLOC_MAX_SIZE):
+    """Виконує сценарій в окремому процесі (чиста пікова RSS)."""
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(1) as pool:
+        return pool.apply(measure, (name, size, alloc_max_size))
+
+
+def run_suite(
+    cases, sizes, isolate: bool = True, log=print, alloc_max_size=ALLOC_MAX_SIZE
+) -> dict:
+    """Проганяє сценарії для всіх розмірів і повертає документ результатів."""
+    results = {}
+    run = measure_isolated if isolate else measure
+    for name in cases:
+        for size in sizes:
+            row = run(name, size, alloc_max_size)
+            results.setdefault(name, {})[str(size)] = row
+            unit = CASES[name][1]
+            log(f"{name:<24} {size:>10,} {row[unit]:>14,.0f} {unit}")
+    return {
+        "meta": {
+            "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+            "environment": environment(),
+            "python_version": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float = TOLERANCE) -> list:
+    """
+    Порівнює пропускну здатність з baseline.
+
+    Повертає список регресій (сценарій, розмір, було, стало, зміна у %)
+    для пар, присутніх в обох документах, де падіння більше за tolerance.
+    """
+    regressions = []
+    for name, rows in results["results"].items():
+        unit = CASES[name][1]
+        for size, row in rows.items():
+            old = baseline.get("results", {}).get(name, {}).get(size)
+            if not old or not old.get(unit):
+                continue
+            change = row[unit] / old[unit] - 1.0
+            if change < -tolerance:
+                regressions.append(
+                    (name, int(size), old[unit], row[unit], change * 100)
+                )
+    return regressions
+
+
+def missing_from_baseline(results: dict, baseline: dict) -> list:
+    """Заміряні пари (сценарій, розмір), для яких у baseline немає значення."""
+    missing = []
+    for name, rows in results["results"].items():
+        unit = CASES[name][1]
+        for size in rows:
+            old = baseline.get("results", {}).get(name, {}).get(size)
+            if not old or not old.get(unit):
+                missing.append((name, int(size)))
+    return missing
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Бенчмарк торгового ядра")
+    parser.add_argument(
+        "--sizes",
+        default=",".join(str(size) for size in SIZES),
+        help="розміри рядів через кому (напр. 10k,100k,1M)",
+    )
+    parser.add_argument("--cases", default=",".join(CASES), help="сценарії через кому")
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT)
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument(
+        "--save-baseline", action="store_true", help="записати результати як baseline"
+    )
+    parser.add_argument(
+        "--no-compare", action="store_true", help="не порівнювати з baseline"
+    )
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    parser.add_argument(
+        "--no-isolate", action="store_true", help="усі заміри в одному процесі"
+    )
+    parser.add_argument(
+        "--alloc-max-size",
+        default=str(ALLOC_MAX_SIZE),
+        help="найбільший ряд для замірів tracemalloc (0 — вимкнено)",
+    )
+    args = parser.parse_args(argv)
+
+    cases = [c.strip() for c in args.cases.split(",") if c.strip()]
+    unknown = set(cases) - set(CASES)
+    if unknown:
+        parser.error(f"невідомі сценарії: {', '.join(sorted(unknown))}")
+    sizes = [parse_count(s) for s in args.sizes.split(",") if s.strip()]
+
+    results = run_suite(
+        cases,
+        sizes,
+        isolate=not args.no_isolate,
+        alloc_max_size=parse_count(args.alloc_max_size),
+    )
+    args.output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    print(f"Результати: {args.output}")
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(results, indent=2), encoding="utf-8")
+        print(f"Baseline збережено: {args.baseline}")
+        return 0
+    if args.no_compare:
+        return 0
+    if not args.baseline.exists():
+        print(
+            f"Baseline не знайдено: {args.baseline} (--save-baseline або --no-compare)"
+        )
+        return 2
+
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    recorded = baseline.get("meta", {}).get("environment")
+    if recorded != results["meta"]["environment"]:
+        print(
+            f"Baseline з іншого середовища: {recorded} ≠ "
+            f"{results['meta']['environment']} (--save-baseline на цій машині "
+            "або --baseline з файлом для неї)"
+        )
+        return 2
+    missing = missing_from_baseline(results, baseline)
+    for name, size in missing:
+        print(f"НЕМАЄ BASELINE {name} {size:,}")
+    regressions = compare(results, baseline, args.tolerance)
+    for name, size, old, new, change in regressions:
+        print(f"РЕГРЕСІЯ {name} {size:,}: {old:,.0f} → {new:,.0f} ({change:+.1f}%)")
+    if regressions:
+        return 1
+    return 2 if missing else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
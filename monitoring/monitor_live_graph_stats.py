@@ -2,6 +2,8 @@
 
 import os
 
+from core.metrics import MetricsTracker
+
 
 class LiveMonitorGraphStats:
     """
@@ -16,6 +18,7 @@ class LiveMonitorGraphStats:
         profit (float): Загальний прибуток.
         max_dd (float): Максимальне просідання (drawdown).
         peak_balance (float): Максимальний зафіксований баланс.
+        stats (MetricsTracker): Інкрементальні метрики (O(1) на бар).
     """
 
     def __init__(self, width=50, height=10):
@@ -25,11 +28,27 @@ class LiveMonitorGraphStats:
         self.width = width
         self.height = height
         self.balance_history = []
-        self.trades = 0
-        self.win_trades = 0
-        self.profit = 0.0
-        self.max_dd = 0.0
-        self.peak_balance = 0.0
+        self.stats = MetricsTracker()
+
+    @property
+    def trades(self):
+        return self.stats.trades
+
+    @property
+    def win_trades(self):
+        return self.stats.wins
+
+    @property
+    def profit(self):
+        return self.stats.net_profit
+
+    @property
+    def max_dd(self):
+        return self.stats.max_drawdown
+
+    @property
+    def peak_balance(self):
+        return self.stats.peak or 0.0
 
     def update(self, balance, closed_trades=None):
         """
@@ -44,17 +63,11 @@ class LiveMonitorGraphStats:
             closed_trades = []
 
         self.balance_history.append(balance)
-        self.peak_balance = max(self.peak_balance, balance)
-        dd = self.peak_balance - balance
-        if dd > self.max_dd:
-            self.max_dd = dd
+        self.stats.update(balance)
 
         # оновлення статистики по закритих угодах
         for t in closed_trades:
-            self.trades += 1
-            if t["profit"] > 0:
-                self.win_trades += 1
-            self.profit += t["profit"]
+            self.stats.add_trade(t["profit"])
 
         # будуємо графік останніх width значень балансу
         data = self.balance_history[-self.width :]  # noqa
@@ -75,7 +88,7 @@ class LiveMonitorGraphStats:
         for row in grid:
             print("".join(row))
 
-        win_pct = (self.win_trades / self.trades * 100) if self.trades > 0 else 0.0
+        win_pct = self.stats.win_rate * 100
         # виводимо статистику балансу та угод
         print(
             f"Balance: {balance:.2f} | Profit: {self.profit:.2f} | Trades:"
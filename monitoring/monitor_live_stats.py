@@ -2,6 +2,8 @@
 import os
 import time
 
+from core.metrics import MetricsTracker
+
 
 class LiveMonitorStats:
     """
@@ -14,6 +16,8 @@ class LiveMonitorStats:
         max_drawdown (float): максимальне просідання балансу.
         balance_peak (float): максимальний досягнутий баланс.
         win_trades (int): кількість виграшних угод.
+        stats (MetricsTracker): інкрементальні метрики (O(1) на бар),
+            включно з Sharpe/Sortino і тривалістю просадки.
     """
 
     def __init__(self, refresh_delay=0.1):
@@ -25,34 +29,48 @@ class LiveMonitorStats:
             За замовчуванням 0.1.
         """
         self.refresh_delay = refresh_delay
-        self.trades_executed = 0
-        self.profit_total = 0.0
-        self.max_drawdown = 0.0
-        self.balance_peak = 0.0
-        self.win_trades = 0
+        self.stats = MetricsTracker()
+
+    @property
+    def trades_executed(self):
+        return self.stats.trades
+
+    @property
+    def profit_total(self):
+        return self.stats.net_profit
+
+    @property
+    def max_drawdown(self):
+        return self.stats.max_drawdown
+
+    @property
+    def balance_peak(self):
+        return self.stats.peak or 0.0
 
-    def update_metrics(self, balance, closed_trades):
+    @property
+    def win_trades(self):
+        return self.stats.wins
+
+    def update_metrics(self, balance, closed_trades, in_market=False):
         """
         Оновлює показники метрик на основі поточного балансу та закритих угод.
 
         Args:
             balance (float): поточний баланс.
             closed_trades (list[dict]): список закритих угод з ключами
-            'exit_price', 'price', 'side'.
+            'exit_price', 'price', 'side' (або з готовим 'profit').
+            in_market (bool, optional): чи є відкриті позиції на цьому барі.
         """
-        self.balance_peak = max(self.balance_peak, balance)
-        self.max_drawdown = max(self.max_drawdown, self.balance_peak - balance)
+        self.stats.update(balance, in_market)
 
         for t in closed_trades:
-            self.trades_executed += 1
-            pnl = (
-                (t["exit_price"] - t["price"])
-                if t["side"] == "LONG"
-                else (t["price"] - t["exit_price"])
-            )
-            self.profit_total += pnl
-            if pnl > 0:
-                self.win_trades += 1
+            if "profit" in t:
+                pnl = t["profit"]
+            elif str(t["side"]).upper() == "LONG":
+                pnl = t["exit_price"] - t["price"]
+            else:
+                pnl = t["price"] - t["exit_price"]
+            self.stats.add_trade(pnl)
 
     def update_bar(self, bar_index, candle, trades, balance, closed_trades=None):
         """
@@ -71,14 +89,14 @@ class LiveMonitorStats:
 
         os.system("cls" if os.name == "nt" else "clear")
 
-        self.update_metrics(balance, closed_trades)
+        open_trades = [t for t in trades if t["status"] == "OPEN"]
+        self.update_metrics(balance, closed_trades, bool(open_trades))
 
         # Основний рядок для виводу
         line = (
             f"Bar {bar_index + 1} | Close: {candle['close']} |"
             f" Balance:{balance:.2f}"
         )
-        open_trades = [t for t in trades if t["status"] == "OPEN"]
         if open_trades:
             positions = " | ".join(
                 f"{t['side'].upper()}@{t['price']}"
@@ -89,14 +107,11 @@ class LiveMonitorStats:
         print(line)
 
         # Вивід статистики
-        win_percent = (
-            (self.win_trades / self.trades_executed * 100)
-            if self.trades_executed
-            else 0
-        )
+        metrics = self.stats.metrics()
         print(
             f"Trades: {self.trades_executed} | Profit: {self.profit_total:.2f} |"
-            f" Max DD: {self.max_drawdown:.2f} | Win%: {win_percent:.1f}%"
+            f" Max DD: {self.max_drawdown:.2f} | Win%: {metrics['win_rate'] * 100:.1f}%"
+            f" | Sharpe: {metrics['sharpe']:.2f}"
         )
 
         time.sleep(self.refresh_delay)
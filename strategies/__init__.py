@@ -1,12 +1,53 @@
-"""Ініціалізаційний модуль пакету strategies."""
+"""
+Ініціалізаційний модуль пакету strategies.
+
+Модулі стратегій не імпортуються разом із пакетом: стратегії створюються
+через реєстр (strategies.registry) за ім'ям, а класи, доступні як атрибути
+пакету (strategies.SMAStrategy тощо), підвантажуються при першому зверненні.
+"""
 
 from __future__ import annotations
 
-# Імпортуємо класи без падіння (модулі можуть бути в розробці)
-try:
-    from .strategy_dummy import *  # noqa
-    from .strategy_sma import *  # noqa
-except ImportError:
-    pass
+import importlib
+
+from .registry import (  # noqa
+    available_strategies,
+    create_strategy,
+    load_strategy,
+    register_strategy,
+    strategy_from_config,
+)
+
+# атрибут пакету -> модуль, з якого він підвантажується
+_LAZY_ATTRS = {
+    "BaseStrategy": "strategy_base",
+    "SignalAdapter": "strategy_base",
+    "as_streaming": "strategy_base",
+    "DummyStrategy": "strategy_dummy",
+    "MTFTrendStrategy": "strategy_mtf",
+    "SMAStrategy": "strategy_sma",
+}
+
+
+def __getattr__(name: str):
+    module = _LAZY_ATTRS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted({*globals(), *_LAZY_ATTRS})
+
 
-__all__ = ["strategy_dummy", "strategy_sma"]
+# лише API реєстру: "from strategies import *" не імпортує модулі стратегій,
+# класи доступні як strategies.SMAStrategy або через реєстр
+__all__ = [
+    "available_strategies",
+    "create_strategy",
+    "load_strategy",
+    "register_strategy",
+    "strategy_from_config",
+]
@@ -0,0 +1,140 @@
+# registry.py
+"""
+Реєстр стратегій з лінивим завантаженням.
+
+Стратегія реєструється під коротким ім'ям як точка входу
+"пакет.модуль:Клас"; модуль імпортується лише під час першого створення
+стратегії, тож список доступних стратегій (available_strategies) і сам
+імпорт пакету strategies не тягнуть залежностей стратегій (напр. ML).
+
+Зовнішні пакети додають стратегії через entry points групи
+ENTRY_POINT_GROUP (pyproject: [project.entry-points."lavrgpt05.strategies"]).
+
+Стратегія з конфігурації: strategy_from_config() бере ім'я з
+core.config_trades.STRATEGY["name"], решта ключів — параметри конструктора.
+Невідомі конструктору параметри create_strategy відхиляє (ValueError),
+а strategy_from_config відкидає з попередженням у лог (спільна секція
+конфігурації може містити ключі інших стратегій).
+"""
+
+from __future__ import annotations
+
+import importlib
+import inspect
+import logging
+from importlib import metadata
+
+ENTRY_POINT_GROUP = "lavrgpt05.strategies"
+DEFAULT_STRATEGY = "sma"
+
+# ім'я -> точка входу "модуль:клас"
+_REGISTRY: dict[str, str] = {
+    "sma": "strategies.strategy_sma:SMAStrategy",
+    "dummy": "strategies.strategy_dummy:DummyStrategy",
+    # потребує MultiTimeframe: create_strategy("sma_mtf", mtf=...)
+    "sma_mtf": "strategies.strategy_mtf:MTFTrendStrategy",
+}
+# вже завантажені класи
+_LOADED: dict[str, type] = {}
+_plugins_scanned = False
+
+logger = logging.getLogger(__name__)
+
+
+def register_strategy(name: str, entry_point: str, replace: bool = False) -> None:
+    """
+    Реєструє стратегію без імпорту її модуля.
+
+    :param name: Ім'я для конфігурації (напр. "sma").
+    :param entry_point: "пакет.модуль:Клас".
+    :param replace: Дозволити перевизначити вже зареєстроване ім'я.
+    """
+    module, sep, attr = entry_point.partition(":")
+    if not module or not sep or not attr:
+        raise ValueError(f"Entry point must look like 'module:Class': {entry_point}")
+    _scan_plugins()
+    if name in _REGISTRY and not replace and _REGISTRY[name] != entry_point:
+        raise ValueError(f"Strategy '{name}' is already registered")
+    _REGISTRY[name] = entry_point
+    _LOADED.pop(name, None)
+
+
+def _scan_plugins() -> None:
+    """Додає точки входу встановлених пакетів (лише імена, без імпорту)."""
+    global _plugins_scanned
+    if _plugins_scanned:
+        return
+    _plugins_scanned = True
+    for ep in metadata.entry_points(group=ENTRY_POINT_GROUP):
+        _REGISTRY.setdefault(ep.name, ep.value)
+
+
+def available_strategies() -> list[str]:
+    """Імена зареєстрованих стратегій (модулі не імпортуються)."""
+    _scan_plugins()
+    return sorted(_REGISTRY)
+
+
+def entry_point(name: str) -> str:
+    """Точка входу стратегії name."""
+    _scan_plugins()
+    try:
+        return _REGISTRY[name]
+    except KeyError:
+        known = ", ".join(sorted(_REGISTRY))
+        raise ValueError(f"Unknown strategy '{name}' (available: {known})") from None
+
+
+def load_strategy(name: str) -> type:
+    """Імпортує модуль стратегії (раз) і повертає її клас."""
+    cls = _LOADED.get(name)
+    if cls is None:
+        module, _, attr = entry_point(name).partition(":")
+        cls = getattr(importlib.import_module(module), attr)
+        _LOADED[name] = cls
+    return cls
+
+
+def create_strategy(name: str, **params):
+    """
+    Створює стратегію за ім'ям.
+
+    Параметр, якого конструктор не приймає (напр. описка "sma_fsat"),
+    — ValueError, а не тихе значення за замовчуванням.
+    """
+    return _instantiate(name, params, strict=True)
+
+
+def _instantiate(name: str, params: dict, strict: bool):
+    """Створює стратегію; невідомі параметри — помилка (strict) або лог."""
+    cls = load_strategy(name)
+    signature = inspect.signature(cls.__init__)
+    accepts_any = any(
+        p.kind is inspect.Parameter.VAR_KEYWORD for p in signature.parameters.values()
+    )
+    unknown = [] if accepts_any else sorted(set(params) - set(signature.parameters))
+    if unknown:
+        if strict:
+            raise ValueError(
+                f"Strategy '{name}' does not accept parameters: {', '.join(unknown)}"
+            )
+        logger.warning(
+            "Strategy '%s' ignores unknown parameters: %s", name, ", ".join(unknown)
+        )
+        params = {k: v for k, v in params.items() if k not in unknown}
+    return cls(**params)
+
+
+def strategy_from_config(config: dict | None = None):
+    """
+    Стратегія за секцією конфігурації (типово core.config_trades.STRATEGY).
+
+    Ключ "name" — ім'я в реєстрі (за замовчуванням DEFAULT_STRATEGY),
+    решта — параметри конструктора; ключі, яких конструктор не приймає,
+    відкидаються з попередженням у лог.
+    """
+    if config is None:
+        from core.config_trades import STRATEGY as config
+    params = dict(config)
+    name = params.pop("name", DEFAULT_STRATEGY)
+    return _instantiate(name, params, strict=False)
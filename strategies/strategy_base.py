@@ -0,0 +1,49 @@
+# strategy_base.py
+"""
+Потоковий протокол стратегій для Backtester.
+
+Стратегія отримує бари по одному через on_bar(bar) і сама тримає
+свій ковзний стан, тому прогін займає лінійний час від кількості барів.
+
+Старі стратегії з методом generate_signal(candles) підключаються через
+SignalAdapter, який передає їм вікно BarSeries без копіювання.
+"""
+
+
+class BaseStrategy:
+    """Базовий клас потокової стратегії."""
+
+    def on_bar(self, bar):
+        """
+        Обробляє черговий бар.
+
+        :param bar: Bar (рядок BarSeries) або словник з ключем 'close'.
+        :return: Кортеж (side, stop_loss, take_profit) або None.
+        """
+        raise NotImplementedError
+
+    def reset(self) -> None:
+        """Скидає внутрішній стан стратегії перед новим прогоном."""
+
+
+class SignalAdapter(BaseStrategy):
+    """
+    Адаптер для стратегій, що мають лише generate_signal(candles).
+
+    Для кожного бару передає стратегії префікс серії data[: i + 1],
+    який для BarSeries є представленням без копіювання.
+    """
+
+    def __init__(self, strategy):
+        self.strategy = strategy
+
+    def on_bar(self, bar):
+        window = bar.series.window(0, bar.index + 1)
+        return self.strategy.generate_signal(window)
+
+
+def as_streaming(strategy) -> BaseStrategy:
+    """Повертає стратегію з методом on_bar (за потреби обгортає адаптером)."""
+    if hasattr(strategy, "on_bar"):
+        return strategy
+    return SignalAdapter(strategy)
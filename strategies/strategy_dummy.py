@@ -1,13 +1,36 @@
 # strategy_dummy.py
 
+from strategies.strategy_base import BaseStrategy
+
+
+class DummyStrategy(BaseStrategy):
+    def __init__(self):
+        # стан для потокового режиму on_bar
+        self._bars_seen = 0
+        self._prev_close = None
+
+    def reset(self) -> None:
+        self._bars_seen = 0
+        self._prev_close = None
 
-class DummyStrategy:
     def generate_signal(self, candles):
         if len(candles) < 20:
             return None
         last_price = candles[-1]["close"]
         prev_price = candles[-2]["close"]
+        return self._signal(last_price, prev_price)
+
+    def on_bar(self, bar):
+        last_price = float(bar["close"])
+        prev_price = self._prev_close
+        self._bars_seen += 1
+        self._prev_close = last_price
+        if self._bars_seen < 20:
+            return None
+        return self._signal(last_price, prev_price)
 
+    @staticmethod
+    def _signal(last_price, prev_price):
         if last_price > prev_price:
             return ("long", last_price * 0.99, last_price * 1.02)
         elif last_price < prev_price:
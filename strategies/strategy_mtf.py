@@ -0,0 +1,93 @@
+# strategy_mtf.py
+
+from bisect import bisect_left
+
+import numpy as np
+
+from core.indicator_cache import array_hash
+from core.indicators import sma
+from core.multi_timeframe import MultiTimeframe
+from strategies.strategy_sma import SMAStrategy
+
+
+class MTFTrendStrategy(SMAStrategy):
+    """
+    SMA crossover на базовому таймфреймі з фільтром тренду вищого.
+
+    Long дозволено, лише поки закриття останнього завершеного бару
+    trend_timeframe вище його SMA(trend_period), short — лише нижче.
+    Тренд по базових барах рахується один раз у конструкторі
+    (MultiTimeframe.align). Бар зіставляється з базовою серією mtf за часом
+    (вікна, порції, відновлення з checkpoint читають правильний тренд);
+    бар, якого немає в mtf.base, — ValueError. Для послідовних барів — O(1).
+
+    Атрибути (додатково до SMAStrategy):
+        trend_timeframe: Таймфрейм фільтра (ключ у mtf, напр. "H1").
+        trend_period (int): Період SMA тренду.
+        trend_data (str): Хеш даних тренду (для ключа result_cache).
+    """
+
+    def __init__(
+        self,
+        mtf: MultiTimeframe,
+        trend_timeframe="H1",
+        trend_period: int = 20,
+        sma_fast: int = 3,
+        sma_slow: int = 5,
+        sl_coef: float = 0.01,
+        rr_ratio: float = 2.0,
+    ):
+        super().__init__(sma_fast, sma_slow, sl_coef, rr_ratio)
+        self.trend_timeframe = trend_timeframe
+        self.trend_period = trend_period
+        closes = mtf.series[trend_timeframe].close
+        self.trend_data = array_hash(closes)
+        trend = np.sign(closes - sma(closes, trend_period))
+        trend[: trend_period - 1] = 0  # неповне вікно — тренду ще немає
+        # напрямок тренду на кожному базовому барі: 1, -1 або 0
+        self._trend = mtf.align(trend_timeframe, trend, fill=0).astype(int).tolist()
+        self._times = mtf.base.time.tolist()
+        # очікуваний індекс наступного бару в mtf.base
+        self._bar = 0
+
+    def reset(self) -> None:
+        super().reset()
+        self._bar = 0
+
+    def on_bar(self, bar):
+        i = self._index(bar)
+        return self._filter(super().on_bar(bar), i)
+
+    def generate_signal(self, candles):
+        """candles — бари mtf.base (або її вікна) до поточного включно."""
+        signal = super().generate_signal(candles)
+        return self._filter(signal, self._index(candles[-1])) if len(candles) else None
+
+    def _index(self, bar) -> int:
+        """Індекс бару в mtf.base за його часом."""
+        time = _bar_time(bar)
+        i = self._bar
+        if i >= len(self._times) or self._times[i] != time:
+            i = bisect_left(self._times, time)
+            if i == len(self._times) or self._times[i] != time:
+                raise ValueError(
+                    f"Bar {bar['time']} is not in the base series of the trend filter"
+                )
+        self._bar = i + 1
+        return i
+
+    def _filter(self, signal, i: int):
+        if signal is None:
+            return None
+        trend = self._trend[i]
+        if (signal[0] == "long" and trend > 0) or (signal[0] == "short" and trend < 0):
+            return signal
+        return None
+
+
+def _bar_time(bar) -> int:
+    """Час бару в секундах epoch (Bar з BarSeries або словник з ключем 'time')."""
+    series = getattr(bar, "series", None)
+    if series is not None:
+        return int(series.time[bar.index])
+    return int(np.datetime64(bar["time"], "s").astype(np.int64))
@@ -1,7 +1,28 @@
 # strategy_sma.py
 
+from core.bar_data import BarSeries
+from core.indicators import RollingSMA
+from strategies.strategy_base import BaseStrategy
 
-class SMAStrategy:
+
+def _close_at(candles, i: int) -> float:
+    """Закриття i-ї свічки (BarSeries або список словників)."""
+    if isinstance(candles, BarSeries):
+        return float(candles.close[i])
+    return float(candles[i]["close"])
+
+
+def _series_origin(candles) -> tuple | None:
+    """
+    (коренева серія, індекс початку) для BarSeries (BarSeries.origin);
+    None для інших послідовностей.
+    """
+    if not isinstance(candles, BarSeries):
+        return None
+    return candles.origin or (candles, 0)
+
+
+class SMAStrategy(BaseStrategy):
     """
     Simple Moving Average (SMA) crossover trading strategy.
 
@@ -33,6 +54,36 @@ class SMAStrategy:
         self.rr_ratio = rr_ratio
         self.prev_fast = None
         self.prev_slow = None
+        # інкрементальні SMA (core.indicators), O(1) на бар
+        self._fast = RollingSMA(sma_fast)
+        self._slow = RollingSMA(sma_slow)
+        # скільки закриттів подано в SMA, останнє з них і серія-джерело
+        # (BarSeries.origin), з якої їх узято (щоб generate_signal
+        # на префіксах додавав лише новий бар)
+        self._fed = 0
+        self._last_close = None
+        self._source = None
+
+    def __getstate__(self):
+        # серія-джерело не серіалізується: після відновлення generate_signal
+        # один раз перерахує SMA
+        return {**vars(self), "_source": None}
+
+    def reset(self) -> None:
+        """Скидає попередні значення SMA і ковзні вікна."""
+        self.prev_fast = None
+        self.prev_slow = None
+        self._fast.reset()
+        self._slow.reset()
+        self._fed = 0
+        self._last_close = None
+        self._source = None
+
+    def _push(self, close: float) -> None:
+        self._fast.update(close)
+        self._slow.update(close)
+        self._fed += 1
+        self._last_close = close
 
     def generate_signal(self, candles):
         """
@@ -41,30 +92,69 @@ class SMAStrategy:
         Сигнал "long" генерується, якщо швидка SMA перетинає повільну знизу вверх.
         Сигнал "short" генерується, якщо швидка SMA перетинає повільну зверху вниз.
 
-        :param candles: Список словників зі свічками,
+        :param candles: BarSeries або список словників зі свічками,
          кожна свічка має ключ 'close' для закриття.
         :return: Кортеж (side, stop_loss, take_profit) або None, якщо сигнал відсутній.
+
+        Якщо candles — префікс тієї самої BarSeries, що й у попередньому
+        виклику, довший на одну свічку (як у SignalAdapter), у SMA додається
+        лише нове закриття — O(1). Інакше (інша серія, інший початок, список
+        словників) SMA перераховуються по всіх candles; для O(1) на бар
+        без BarSeries використовуйте on_bar.
         """
-        if len(candles) < self.sma_slow:
+        size = len(candles)
+        if size == 0:
             return None
+        source, previous = _series_origin(candles), self._source
+        if (
+            size == self._fed + 1
+            and source is not None
+            and previous is not None
+            and source[0] is previous[0]
+            and source[1] == previous[1]
+        ):
+            self._push(_close_at(candles, -1))
+        else:
+            self._fast.reset()
+            self._slow.reset()
+            self._fed = 0
+            for i in range(size):
+                self._push(_close_at(candles, i))
+        self._source = source
 
-        closes = [c["close"] for c in candles]
+        if size < self.sma_slow:
+            return None
+        return self._cross_signal(self._fast.value, self._slow.value, self._last_close)
 
-        sma_fast = sum(closes[-self.sma_fast :]) / self.sma_fast
-        sma_slow = sum(closes[-self.sma_slow :]) / self.sma_slow
+    def on_bar(self, bar):
+        """
+        Потоковий варіант generate_signal: обробляє один бар за O(1).
+
+        Ковзні вікна закриттів зберігаються у стратегії, тому Backtester
+        не передає їй весь префікс історії на кожному барі.
+
+        :param bar: Бар з ключем 'close'.
+        :return: Кортеж (side, stop_loss, take_profit) або None.
+        """
+        close = float(bar["close"])
+        self._push(close)
+        self._source = None  # наступний generate_signal перерахує SMA
+        if not self._slow.ready:
+            return None
+        return self._cross_signal(self._fast.value, self._slow.value, close)
 
+    def _cross_signal(self, sma_fast: float, sma_slow: float, entry_price: float):
+        """Перевіряє перетин SMA і оновлює попередні значення."""
         signal = None
         if self.prev_fast is not None and self.prev_slow is not None:
             # Long: fast SMA перетинає slow SMA знизу вгору
             if self.prev_fast <= self.prev_slow and sma_fast > sma_slow:
-                entry_price = closes[-1]
                 stop_loss = entry_price * (1 - self.sl_coef)
                 take_profit = entry_price + (entry_price - stop_loss) * self.rr_ratio
                 signal = ("long", stop_loss, take_profit)
 
             # Short: fast SMA перетинає slow SMA зверху вниз
             elif self.prev_fast >= self.prev_slow and sma_fast < sma_slow:
-                entry_price = closes[-1]
                 stop_loss = entry_price * (1 + self.sl_coef)
                 take_profit = entry_price - (stop_loss - entry_price) * self.rr_ratio
                 signal = ("short", stop_loss, take_profit)
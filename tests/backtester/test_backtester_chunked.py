@@ -0,0 +1,79 @@
+# test_backtester_chunked.py
+"""
+Тести потокового (порціями) режиму Backtester.run(chunk_size=...).
+
+Перевіряє, що результат не залежить від розміру порції (включно з виходами
+SL/TP, які переходять межу порцій) і що пікова пам'ять потокового прогону
+не росте разом з файлом.
+"""
+
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from core.backtester import Backtester
+from core.risk_manager import RiskManager
+from strategies.strategy_base import BaseStrategy
+from strategies.strategy_sma import SMAStrategy
+
+
+class IdleStrategy(BaseStrategy):
+    """Стратегія без сигналів — для вимірювання пам'яті самого прогону."""
+
+    def on_bar(self, bar):
+        return None
+
+
+def _write_bars(path, size, seed=11):
+    rng = np.random.default_rng(seed)
+    closes = 1.1 + np.cumsum(rng.normal(0, 1e-4, size))
+    with open(path, "w") as f:
+        f.write("time,open,high,low,close\n")
+        for i, c in enumerate(closes):
+            f.write(f"{np.datetime64(i * 60, 's')},{c},{c + 2e-4},{c - 2e-4},{c}\n")
+    return path
+
+
+def _run(path, chunk_size, intrabar=True):
+    rm = RiskManager(10_000, max_drawdown=0.9, max_trades_per_day=10**9)
+    bt = Backtester(
+        path, SMAStrategy(5, 20, 0.0005, 2.0), rm, 50, intrabar, use_cache=False
+    )
+    trades = bt.run(chunk_size=chunk_size)
+    keys = ("open_index", "size", "exit_price", "exit_reason", "profit")
+    return [[t[k] for k in keys] for t in trades], rm.balance
+
+
+@pytest.mark.parametrize("intrabar", [True, False])
+def test_chunked_run_matches_full_load(tmp_path, intrabar):
+    path = _write_bars(tmp_path / "bars.csv", 3_000)
+    expected = _run(path, None, intrabar)
+    assert len(expected[0]) > 10
+    for chunk_size in (1, 7, 64, 5_000):
+        assert _run(path, chunk_size, intrabar) == expected
+
+
+def test_streaming_requires_on_bar(tmp_path):
+    class Legacy:
+        def generate_signal(self, candles):
+            return None
+
+    path = _write_bars(tmp_path / "bars.csv", 10)
+    bt = Backtester(path, Legacy(), RiskManager(10_000), use_cache=False)
+    with pytest.raises(ValueError):
+        bt.run(chunk_size=5)
+
+
+def test_streaming_peak_memory_does_not_grow_with_file(tmp_path):
+    path = _write_bars(tmp_path / "bars.csv", 100_000)
+
+    def peak(chunk_size):
+        bt = Backtester(path, IdleStrategy(), RiskManager(10_000), use_cache=False)
+        tracemalloc.start()
+        bt.run(chunk_size=chunk_size)
+        result = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return result
+
+    assert peak(1_000) * 5 < peak(None)
@@ -0,0 +1,96 @@
+# test_backtester_streaming.py
+"""
+Тести потокового протоколу стратегій (on_bar) у Backtester.
+
+Перевіряє, що on_bar дає ті самі сигнали, що й generate_signal
+на префіксах даних, і що стара стратегія працює через SignalAdapter.
+"""
+
+import os
+
+import pytest
+
+from core.backtester import Backtester
+from core.bar_data import BarSeries
+from core.indicators import sma
+from core.risk_manager import RiskManager
+from strategies.strategy_base import SignalAdapter, as_streaming
+from strategies.strategy_dummy import DummyStrategy
+from strategies.strategy_sma import SMAStrategy
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+
+class LegacyStrategy:
+    """Стратегія старого формату — лише generate_signal."""
+
+    def __init__(self):
+        self.inner = SMAStrategy(sma_fast=3, sma_slow=5)
+
+    def generate_signal(self, candles):
+        return self.inner.generate_signal(candles)
+
+
+@pytest.mark.parametrize(
+    "data_name, factory",
+    [
+        ("test_backtester_sma_data.csv", lambda: SMAStrategy(3, 5, 0.01, 2.0)),
+        ("data.csv", lambda: SMAStrategy(2, 4, 0.01, 2.0)),
+        ("data.csv", DummyStrategy),
+    ],
+)
+def test_on_bar_matches_generate_signal(data_name, factory):
+    """on_bar по барах повертає ті самі сигнали, що generate_signal(data[:i+1])."""
+    data = BarSeries.from_csv(os.path.join(PROJECT_ROOT, "data", data_name))
+    streaming, legacy = factory(), factory()
+
+    for i in range(len(data)):
+        assert streaming.on_bar(data[i]) == legacy.generate_signal(data[: i + 1])
+
+
+def test_legacy_strategy_is_wrapped():
+    """Стратегія без on_bar обгортається адаптером і дає ті самі угоди."""
+    assert isinstance(as_streaming(LegacyStrategy()), SignalAdapter)
+
+    data_file = os.path.join(PROJECT_ROOT, "data", "test_backtester_sma_data.csv")
+    results = []
+    for strategy in (LegacyStrategy(), SMAStrategy(sma_fast=3, sma_slow=5)):
+        rm = RiskManager(balance=10_000, risk_per_trade=0.01)
+        trades = Backtester(data_file, strategy, rm).run()
+        results.append(([(t["side"], t["price"]) for t in trades], rm.balance))
+
+    assert results[0] == results[1]
+
+
+def test_generate_signal_on_sliding_windows():
+    """Вікна, що не продовжують попередні, перераховують SMA з нуля."""
+    data = BarSeries.from_csv(os.path.join(PROJECT_ROOT, "data", "data.csv"))
+    strategy = SMAStrategy(2, 4, 0.01, 2.0)
+    for start in range(len(data) - 6):
+        window = data[start : start + 6]
+        strategy.generate_signal(window)
+        assert strategy.prev_slow == sma(window.close, 4)[-1]
+        assert strategy.prev_fast == sma(window.close, 2)[-1]
+
+
+def test_generate_signal_detects_other_series():
+    """
+    Інша серія тієї ж довжини з тим самим передостаннім закриттям
+    не продовжує стан попередньої — SMA перераховуються.
+    """
+    data = BarSeries.from_csv(os.path.join(PROJECT_ROOT, "data", "data.csv"))
+    size = 8
+    strategy = SMAStrategy(2, 4, 0.01, 2.0)
+    for i in range(size - 1):
+        strategy.generate_signal(data[: i + 1])
+
+    closes = data.close[:size].copy()
+    closes[: size - 2] += 1.0  # той самий close[-2], інша історія
+    other = BarSeries(data.time[:size], closes, closes, closes, closes)
+    strategy.generate_signal(other)
+    assert strategy.prev_slow == sma(closes, 4)[-1]
+    assert strategy.prev_fast == sma(closes, 2)[-1]
+
+    # список словників теж перераховується, а не продовжує стан
+    strategy.generate_signal([{"close": c} for c in data.close[: size + 1]])
+    assert strategy.prev_slow == sma(data.close[: size + 1], 4)[-1]
@@ -0,0 +1,123 @@
+# test_backtester_vectorized.py
+"""
+Тести векторного режиму бек-тесту (VectorizedBacktester).
+
+Угоди векторного режиму мають збігатися з Backtester.run угода в угоду:
+напрямок, ціна входу, розмір, SL/TP, бар відкриття і фінальний баланс.
+"""
+
+import os
+
+import numpy as np
+import pytest
+
+from core.backtester import Backtester
+from core.backtester_vectorized import VectorizedBacktester, rolling_mean
+from core.bar_data import bar_date
+from core.config_trades import RISK_MANAGER
+from core.param_sweep import evaluate_params
+from core.risk_manager import RiskManager
+from core.synthetic_data import generate_bars, write_bars_csv
+from strategies.strategy_sma import SMAStrategy
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+TRADE_KEYS = (
+    "side",
+    "price",
+    "size",
+    "stop_loss",
+    "take_profit",
+    "open_index",
+    "exit_price",
+    "profit",
+)
+
+
+def _run(cls, data_file, strategy_args, close_after_bars=None, **rm_kwargs):
+    """Запускає бек-тест і повертає (угоди без id, фінальний баланс)."""
+    rm = RiskManager(balance=10_000, **rm_kwargs)
+    bt = cls(data_file, SMAStrategy(*strategy_args), rm, close_after_bars)
+    trades = bt.run()
+    return [tuple(t[k] for k in TRADE_KEYS) for t in trades], rm.balance
+
+
+@pytest.mark.parametrize(
+    "data_name, strategy_args, close_after_bars",
+    [
+        ("test_backtester_sma_data.csv", (3, 5, 0.01, 2.0), None),
+        ("test_backtester_sma_data.csv", (2, 3, 0.02, 1.5), 1),
+        ("data.csv", (2, 4, 0.01, 2.0), 5),
+    ],
+)
+def test_vectorized_matches_run(data_name, strategy_args, close_after_bars):
+    """Векторний режим дає ті самі угоди і баланс, що й Backtester.run."""
+    data_file = os.path.join(PROJECT_ROOT, "data", data_name)
+    expected = _run(Backtester, data_file, strategy_args, close_after_bars)
+    actual = _run(VectorizedBacktester, data_file, strategy_args, close_after_bars)
+
+    assert actual == expected
+
+
+def test_vectorized_matches_run_on_long_series(tmp_path):
+    """На довгому синтетичному ряді без ліміту угод результати теж збігаються."""
+    rng = np.random.default_rng(7)
+    closes = 1.1 + np.cumsum(rng.normal(0, 1e-4, 5_000))
+    data_file = tmp_path / "synthetic.csv"
+    with open(data_file, "w") as f:
+        f.write("time,open,high,low,close\n")
+        for i, c in enumerate(closes):
+            f.write(f"{np.datetime64(i * 60, 's')},{c},{c + 1e-3},{c - 1e-3},{c}\n")
+
+    rm_kwargs = {"max_drawdown": 0.9, "max_trades_per_day": 10**9}
+    expected = _run(Backtester, data_file, (5, 20, 0.01, 2.0), 3, **rm_kwargs)
+    actual = _run(VectorizedBacktester, data_file, (5, 20, 0.01, 2.0), 3, **rm_kwargs)
+
+    assert len(expected[0]) > 100
+    assert actual == expected
+
+
+def test_daily_limit_uses_bar_dates(tmp_path):
+    """
+    З типовим RISK_MANAGER (5 угод на день) ліміт рахується за датою бару:
+    багатоденний прогін не обрізається до 5 угод, а режими збігаються.
+    """
+    data = generate_bars(20_000, "M5", seed=11)
+    data_file = write_bars_csv(data, tmp_path / "m5.csv", cache=False)
+    rm_kwargs = {k: v for k, v in RISK_MANAGER.items() if k != "balance"}
+    args = (5, 20, 0.002, 2.0)
+    expected = _run(Backtester, data_file, args, 12, **rm_kwargs)
+    actual = _run(VectorizedBacktester, data_file, args, 12, **rm_kwargs)
+
+    assert actual == expected
+    days = {bar_date(data.time[trade[5]]) for trade in expected[0]}
+    assert len(expected[0]) > RISK_MANAGER["max_trades_per_day"]
+    assert len(days) > 1
+
+    params = {"sma_fast": 5, "sma_slow": 20, "sl_coef": 0.002, "rr_ratio": 2.0}
+    result = evaluate_params(data, params, close_after_bars=12)
+    assert result["trades"] == len(expected[0])
+
+
+def test_rolling_mean_matches_window_sums():
+    """rolling_mean дає середнє повних вікон і неповних на старті."""
+    values = np.array([1.0, 2.0, 3.0, 4.0, 5.0])
+    result = rolling_mean(values, 3)
+    np.testing.assert_allclose(result, [1 / 3, 1.0, 2.0, 3.0, 4.0])
+
+
+def test_unsupported_backtester_options(tmp_path):
+    """Контрольні точки, профілювання і потоковий режим — ValueError."""
+    strategy, rm = SMAStrategy(3, 5), RiskManager(10_000)
+    for options in (
+        {"checkpoint_path": tmp_path / "run.ckpt"},
+        {"checkpoint_every": 10},
+        {"profiler": True},
+    ):
+        with pytest.raises(ValueError):
+            VectorizedBacktester("", strategy, rm, 3, **options)
+    bt = VectorizedBacktester("", strategy, rm, 3)
+    with pytest.raises(ValueError, match="chunk_size"):
+        bt.run(chunk_size=100)
+    with pytest.raises(ValueError, match="resume"):
+        bt.run(resume=True)
+    assert bt.run(data=generate_bars(500, "M5", seed=2)) is bt.trades_log
@@ -0,0 +1,144 @@
+# test_checkpoint.py
+"""
+Тести контрольних точок Backtester (core.checkpoint).
+
+Перевіряє, що прогін, перерваний посередині, продовжується з останнього
+знімка з тим самим результатом, що й безперервний (включно з відкритими
+ордерами, станом RiskManager і стратегії), а також фоновий запис знімків.
+"""
+
+import pickle
+
+import numpy as np
+import pytest
+
+from core.backtester import Backtester
+from core.checkpoint import CheckpointWriter, dump_state, load_checkpoint
+from core.risk_manager import RiskManager
+from strategies.strategy_sma import SMAStrategy
+
+KEYS = ("open_index", "size", "exit_price", "exit_reason", "profit")
+
+
+class Crash(Exception):
+    pass
+
+
+class CrashingSMA(SMAStrategy):
+    """SMAStrategy, що «падає» на барі crash_at (атрибут класу, не стану)."""
+
+    crash_at = None
+
+    def __init__(self):
+        super().__init__(5, 20, 0.0005, 2.0)
+        self.seen = 0
+
+    def on_bar(self, bar):
+        if self.seen == type(self).crash_at:
+            raise Crash
+        self.seen += 1
+        return super().on_bar(bar)
+
+
+def _write_bars(path, size, seed=5):
+    rng = np.random.default_rng(seed)
+    closes = 1.1 + np.cumsum(rng.normal(0, 1e-4, size))
+    with open(path, "w") as f:
+        f.write("time,open,high,low,close\n")
+        for i, c in enumerate(closes):
+            f.write(f"{np.datetime64(i * 60, 's')},{c},{c + 2e-4},{c - 2e-4},{c}\n")
+    return path
+
+
+def _backtester(path, checkpoint=None, every=250):
+    rm = RiskManager(10_000, max_drawdown=0.9, max_trades_per_day=10**9)
+    bt = Backtester(
+        path,
+        CrashingSMA(),
+        rm,
+        close_after_bars=40,
+        use_cache=False,
+        checkpoint_path=checkpoint,
+        checkpoint_every=every,
+    )
+    return bt, rm
+
+
+def _summary(trades):
+    return [[t[k] for k in KEYS] for t in trades]
+
+
+@pytest.mark.parametrize("chunks", [(None, None), (100, 100), (64, None)])
+def test_resume_matches_uninterrupted_run(tmp_path, monkeypatch, chunks):
+    path = _write_bars(tmp_path / "bars.csv", 2_000)
+    checkpoint = tmp_path / "run.ckpt"
+    bt, rm = _backtester(path)
+    expected = _summary(bt.run(chunk_size=chunks[0]))
+    assert len(expected) > 10
+
+    monkeypatch.setattr(CrashingSMA, "crash_at", 1_234)
+    bt, _ = _backtester(path, checkpoint)
+    with pytest.raises(Crash):
+        bt.run(chunk_size=chunks[0])
+    state = load_checkpoint(checkpoint)
+    assert state["index"] == 1_000
+    assert state["strategy"].seen == 1_000
+    assert state["active_orders"]  # знімок з відкритими ордерами
+    # завершені угоди — у порціях журналу, у стані лише хвіст з відкритими
+    assert len(state["journal_chunks"]) > 1
+    assert all(t["status"] == "CLOSED" for t in state["journal"])
+    assert state["trades_tail"][0]["status"] == "OPEN"
+    assert len(state["trades_tail"]) < len(state["journal"])
+
+    monkeypatch.setattr(CrashingSMA, "crash_at", None)
+    resumed, resumed_rm = _backtester(path, checkpoint)
+    trades = resumed.run(chunk_size=chunks[1], resume=True)
+    assert _summary(trades) == expected
+    assert resumed_rm.balance == rm.balance
+    assert resumed.strategy.seen == 2_000
+    assert not resumed.execution.active_orders
+    assert not checkpoint.exists()  # завершений прогін прибирає знімок
+
+
+def test_resume_without_checkpoint_starts_over(tmp_path):
+    path = _write_bars(tmp_path / "bars.csv", 300)
+    bt, _ = _backtester(path)
+    expected = _summary(bt.run())
+    bt, _ = _backtester(path, tmp_path / "missing.ckpt")
+    assert _summary(bt.run(resume=True)) == expected
+
+
+def test_resume_rejects_foreign_checkpoint(tmp_path, monkeypatch):
+    path = _write_bars(tmp_path / "bars.csv", 600)
+    checkpoint = tmp_path / "run.ckpt"
+    monkeypatch.setattr(CrashingSMA, "crash_at", 500)
+    bt, _ = _backtester(path, checkpoint)
+    with pytest.raises(Crash):
+        bt.run()
+
+    other = _write_bars(tmp_path / "other.csv", 600)
+    bt, _ = _backtester(other, checkpoint)
+    with pytest.raises(ValueError):
+        bt.run(resume=True)
+
+
+def test_writer_keeps_latest_snapshot(tmp_path):
+    path = tmp_path / "state.ckpt"
+    with CheckpointWriter(path) as writer:
+        for index in range(50):
+            writer.submit(dump_state({"index": index}))
+    assert load_checkpoint(path)["index"] == 49
+    assert not list(tmp_path.glob("*.tmp"))
+
+    with CheckpointWriter(path, load_checkpoint(path)["journal_chunks"]) as writer:
+        writer.submit(dump_state({"index": 50}), ["a", "b"])
+        writer.submit(dump_state({"index": 51}), ["c"])
+        writer.submit(dump_state({"index": 52}))
+    state = load_checkpoint(path)
+    assert state["index"] == 52
+    assert state["journal"] == ["a", "b", "c"]
+
+    path.write_bytes(pickle.dumps({"version": -1}))
+    assert load_checkpoint(path) is None
+    path.write_bytes(b"garbage")
+    assert load_checkpoint(path) is None
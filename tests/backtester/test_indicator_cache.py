@@ -0,0 +1,119 @@
+# test_indicator_cache.py
+"""
+Тести спільного кешу індикаторів (core.indicator_cache).
+
+Перевіряє, що ряди рахуються один раз на (індикатор, параметри, дані),
+зберігаються лише для читання, витісняються за бюджетом пам'яті,
+а воркери перебору отримують готові ряди через shared_memory.
+"""
+
+import os
+
+import numpy as np
+import pytest
+
+from core import indicator_cache, param_sweep
+from core.backtester_vectorized import VectorizedBacktester
+from core.bar_data import BarSeries
+from core.indicator_cache import IndicatorCache, array_hash, default_cache
+from core.indicators import sma
+from core.param_sweep import ParameterSweep, SharedBars, SharedSeries
+from core.risk_manager import RiskManager
+from strategies.strategy_sma import SMAStrategy
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+
+@pytest.fixture
+def data():
+    return BarSeries.from_csv(os.path.join(PROJECT_ROOT, "data", "data.csv"))
+
+
+@pytest.fixture
+def fresh_cache(monkeypatch):
+    """Окремий спільний кеш процесу на час тесту."""
+    cache = IndicatorCache()
+    monkeypatch.setattr(indicator_cache, "_default_cache", cache)
+    return cache
+
+
+def test_series_computed_once_and_read_only():
+    cache = IndicatorCache()
+    closes = np.linspace(1.0, 2.0, 100)
+    first = cache.sma(closes, 5)
+    second = cache.sma(closes, 5)
+
+    assert first is second
+    assert (cache.hits, cache.misses) == (1, 1)
+    np.testing.assert_array_equal(first, sma(closes, 5))
+    assert not first.flags.writeable
+    with pytest.raises(ValueError):
+        first[0] = 0.0
+
+    # ті самі дані в іншому масиві — той самий ряд
+    assert cache.sma(closes.copy(), 5) is first
+    assert cache.sma(closes + 1.0, 5) is not first
+
+
+def test_dataset_id_is_memoized_per_array():
+    cache = IndicatorCache()
+    closes = np.arange(10.0)
+    dataset = cache.dataset_id(closes)
+    assert dataset == array_hash(closes)
+    assert cache.dataset_id(closes) == dataset
+
+    other = np.arange(10.0)
+    cache.register_dataset(other, "known")
+    assert cache.dataset_id(other) == "known"
+
+
+def test_eviction_is_bounded_by_bytes():
+    closes = np.arange(100.0)  # кожен ряд — 800 байт
+    cache = IndicatorCache(max_bytes=2_000)
+    for period in (2, 3, 4):
+        cache.sma(closes, period)
+    assert len(cache) == 2 and cache.nbytes == 1_600
+    dataset = cache.dataset_id(closes)
+    assert ("sma", (2,), dataset) not in cache
+    assert ("sma", (4,), dataset) in cache
+
+    tiny = IndicatorCache(max_bytes=100)
+    assert len(tiny.sma(closes, 2)) == 100
+    assert len(tiny) == 0 and tiny.nbytes == 0
+
+
+def test_strategies_share_cached_sma(data, fresh_cache):
+    results = []
+    for fast, slow in ((2, 4), (2, 6), (4, 6)):
+        rm = RiskManager(10_000)
+        bt = VectorizedBacktester("", SMAStrategy(fast, slow), rm, 3)
+        results.append([t["profit"] for t in bt.run(data=data)])
+    # періоди 2, 4, 6 — три ряди на шість запитів
+    assert len(fresh_cache) == 3
+    assert (fresh_cache.hits, fresh_cache.misses) == (3, 3)
+
+    uncached = VectorizedBacktester("", SMAStrategy(4, 6), RiskManager(10_000), 3)
+    uncached.indicator_cache = IndicatorCache(max_bytes=0)
+    assert [t["profit"] for t in uncached.run(data=data)] == results[2]
+
+
+def test_worker_receives_shared_series(data, fresh_cache, monkeypatch):
+    for name in ("_worker_shm", "_worker_series_shm", "_worker_data"):
+        monkeypatch.setattr(param_sweep, name, None)
+    sweep = ParameterSweep(data, max_workers=2)
+    series, dataset = sweep._shared_indicators(
+        [{"sma_fast": 2, "sma_slow": 4}, {"sma_fast": 2, "sma_slow": 6}]
+    )
+    assert sorted(key[1] for key in series) == [(2,), (4,), (6,)]
+
+    worker_cache = IndicatorCache()
+    monkeypatch.setattr(indicator_cache, "_default_cache", worker_cache)
+    with SharedBars(data) as shared, SharedSeries(series) as indicators:
+        param_sweep.init_shared_worker(shared.spec, indicators.spec, dataset)
+        worker_data = param_sweep.shared_worker_data()
+        assert default_cache().dataset_id(worker_data.close) == dataset
+        for key, expected in series.items():
+            view = worker_cache.get(key)
+            np.testing.assert_array_equal(view, expected)
+            assert not view.flags.writeable and not view.flags.owndata
+        worker_cache.clear()
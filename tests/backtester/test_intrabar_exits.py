@@ -0,0 +1,118 @@
+# test_intrabar_exits.py
+"""
+Тести внутрішньобарового спрацювання SL/TP (core.intrabar_exits).
+
+Перевіряє перший бар торкання, песимістичний вибір SL при торканні обох
+рівнів, виконання SL за ціною гепу і збіг Backtester.run з векторним режимом.
+"""
+
+import numpy as np
+import pytest
+
+from core.backtester import Backtester
+from core.backtester_vectorized import VectorizedBacktester
+from core.bar_data import BarSeries
+from core.intrabar_exits import (
+    EXIT_END,
+    EXIT_STOP_LOSS,
+    EXIT_TAKE_PROFIT,
+    EXIT_TIME,
+    find_first_touch,
+    schedule_exit,
+)
+from core.risk_manager import RiskManager
+from strategies.strategy_sma import SMAStrategy
+
+
+def _bars(open_, high, low, close):
+    """BarSeries з явних OHLC-списків."""
+    times = np.arange(len(close), dtype=np.int64) * 60
+    return BarSeries(times, open_, high, low, close)
+
+
+@pytest.fixture
+def bars():
+    """Бари: 2 — торкання 103 (TP long), 3 — торкання і 97, і 103, 4 — геп вниз."""
+    return _bars(
+        open_=[100, 100, 101, 100, 95],
+        high=[101, 101, 103, 104, 96],
+        low=[99, 99, 100, 96, 94],
+        close=[100, 100, 102, 100, 95],
+    )
+
+
+def test_take_profit_and_time_exit(bars):
+    """Long з TP 103 закривається на бару 2; без торкання — вихід за часом."""
+    assert schedule_exit(bars, 0, "long", 97.0, 103.0, 10) == (
+        2,
+        103.0,
+        EXIT_TAKE_PROFIT,
+    )
+    assert schedule_exit(bars, 0, "long", 90.0, 110.0, 2) == (2, 102.0, EXIT_TIME)
+    assert schedule_exit(bars, 3, "long", 90.0, 110.0, 5) == (5, 95.0, EXIT_END)
+
+
+def test_both_levels_touched_is_pessimistic(bars):
+    """Бар 3 торкається і SL, і TP — вважається, що спрацював SL."""
+    assert schedule_exit(bars, 2, "long", 97.0, 103.5, 10) == (
+        3,
+        97.0,
+        EXIT_STOP_LOSS,
+    )
+
+
+def test_stop_loss_gap_fills_at_open(bars):
+    """Геп нижче SL виконується за ціною відкриття бару."""
+    assert schedule_exit(bars, 3, "long", 97.0, 110.0, 10) == (
+        4,
+        95.0,
+        EXIT_STOP_LOSS,
+    )
+    # short: TP нижче ціни, торкання low на бару 3
+    assert schedule_exit(bars, 2, "short", 105.0, 96.5, 10)[2] == EXIT_TAKE_PROFIT
+
+
+def test_batch_matches_single_order_search():
+    """Пакетний пошук для тисяч ордерів збігається з пошуком по одному."""
+    rng = np.random.default_rng(5)
+    closes = 100 + np.cumsum(rng.normal(0, 0.2, 3_000))
+    data = _bars(closes, closes + 0.3, closes - 0.3, closes)
+
+    entries = rng.integers(0, 2_990, 2_000)
+    direction = rng.choice([-1, 1], 2_000)
+    stop = closes[entries] * (1 - direction * 0.01)
+    take = closes[entries] * (1 + direction * 0.02)
+    last = np.minimum(entries + 100, len(closes) - 1)
+    index, price, _ = find_first_touch(
+        data.open, data.high, data.low, entries, direction, stop, take, last
+    )
+
+    for k in range(0, 2_000, 97):
+        side = "long" if direction[k] > 0 else "short"
+        expected = schedule_exit(data, entries[k], side, stop[k], take[k], 100)
+        if index[k] >= 0:
+            assert (index[k], price[k]) == expected[:2]
+        else:
+            assert expected[2] in (EXIT_TIME, EXIT_END)
+
+
+def test_vectorized_matches_run_with_intrabar_exits(tmp_path):
+    """З частими торканнями SL/TP векторний режим збігається з Backtester.run."""
+    rng = np.random.default_rng(9)
+    closes = 1.1 + np.cumsum(rng.normal(0, 1e-4, 4_000))
+    data_file = tmp_path / "synthetic.csv"
+    with open(data_file, "w") as f:
+        f.write("time,open,high,low,close\n")
+        for i, c in enumerate(closes):
+            f.write(f"{np.datetime64(i * 60, 's')},{c},{c + 2e-4},{c - 2e-4},{c}\n")
+
+    results = []
+    for cls in (Backtester, VectorizedBacktester):
+        rm = RiskManager(10_000, max_drawdown=0.9, max_trades_per_day=10**9)
+        trades = cls(data_file, SMAStrategy(5, 20, 0.0005, 2.0), rm, 50).run()
+        keys = ("open_index", "size", "exit_price", "exit_reason", "profit")
+        results.append(([[t[k] for k in keys] for t in trades], rm.balance))
+
+    reasons = {trade[3] for trade in results[0][0]}
+    assert {EXIT_STOP_LOSS, EXIT_TAKE_PROFIT} <= reasons
+    assert results[1] == results[0]
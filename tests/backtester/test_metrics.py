@@ -0,0 +1,99 @@
+# test_metrics.py
+"""
+Тести модуля метрик (core.metrics).
+
+Перевіряє векторні метрики на відомих прикладах, побудову кривої балансу
+і exposure з журналу Backtester та збіг інкрементального MetricsTracker
+з векторним розрахунком.
+"""
+
+import numpy as np
+import pytest
+
+from core.backtester import Backtester
+from core.execution import trades_to_array
+from core.metrics import (
+    MetricsTracker,
+    compute_metrics,
+    equity_curve,
+    equity_metrics,
+    exposure,
+    summarize_trades,
+    trade_metrics,
+)
+from core.risk_manager import RiskManager
+from strategies.strategy_sma import SMAStrategy
+
+
+def _trades(profits):
+    return [{"profit": p} for p in profits]
+
+
+def test_trade_metrics():
+    m = trade_metrics(_trades([10.0, -5.0, 20.0, -5.0]))
+    assert m["trades"] == 4 and m["net_profit"] == 20.0
+    assert m["win_rate"] == 0.5 and m["profit_factor"] == 3.0
+    assert m["expectancy"] == 5.0
+    assert m["avg_win"] == 15.0 and m["avg_loss"] == -5.0
+    assert trade_metrics(_trades([1.0]))["profit_factor"] == float("inf")
+    assert trade_metrics([])["win_rate"] == 0.0
+
+
+def test_equity_metrics_drawdown():
+    m = equity_metrics([100, 110, 99, 105, 120, 90, 95])
+    assert m["max_drawdown"] == 30.0
+    assert m["max_drawdown_pct"] == pytest.approx(25.0)
+    assert m["max_drawdown_duration"] == 2
+
+    flat = equity_metrics([100.0] * 5)
+    assert flat["sharpe"] == 0.0 and flat["sortino"] == 0.0
+
+
+def test_summarize_trades_keys():
+    summary = summarize_trades(_trades([10.0, -20.0]), 1_000)
+    assert summary == {
+        "trades": 2,
+        "net_profit": -10.0,
+        "final_balance": 990.0,
+        "win_rate": 0.5,
+        "profit_factor": 0.5,
+        "expectancy": -5.0,
+        "max_drawdown_pct": pytest.approx(20 / 1010 * 100),
+    }
+
+
+def test_equity_curve_and_exposure_from_backtest():
+    rm = RiskManager(10_000)
+    bt = Backtester("test_backtester_sma_data.csv", SMAStrategy(2, 3), rm)
+    trades = bt.run()
+    n_bars = len(bt.load_data())
+    assert all(t["exit_index"] > t["open_index"] for t in trades)
+
+    curve = equity_curve(trades, n_bars, rm.start_balance)
+    assert len(curve) == n_bars and curve[-1] == pytest.approx(rm.balance)
+
+    held = np.zeros(n_bars, dtype=bool)
+    for t in trades:
+        held[t["open_index"] + 1 : min(t["exit_index"], n_bars - 1) + 1] = True
+    assert exposure(trades, n_bars) == held.mean()
+
+    metrics = compute_metrics(trades_to_array(trades), rm.start_balance, n_bars)
+    assert metrics["final_balance"] == pytest.approx(rm.balance)
+    assert metrics["exposure"] == held.mean()
+
+
+def test_tracker_matches_vectorized():
+    rng = np.random.default_rng(3)
+    equity = 10_000 * np.cumprod(1 + rng.normal(2e-4, 5e-3, 2_000))
+    in_market = rng.random(2_000) < 0.4
+    profits = rng.normal(5, 40, 300)
+
+    tracker = MetricsTracker()
+    for profit in profits:
+        tracker.add_trade(profit)
+    for balance, held in zip(equity, in_market):
+        tracker.update(balance, held)
+
+    expected = {**trade_metrics(_trades(profits)), **equity_metrics(equity)}
+    expected["exposure"] = in_market.mean()
+    assert tracker.metrics() == pytest.approx(expected, rel=1e-9)
@@ -0,0 +1,98 @@
+# test_monte_carlo.py
+"""
+Тести Monte Carlo аналізу угод (core.monte_carlo).
+
+Порівнює пакетний розрахунок з покроковою моделлю балансу RiskManager
+на кожному шляху, перевіряє руїну і роботу з журналом Backtester.run.
+"""
+
+import os
+
+import numpy as np
+import pytest
+
+import core.monte_carlo as mc
+from core.backtester import Backtester
+from core.risk_manager import RiskManager
+from strategies.strategy_sma import SMAStrategy
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+
+def _reference_path(r, start, risk, max_drawdown):
+    """Покрокова модель: позиція — risk від балансу, стоп на межі просадки."""
+    balance = peak = start
+    worst = 0.0
+    for value in r:
+        balance *= 1 + risk * value
+        peak = max(peak, balance)
+        worst = max(worst, 1 - balance / peak)
+        if balance < start * (1 - max_drawdown):
+            return balance, worst * 100, True
+    return balance, worst * 100, False
+
+
+def test_r_multiples():
+    trades = [
+        {"price": 100.0, "stop_loss": 99.0, "size": 10.0, "profit": 20.0},
+        {"price": 100.0, "stop_loss": 102.0, "size": 5.0, "profit": -10.0},
+        {"price": 100.0, "stop_loss": 99.0, "size": 10.0},  # ще відкрита
+    ]
+    assert mc.r_multiples(trades).tolist() == [2.0, -1.0]
+
+
+def test_shuffle_keeps_final_balance(monkeypatch):
+    monkeypatch.setattr(mc, "BATCH_ELEMENTS", 1_000)  # кілька пакетів
+    r = np.array([2.0, -1.0, -1.0, 1.5, -1.0, 2.0] * 20)
+    result = mc.simulate(r, 300, "shuffle", 10_000, 0.01, 0.5, seed=1)
+    expected = 10_000 * np.prod(1 + 0.01 * r)
+    assert result.final_balance == pytest.approx(np.full(300, expected))
+    assert not result.ruined.any()
+    assert result.max_drawdown_pct.min() > 0
+
+
+@pytest.mark.parametrize("method", ["bootstrap", "shuffle"])
+def test_batched_paths_match_reference(monkeypatch, method):
+    monkeypatch.setattr(mc, "BATCH_ELEMENTS", 2_000)
+    r = np.random.default_rng(4).choice([-1.0, 2.0], 200, p=[0.6, 0.4])
+    result = mc.simulate(r, 50, method, 10_000, 0.05, 0.3, seed=7)
+
+    # ті самі шляхи, що й у simulate (та сама послідовність генератора)
+    rng = np.random.default_rng(7)
+    log_growth = np.log1p(0.05 * r)
+    batch = mc.BATCH_ELEMENTS // len(r)
+    paths = []
+    for start in range(0, 50, batch):
+        rows = min(batch, 50 - start)
+        sampled = mc._sample_paths(rng, log_growth, rows, method)
+        paths.extend(np.expm1(sampled) / 0.05)
+
+    for k, path in enumerate(paths):
+        final, drawdown, ruined = _reference_path(path, 10_000, 0.05, 0.3)
+        assert result.final_balance[k] == pytest.approx(final)
+        assert result.max_drawdown_pct[k] == pytest.approx(drawdown)
+        assert result.ruined[k] == ruined
+    assert 0 < result.risk_of_ruin < 1
+
+
+def test_ruin_stops_trading():
+    """Після пробиття межі просадки угоди не відкриваються."""
+    result = mc.simulate([-1.0] * 10, 4, "shuffle", 1_000, 0.1, 0.2, seed=0)
+    # 1000 -> 900 -> 810 -> 729 < 800: руїна на третій угоді
+    assert result.ruined.all()
+    assert result.final_balance == pytest.approx([729.0] * 4)
+    assert result.max_drawdown_pct == pytest.approx([27.1] * 4)
+    assert result.risk_of_ruin == 1.0
+    assert result.summary()["simulations"] == 4
+    assert set(result.percentiles()) == {"final_balance", "max_drawdown_pct"}
+
+
+def test_monte_carlo_from_backtest():
+    data_file = os.path.join(PROJECT_ROOT, "data", "test_backtester_sma_data.csv")
+    rm = RiskManager(10_000)
+    trades = Backtester(data_file, SMAStrategy(2, 3), rm).run()
+    result = mc.monte_carlo(trades, rm, simulations=500, seed=3)
+    assert result.simulations == 500
+    assert result.start_balance == 10_000
+    assert result.ruin_balance == pytest.approx(8_000)
+    assert np.isfinite(result.final_balance).all()
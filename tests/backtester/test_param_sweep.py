@@ -0,0 +1,64 @@
+# test_param_sweep.py
+"""
+Тести паралельного перебору параметрів (core.param_sweep).
+
+Перевіряє генерацію наборів, передачу цін через shared_memory
+і те, що паралельний прогін дає той самий рейтинг, що й послідовний.
+"""
+
+import os
+
+import numpy as np
+import pytest
+
+from core.bar_data import BarSeries
+from core.param_sweep import (
+    ParameterSweep,
+    SharedBars,
+    attach_bars,
+    format_table,
+    grid_params,
+    random_params,
+)
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+
+@pytest.fixture(scope="module")
+def data():
+    """Тестові ціни для перебору."""
+    return BarSeries.from_csv(os.path.join(PROJECT_ROOT, "data", "data.csv"))
+
+
+def test_grid_and_random_params():
+    """Grid дає декартів добуток без наборів з sma_fast >= sma_slow."""
+    grid = grid_params({"sma_fast": [2, 5], "sma_slow": [5, 8], "rr_ratio": [1, 2]})
+    assert len(grid) == 6
+    assert all(p["sma_fast"] < p["sma_slow"] for p in grid)
+
+    sampled = random_params({"sma_fast": (2, 4), "sl_coef": (0.005, 0.02)}, 10, 1)
+    assert len(sampled) == 10
+    assert all(2 <= p["sma_fast"] <= 4 for p in sampled)
+    assert sampled == random_params(
+        {"sma_fast": (2, 4), "sl_coef": (0.005, 0.02)}, 10, 1
+    )
+
+
+def test_shared_bars_roundtrip(data):
+    """Колонки в shared_memory збігаються з оригіналом."""
+    with SharedBars(data) as shared:
+        view = attach_bars(shared._shm, shared.spec[1])
+        np.testing.assert_array_equal(view.close, data.close)
+        np.testing.assert_array_equal(view.time, data.time)
+
+
+def test_parallel_matches_serial(data):
+    """Процесний пул повертає ті самі метрики і порядок, що й послідовний режим."""
+    space = {"sma_fast": [2, 3], "sma_slow": [4, 6], "sl_coef": [0.01, 0.02]}
+    serial = ParameterSweep(data, max_workers=1).grid(space)
+    parallel = ParameterSweep(data, max_workers=2).grid(space)
+
+    assert len(serial) == 8
+    assert parallel == serial
+    assert serial[0]["net_profit"] >= serial[-1]["net_profit"]
+    assert "net_profit" in format_table(serial, limit=3)
@@ -0,0 +1,99 @@
+# test_portfolio_backtester.py
+"""
+Тести портфельного бек-тесту (core.portfolio_backtester).
+
+Перевіряє злиття подій за часом, збіг одного символу з Backtester.run
+і спільний баланс RiskManager для кількох символів.
+"""
+
+import os
+
+import numpy as np
+
+from core.backtester import Backtester
+from core.bar_data import BarSeries
+from core.portfolio_backtester import PortfolioBacktester, merge_events
+from core.risk_manager import RiskManager
+from strategies.strategy_sma import SMAStrategy
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+RM_KWARGS = {"max_drawdown": 0.9, "max_trades_per_day": 10**9}
+
+
+def _series(seed, size=2_000, shift=0):
+    """Синтетичний ряд хвилинних барів із заданим зсувом часу."""
+    rng = np.random.default_rng(seed)
+    closes = 1.1 + np.cumsum(rng.normal(0, 1e-4, size))
+    times = np.arange(size, dtype=np.int64) * 60 + shift
+    return BarSeries(times, closes, closes + 1e-4, closes - 1e-4, closes)
+
+
+def test_merge_events_is_time_ordered():
+    """Події всіх символів ідуть за часом і покривають кожен бар."""
+    series = [_series(1, 500), _series(2, 300, shift=30)]
+    events = list(merge_events(series))
+
+    assert len(events) == 800
+    assert [e[0] for e in events] == sorted(e[0] for e in events)
+    assert sum(1 for e in events if e[1] == 1) == 300
+
+
+def test_single_symbol_matches_backtester():
+    """Портфель з одного символу дає ті самі угоди, що й Backtester.run."""
+    data_file = os.path.join(PROJECT_ROOT, "data", "test_backtester_sma_data.csv")
+
+    rm_single = RiskManager(balance=10_000, **RM_KWARGS)
+    single = Backtester(data_file, SMAStrategy(3, 5), rm_single).run()
+
+    rm_portfolio = RiskManager(balance=10_000, **RM_KWARGS)
+    portfolio = PortfolioBacktester(
+        {"TEST": data_file}, lambda symbol: SMAStrategy(3, 5), rm_portfolio
+    ).run()
+
+    keys = ("side", "price", "size", "open_index", "profit")
+    assert [[t[k] for k in keys] for t in portfolio] == [
+        [t[k] for k in keys] for t in single
+    ]
+    assert rm_portfolio.balance == rm_single.balance
+
+
+def test_symbols_share_one_balance():
+    """Угоди всіх символів змінюють один спільний баланс."""
+    data = {"EURUSD": _series(3), "GBPUSD": _series(4, shift=15)}
+    rm = RiskManager(balance=10_000, **RM_KWARGS)
+    bt = PortfolioBacktester(
+        {s: "" for s in data}, {s: SMAStrategy(5, 20) for s in data}, rm
+    )
+    trades = bt.run(data)
+
+    assert {t["symbol"] for t in trades} == {"EURUSD", "GBPUSD"}
+    assert all(t["status"] == "CLOSED" for t in trades)
+    assert abs(rm.balance - 10_000 - sum(t["profit"] for t in trades)) < 1e-6
+
+
+def test_open_positions_close_in_exit_time_order():
+    """Залишені на кінець ордери закриваються за часом виходу, а не за символом."""
+    data = {"GBPUSD": _series(4, size=500), "EURUSD": _series(3, size=300)}
+    rm = RiskManager(balance=10_000, **RM_KWARGS)
+    bt = PortfolioBacktester(
+        {s: "" for s in data},
+        {s: SMAStrategy(5, 20) for s in data},
+        rm,
+        close_after_bars=10**6,
+        intrabar_exits=False,
+    )
+    closed = []
+    close_order = bt.execution.close_order
+
+    def record(order_id, exit_price):
+        closed.append(bt.execution.active_orders[order_id]["symbol"])
+        return close_order(order_id, exit_price=exit_price)
+
+    bt.execution.close_order = record
+    trades = bt.run(data)
+
+    assert len(closed) == len(trades)
+    # EURUSD закінчується раніше — його ордери закриваються першими
+    count = sum(1 for symbol in closed if symbol == "EURUSD")
+    assert 0 < count < len(closed)
+    assert closed == ["EURUSD"] * count + ["GBPUSD"] * (len(closed) - count)
@@ -0,0 +1,106 @@
+# test_profiling.py
+"""
+Тести профілювання Backtester по фазах (core.profiling).
+
+Перевіряє, що фази отримують виклики, затримка пишеться для кожного бару,
+профілювання не змінює результату прогону, а після run() усі підміни
+знято.
+"""
+
+import json
+import pstats
+
+import numpy as np
+import pytest
+
+from core.backtester import Backtester
+from core.profiling import PHASES, RunProfiler
+from core.risk_manager import RiskManager
+from strategies.strategy_sma import SMAStrategy
+
+KEYS = ("open_index", "exit_index", "size", "exit_price", "exit_reason", "profit")
+BARS = 600
+
+
+@pytest.fixture
+def data_file(tmp_path):
+    rng = np.random.default_rng(11)
+    closes = 1.1 + np.cumsum(rng.normal(0, 1e-4, BARS))
+    path = tmp_path / "bars.csv"
+    with open(path, "w") as f:
+        f.write("time,open,high,low,close\n")
+        for i, c in enumerate(closes):
+            f.write(f"{np.datetime64(i * 60, 's')},{c},{c + 2e-4},{c - 2e-4},{c}\n")
+    return path
+
+
+def _backtester(path, profiler=None):
+    rm = RiskManager(10_000, max_drawdown=0.9, max_trades_per_day=10**9)
+    return Backtester(
+        path,
+        SMAStrategy(5, 20, 0.0005, 2.0),
+        rm,
+        close_after_bars=40,
+        use_cache=False,
+        profiler=profiler,
+    )
+
+
+@pytest.mark.parametrize("chunk_size", [None, 128])
+def test_phases_and_bar_latency(data_file, chunk_size):
+    bt = _backtester(data_file, profiler=True)
+    trades = bt.run(chunk_size=chunk_size)
+    stats = bt.profiler.stats
+
+    assert trades
+    assert stats.bars == BARS
+    assert len(stats.bar_latency) == BARS
+    assert 0 <= stats.latency(50) <= stats.latency(99)
+    assert set(stats.phases) == set(PHASES)
+    assert stats.phases["load"].calls >= 1
+    assert stats.phases["signal"].calls == BARS
+    assert stats.phases["engine"].calls == BARS
+    assert stats.phases["execution"].calls >= len(trades)
+    assert stats.phases["risk"].calls >= len(trades)
+    # ексклюзивні часи фаз не перевищують загального часу прогону
+    assert sum(p.wall for p in stats.phases.values()) <= stats.wall * 1.01
+    assert "engine" in stats.summary()
+
+
+def test_profiler_does_not_change_result(data_file):
+    plain = _backtester(data_file).run()
+    profiled = _backtester(data_file, profiler=True).run()
+    assert [[t[k] for k in KEYS] for t in plain] == [
+        [t[k] for k in KEYS] for t in profiled
+    ]
+
+
+def test_patches_removed_after_run(data_file):
+    bt = _backtester(data_file, profiler=True)
+    bt.run()
+    for obj in (bt, bt.execution, bt.risk_manager):
+        assert not {"load_data", "_process_bar"} & set(vars(obj))
+        assert not {"submit_order", "close_order", "validate_order"} & set(vars(obj))
+
+
+def test_json_and_cprofile_dumps(data_file, tmp_path):
+    json_path = tmp_path / "profile.json"
+    prof_path = tmp_path / "run.prof"
+    bt = _backtester(
+        data_file, profiler=RunProfiler(json_path=json_path, cprofile_path=prof_path)
+    )
+    bt.run()
+
+    report = json.loads(json_path.read_text(encoding="utf-8"))
+    assert report["bars"] == BARS
+    assert report["bar_latency"]["p50"] <= report["bar_latency"]["p99"]
+    assert set(report["phases"]) == set(PHASES)
+    functions = {name for _, _, name in pstats.Stats(str(prof_path)).stats}
+    assert "_process_bar" in functions
+
+
+def test_no_profiler_by_default(data_file):
+    bt = _backtester(data_file)
+    assert bt.profiler is None
+    bt.run()
+    assert "_process_bar" not in vars(bt)
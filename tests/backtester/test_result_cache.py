@@ -0,0 +1,129 @@
+# test_result_cache.py
+"""
+Тести постійного кешу результатів (core.result_cache).
+
+Перевіряє складові ключа, LRU-витіснення, повторний прогін Backtester
+і ParameterSweep з кешу без перерахунку.
+"""
+
+import os
+import shutil
+
+import pytest
+
+import core.param_sweep as param_sweep
+from core.backtester import Backtester
+from core.backtester_vectorized import VectorizedBacktester
+from core.bar_data import BarSeries
+from core.result_cache import (
+    ResultCache,
+    data_hash,
+    result_key,
+    risk_fingerprint,
+    strategy_fingerprint,
+)
+from core.risk_manager import RiskManager
+from strategies.strategy_sma import SMAStrategy
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+DATA_FILE = os.path.join(PROJECT_ROOT, "data", "test_backtester_sma_data.csv")
+
+
+@pytest.fixture
+def cache(tmp_path):
+    with ResultCache(tmp_path / "results.sqlite") as store:
+        yield store
+
+
+def _key(strategy, rm, data=DATA_FILE, **engine):
+    return result_key(
+        data_hash(data), strategy_fingerprint(strategy), risk_fingerprint(rm), engine
+    )
+
+
+def test_key_depends_on_every_component(tmp_path):
+    base = _key(SMAStrategy(3, 5), RiskManager(10_000))
+    assert base == _key(SMAStrategy(3, 5), RiskManager(10_000))
+    assert base != _key(SMAStrategy(3, 8), RiskManager(10_000))
+    assert base != _key(SMAStrategy(3, 5), RiskManager(10_000, risk_per_trade=0.02))
+    assert base != _key(SMAStrategy(3, 5), RiskManager(10_000), close_after_bars=5)
+
+    changed = tmp_path / "bars.csv"
+    shutil.copy(DATA_FILE, changed)
+    assert base == _key(SMAStrategy(3, 5), RiskManager(10_000), data=changed)
+    changed.write_text(changed.read_text().replace("1.1010", "1.1011", 1))
+    assert base != _key(SMAStrategy(3, 5), RiskManager(10_000), data=changed)
+
+    series = BarSeries.from_csv(DATA_FILE)
+    assert data_hash(series) == data_hash(series.window(0, None))
+    assert data_hash(series) != data_hash(series.window(1, None))
+
+
+def test_key_depends_on_private_strategy_state(cache):
+    data = BarSeries.from_csv(DATA_FILE)
+    cold = _key(SMAStrategy(3, 5), RiskManager(10_000))
+    warm = SMAStrategy(3, 5)
+    warm.on_bar(data[0])  # лише ковзні вікна, публічний стан ще None
+    assert warm.prev_fast is None
+    assert _key(warm, RiskManager(10_000)) != cold
+
+    class Unpicklable(SMAStrategy):
+        def __init__(self):
+            super().__init__(3, 5)
+            self.hook = lambda bar: None
+
+    assert strategy_fingerprint(Unpicklable()) is None
+    bt = Backtester(DATA_FILE, Unpicklable(), RiskManager(10_000), result_cache=cache)
+    assert bt.run() and len(cache) == 0
+
+
+def test_lru_eviction(cache):
+    cache.max_entries = 3
+    for name in "abc":
+        cache.put(name, [{"id": name}])
+    assert cache.get("a") is not None  # "a" стає найсвіжішим
+    cache.put("d", [])
+    assert "b" not in cache
+    assert {"a", "c", "d"} == {k for k in "abcd" if k in cache}
+
+    cache.max_entries = 100
+    cache.max_bytes = cache.total_bytes  # місця лише на поточні записи
+    cache.put("e", [{"payload": "x" * 1000}])
+    assert "e" in cache and "c" not in cache  # "c" читали найдавніше
+    assert cache.total_bytes <= cache.max_bytes
+
+
+@pytest.mark.parametrize("backtester", [Backtester, VectorizedBacktester])
+def test_backtester_second_run_comes_from_cache(cache, monkeypatch, backtester):
+    def run():
+        rm = RiskManager(10_000)
+        bt = backtester(DATA_FILE, SMAStrategy(2, 3), rm, result_cache=cache)
+        return bt.run(), rm
+
+    first, first_rm = run()
+    assert len(cache) == 1
+    monkeypatch.setattr(backtester, "load_data", lambda self: pytest.fail("cache miss"))
+    second, second_rm = run()
+    assert second == first
+    assert second_rm.balance == first_rm.balance
+    assert second_rm.trades_today == first_rm.trades_today
+    assert second_rm.last_trade_date == first_rm.last_trade_date
+
+
+def test_sweep_computes_only_misses(cache, monkeypatch):
+    data = BarSeries.from_csv(DATA_FILE)
+    sweep = param_sweep.ParameterSweep(data, max_workers=1, result_cache=cache)
+    first = sweep.grid({"sma_fast": [2, 3], "sma_slow": [5, 8]})
+    assert len(cache) == 4
+
+    evaluated = []
+    original = param_sweep.evaluate_params
+
+    def counting(data, params, *args):
+        evaluated.append(params)
+        return original(data, params, *args)
+
+    monkeypatch.setattr(param_sweep, "evaluate_params", counting)
+    second = sweep.grid({"sma_fast": [2, 3, 4], "sma_slow": [5, 8]})
+    assert evaluated == [{"sma_fast": 4, "sma_slow": 5}, {"sma_fast": 4, "sma_slow": 8}]
+    assert [r for r in second if r["sma_fast"] != 4] == first
@@ -0,0 +1,87 @@
+# test_signal_batch.py
+"""
+Тести пакетного обчислення сигналів (core.signal_batch).
+
+Перевіряє, що матриці SMA і сигналів рядок за рядком збігаються
+з покроковими sma / sma_cross_signals, а пакетний перебір дає ті самі
+метрики, що й окремі прогони.
+"""
+
+import os
+
+import numpy as np
+import pytest
+
+from core.backtester_vectorized import VectorizedBacktester, sma_cross_signals
+from core.bar_data import BarSeries
+from core.indicator_cache import IndicatorCache
+from core.indicators import sma
+from core.param_sweep import evaluate_batch, evaluate_params, grid_params
+from core.risk_manager import RiskManager
+from core.signal_batch import sma_cross_matrix, sma_matrix
+from strategies.strategy_sma import SMAStrategy
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+
+@pytest.fixture
+def closes():
+    rng = np.random.default_rng(8)
+    return 1.1 + np.cumsum(rng.normal(0, 1e-4, 3_000))
+
+
+def test_sma_matrix_rows_match_sma(closes):
+    windows, matrix = sma_matrix(closes, [8, 3, 8, 50])
+    assert windows.tolist() == [3, 8, 50]
+    for row, window in enumerate(windows):
+        np.testing.assert_array_equal(matrix[row], sma(closes, window))
+    with pytest.raises(ValueError):
+        sma_matrix(closes, [0, 3])
+
+
+@pytest.mark.parametrize("max_bytes", [1, 10**9])
+def test_cross_matrix_matches_per_pair_signals(closes, max_bytes):
+    pairs = [(f, s) for f in range(1, 10) for s in range(2, 25) if f != s]
+    signals = sma_cross_matrix(closes, pairs, max_bytes=max_bytes)
+    assert signals.shape == (len(pairs), len(closes))
+    assert signals.dtype == np.int8
+    for row, (fast, slow) in zip(signals, pairs):
+        np.testing.assert_array_equal(row, sma_cross_signals(closes, fast, slow))
+    assert np.abs(signals).sum() > 0
+
+
+def test_cross_matrix_uses_cache(closes):
+    cache = IndicatorCache()
+    first = sma_cross_matrix(closes, [(2, 5), (3, 5)], cache)
+    assert len(cache) == 3 and cache.misses == 3
+    second = sma_cross_matrix(closes, [(2, 5), (3, 5)], cache)
+    np.testing.assert_array_equal(first, second)
+    assert cache.hits == 3
+
+
+def test_short_series():
+    assert not sma_cross_matrix([1.0, 2.0, 3.0], [(2, 5)]).any()
+    assert sma_cross_matrix([], [(2, 5)]).shape == (1, 0)
+
+
+def test_backtester_accepts_precomputed_signals():
+    data = BarSeries.from_csv(os.path.join(PROJECT_ROOT, "data", "data.csv"))
+    row = sma_cross_matrix(data.close, [(2, 4)])[0]
+    runs = []
+    for signals in (None, row):
+        bt = VectorizedBacktester("", SMAStrategy(2, 4), RiskManager(10_000), 3)
+        runs.append(
+            [(t["side"], t["profit"]) for t in bt.run(data=data, signals=signals)]
+        )
+    assert runs[0] == runs[1]
+
+    bt = VectorizedBacktester("", SMAStrategy(2, 4), RiskManager(10_000), 3)
+    with pytest.raises(ValueError):
+        bt.run(data=data, signals=row[:-1])
+
+
+def test_evaluate_batch_matches_single_runs():
+    data = BarSeries.from_csv(os.path.join(PROJECT_ROOT, "data", "data.csv"))
+    param_list = grid_params({"sma_fast": [2, 3, 4], "sma_slow": [4, 6, 8]})
+    expected = [evaluate_params(data, params) for params in param_list]
+    assert evaluate_batch(data, param_list) == expected
@@ -0,0 +1,158 @@
+# test_tick_replay.py
+"""
+Тести подієвого тікового бек-тесту (core.tick_replay).
+
+Перевіряє читання тіків порціями, виходи по SL/TP і за часом,
+порядок подій (таймери, затримка ордерів) і незалежність результату
+від розміру порції.
+"""
+
+import numpy as np
+import pytest
+
+from core.intrabar_exits import EXIT_END, EXIT_STOP_LOSS, EXIT_TAKE_PROFIT, EXIT_TIME
+from core.risk_manager import RiskManager
+from core.tick_replay import TickReplay, _ExitBook, iter_tick_chunks
+from strategies.strategy_sma import SMAStrategy
+
+
+class ScriptedStrategy:
+    """Видає задані сигнали на тіках з номерами з script."""
+
+    def __init__(self, script):
+        self.script = script
+        self.seen = []
+
+    def on_tick(self, tick):
+        self.seen.append(tick.time)
+        return self.script.get(len(self.seen) - 1)
+
+
+def _write_ticks(path, prices, step_ms=1000):
+    with open(path, "w") as f:
+        f.write("time,price,volume\n")
+        for i, price in enumerate(prices):
+            f.write(f"{np.datetime64(i * step_ms, 'ms')},{price},1\n")
+    return path
+
+
+def _risk():
+    return RiskManager(10_000, max_drawdown=0.9, max_trades_per_day=10**9)
+
+
+def test_iter_tick_chunks_streams_csv_and_npy(tmp_path):
+    """CSV і .npy читаються порціями заданого розміру."""
+    path = _write_ticks(tmp_path / "ticks.csv", [1.0, 2.0, 3.0, 4.0, 5.0])
+    chunks = list(iter_tick_chunks(path, chunk_size=2))
+    assert [len(c[0]) for c in chunks] == [2, 2, 1]
+    assert np.concatenate([c[0] for c in chunks]).tolist() == [
+        0,
+        1000,
+        2000,
+        3000,
+        4000,
+    ]
+
+    records = np.zeros(5, dtype=[("time", "i8"), ("price", "f8")])
+    records["time"] = np.arange(5) * 10
+    records["price"] = np.arange(5.0)
+    np.save(tmp_path / "ticks.npy", records)
+    chunks = list(iter_tick_chunks(tmp_path / "ticks.npy", chunk_size=3))
+    assert [c[1].tolist() for c in chunks] == [[0.0, 1.0, 2.0], [3.0, 4.0]]
+    assert chunks[0][2].tolist() == [0.0, 0.0, 0.0]
+
+
+@pytest.mark.parametrize(
+    "prices, reason, exit_price",
+    [
+        ([100, 100.5, 99.2, 98.9, 99.0], EXIT_STOP_LOSS, 98.9),
+        ([100, 101, 102.5, 101, 100], EXIT_TAKE_PROFIT, 102.5),
+        ([100, 100.5, 100.2, 100.1, 100.3], EXIT_END, 100.3),
+    ],
+)
+def test_stop_and_take_profit_fill_at_tick_price(tmp_path, prices, reason, exit_price):
+    path = _write_ticks(tmp_path / "ticks.csv", prices)
+    strategy = ScriptedStrategy({0: ("long", 99.0, 102.0)})
+    trades = TickReplay(path, strategy, _risk()).run()
+
+    assert len(trades) == 1
+    assert trades[0]["exit_reason"] == reason
+    assert trades[0]["exit_price"] == exit_price
+    assert trades[0]["open_time"] == 0
+
+
+def test_hold_latency_and_timers(tmp_path):
+    """Ордер виконується із затримкою, закривається таймером утримання."""
+    path = _write_ticks(tmp_path / "ticks.csv", [100, 101, 102, 103, 104, 105])
+    strategy = ScriptedStrategy({0: ("short", 110.0, 90.0)})
+    replay = TickReplay(path, strategy, _risk(), hold_ms=2000, latency_ms=1500)
+    fired = []
+    replay.add_timer(0, fired.append, interval=2000)
+    trades = replay.run()
+
+    order = trades[0]
+    assert order["open_time"] == 1500 and order["price"] == 101
+    assert order["close_time"] == 3500 and order["exit_reason"] == EXIT_TIME
+    assert order["exit_price"] == 103
+    assert fired == [0, 2000, 4000]
+
+
+def test_result_does_not_depend_on_chunk_size(tmp_path):
+    """Потоковий прогін малими порціями дає ті самі угоди, що й одною."""
+    rng = np.random.default_rng(3)
+    prices = 1.1 + np.cumsum(rng.normal(0, 1e-4, 3_000))
+    path = _write_ticks(tmp_path / "ticks.csv", prices.round(6))
+
+    results = []
+    for chunk_size in (3_000, 97):
+        replay = TickReplay(
+            path,
+            SMAStrategy(5, 20, 0.0005, 2.0),
+            _risk(),
+            hold_ms=60_000,
+            bar_ms=5_000,
+            chunk_size=chunk_size,
+        )
+        trades = replay.run()
+        keys = ("open_time", "close_time", "price", "exit_price", "profit")
+        results.append([[t[k] for k in keys] for t in trades])
+
+    assert len(results[0]) > 5
+    assert results[0] == results[1]
+
+
+def test_multi_symbol_ticks_are_merged_by_time(tmp_path):
+    """Тіки кількох символів надходять стратегіям у порядку часу."""
+    a = _write_ticks(tmp_path / "a.csv", [1, 2, 3], step_ms=1000)
+    b = _write_ticks(tmp_path / "b.csv", [1, 2, 3, 4], step_ms=700)
+    order = []
+
+    class Recorder:
+        def __init__(self, symbol):
+            self.symbol = symbol
+
+        def on_tick(self, tick):
+            order.append((tick.time, tick.symbol))
+
+    TickReplay({"A": a, "B": b}, Recorder, _risk(), chunk_size=2).run()
+    assert order == sorted(order)
+    assert len(order) == 7
+
+
+def test_exit_book_compacts_closed_orders():
+    """Записи закритих ордерів не накопичуються в купах _ExitBook."""
+    book = _ExitBook()
+    for seq in range(1_000):
+        order = {"side": "long", "stop_loss": 0.5, "take_profit": 1.5}
+        order["status"] = "OPEN"
+        book.add(order, seq)
+        # TP закриває ордер, запис SL лишається застарілим
+        for hit, _ in book.triggered(1.5):
+            hit["status"] = "CLOSED"
+            book.discard(hit)
+    assert len(book.long_take) == 0
+    assert len(book.long_stop) <= 64 + 1
+
+    live = {"side": "long", "stop_loss": 0.9, "take_profit": 1.5, "status": "OPEN"}
+    book.add(live, 1_000)
+    assert [order for order, _ in book.triggered(0.8)] == [live]
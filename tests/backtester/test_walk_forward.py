@@ -0,0 +1,63 @@
+# test_walk_forward.py
+"""
+Тести walk-forward оптимізації (core.walk_forward).
+
+Перевіряє геометрію вікон, склеювання out-of-sample кривої балансу
+і збіг паралельного прогону з послідовним.
+"""
+
+import numpy as np
+import pytest
+
+from core.bar_data import BarSeries
+from core.param_sweep import grid_params
+from core.walk_forward import WalkForward, walk_forward_windows
+
+
+@pytest.fixture(scope="module")
+def data():
+    """Синтетичний ряд на 3000 барів (випадкове блукання)."""
+    rng = np.random.default_rng(11)
+    closes = 1.1 + np.cumsum(rng.normal(0, 1e-4, 3_000))
+    times = np.arange(len(closes), dtype=np.int64) * 60
+    return BarSeries(times, closes, closes + 1e-4, closes - 1e-4, closes)
+
+
+def test_windows_geometry():
+    """Ковзні вікна не перекриваються по OOS, anchored стартують з нуля."""
+    windows = walk_forward_windows(100, in_sample=40, out_sample=20)
+    assert windows == [(0, 40, 40, 60), (20, 60, 60, 80), (40, 80, 80, 100)]
+
+    anchored = walk_forward_windows(100, 40, 30, anchored=True)
+    assert [w[0] for w in anchored] == [0, 0]
+    assert anchored[-1][3] == 100
+
+
+def test_walk_forward_parallel_matches_serial(data):
+    """Паралельні вікна дають ті самі параметри і криву, що й послідовні."""
+    params = grid_params({"sma_fast": [3, 5], "sma_slow": [10, 20]})
+    base = {"max_trades_per_day": 10**9, "max_drawdown": 0.9}
+
+    serial = WalkForward(data, 1000, 500, base=base, max_workers=1).run(params)
+    parallel = WalkForward(data, 1000, 500, base=base, max_workers=2).run(params)
+
+    assert len(serial.windows) == 4
+    assert [w.params for w in parallel.windows] == [w.params for w in serial.windows]
+    np.testing.assert_array_equal(parallel.equity, serial.equity)
+
+
+def test_stitched_equity_chains_windows(data):
+    """Склеєна крива продовжує кожне вікно з балансу попереднього."""
+    params = grid_params({"sma_fast": [3], "sma_slow": [10]})
+    base = {"max_trades_per_day": 10**9, "max_drawdown": 0.9}
+    result = WalkForward(data, 1000, 500, base=base, max_workers=1).run(params)
+
+    expected = result.start_balance
+    for window in result.windows:
+        if len(window.equity):
+            expected *= window.equity[-1]
+        assert window.out_sample[0] == window.in_sample[1]
+    assert result.final_balance == pytest.approx(expected)
+    assert len(result.equity) == sum(
+        w.out_sample_metrics["trades"] for w in result.windows
+    )
@@ -0,0 +1,71 @@
+# test_bar_cache.py
+"""
+Тести бінарного кешу CSV (core.bar_cache).
+
+Перевіряє створення кешу при першому завантаженні, читання через mmap
+без копіювання, перебудову застарілого кешу і режим без кешу.
+"""
+
+import os
+import shutil
+
+import numpy as np
+import pytest
+
+from core.bar_cache import cache_paths, load_cached_bars, open_cache
+from core.bar_data import BAR_FIELDS, BarSeries
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / "bars.csv"
+    shutil.copy(
+        os.path.join(PROJECT_ROOT, "data", "test_backtester_sma_data.csv"), path
+    )
+    return path
+
+
+def _columns(series):
+    return [getattr(series, name).tolist() for name in BAR_FIELDS]
+
+
+def test_first_load_writes_cache_and_second_maps_it(csv_path):
+    data_path, meta_path = cache_paths(csv_path)
+    first = load_cached_bars(csv_path)
+    assert data_path.exists() and meta_path.exists()
+    assert _columns(first) == _columns(BarSeries.from_csv(csv_path))
+
+    cached = open_cache(csv_path)
+    assert cached is not None
+    assert _columns(cached) == _columns(first)
+    # колонки — представлення mmap-файлу, без копій
+    assert isinstance(cached.close.base, np.memmap)
+    assert isinstance(cached.time.base, np.memmap)
+    assert not cached.close.flags.writeable
+    assert cached[0]["time"] == first[0]["time"]
+
+
+def test_touched_file_keeps_cache_changed_file_rebuilds(csv_path):
+    load_cached_bars(csv_path)
+    stat = csv_path.stat()
+
+    # лише mtime змінився — вміст той самий, кеш лишається дійсним
+    os.utime(csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert open_cache(csv_path) is not None
+
+    # вміст змінився (той самий розмір) — кеш застарів і перебудовується
+    text = csv_path.read_text()
+    csv_path.write_text(text.replace("1.1010", "1.1011", 1))
+    os.utime(csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2 * 10**9))
+    assert open_cache(csv_path) is None
+    rebuilt = load_cached_bars(csv_path)
+    assert rebuilt.close[0] == pytest.approx(1.1011)
+    assert open_cache(csv_path) is not None
+
+
+def test_use_cache_false_does_not_write(csv_path):
+    series = load_cached_bars(csv_path, use_cache=False)
+    assert len(series) > 0
+    assert not any(p.exists() for p in cache_paths(csv_path))
@@ -0,0 +1,89 @@
+# tests/unit/test_bar_data.py
+"""
+Тести колонкового сховища барів BarSeries.
+
+Перевіряє завантаження CSV, сумісність рядків зі словниками
+та те, що вікна є представленнями без копіювання.
+"""
+
+import os
+import pickle
+
+import numpy as np
+import pytest
+
+from core.bar_data import Bar, BarSeries, iter_bar_chunks, iter_bars
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+
+@pytest.fixture(scope="module")
+def series():
+    """Завантажує тестовий CSV з колонкою volume."""
+    path = os.path.join(PROJECT_ROOT, "data", "test_backtester_sma_data.csv")
+    return BarSeries.from_csv(path)
+
+
+def test_columns_are_contiguous(series):
+    """Колонки мають правильні типи і лежать суцільно в пам'яті."""
+    assert len(series) == 10
+    assert series.time.dtype == np.int64
+    for name in ("open", "high", "low", "close", "volume"):
+        column = getattr(series, name)
+        assert column.dtype == np.float64
+        assert column.flags["C_CONTIGUOUS"]
+    assert series.close[0] == pytest.approx(1.1010)
+    assert series.volume[1] == 1200
+
+
+def test_row_view_behaves_like_dict(series):
+    """Рядок Bar підтримує доступ за ключем і перетворення у dict."""
+    bar = series[-1]
+    assert isinstance(bar, Bar)
+    assert bar["close"] == series.close[-1]
+    assert bar["time"].startswith("2024-01-01T10:45")
+    assert set(bar.to_dict()) == {"time", "open", "high", "low", "close", "volume"}
+    with pytest.raises(KeyError):
+        bar["unknown"]
+
+
+def test_window_is_view(series):
+    """Зріз повертає BarSeries, що ділить пам'ять з батьківською серією."""
+    window = series[2:6]
+    assert isinstance(window, BarSeries)
+    assert len(window) == 4
+    assert np.shares_memory(window.close, series.close)
+    assert window[0]["close"] == series[2]["close"]
+
+
+def test_window_origin(series):
+    """Вікно пам'ятає кореневу серію і свій початок (і для вікна вікна)."""
+    assert series.origin is None
+    window = series[3:10]
+    assert window.origin[0] is series and window.origin[1] == 3
+    inner = window[2:]
+    assert inner.origin[0] is series and inner.origin[1] == 5
+    assert series[::2].origin is None
+
+    restored = pickle.loads(pickle.dumps(inner))
+    assert restored.origin is None
+    np.testing.assert_array_equal(restored.close, inner.close)
+
+
+def test_csv_without_volume():
+    """CSV без колонки volume отримує нульові обсяги."""
+    path = os.path.join(PROJECT_ROOT, "data", "data.csv")
+    series = BarSeries.from_csv(path)
+    assert len(series) == 30
+    assert not series.volume.any()
+
+
+@pytest.mark.parametrize("chunk_size", [1, 4, 7, 1000])
+def test_iter_bar_chunks_matches_full_load(series, chunk_size):
+    """Порції по chunk_size барів разом дають ту саму серію, що й from_csv."""
+    path = os.path.join(PROJECT_ROOT, "data", "test_backtester_sma_data.csv")
+    chunks = list(iter_bar_chunks(path, chunk_size))
+    assert all(len(chunk) <= chunk_size for chunk in chunks)
+    assert np.concatenate([c.close for c in chunks]).tolist() == series.close.tolist()
+    assert np.concatenate([c.time for c in chunks]).tolist() == series.time.tolist()
+    assert [bar["time"] for bar in iter_bars(path, 3)] == [b["time"] for b in series]
@@ -0,0 +1,81 @@
+# test_benchmark.py
+"""
+Тести бенчмарку торгового ядра (dev_tools/benchmark.py) на малих рядах.
+"""
+
+import json
+
+from dev_tools import benchmark
+
+
+def test_suite_reports_every_case():
+    results = benchmark.run_suite(
+        benchmark.CASES, [2_000], isolate=False, log=lambda line: None
+    )
+    assert set(results["results"]) == set(benchmark.CASES)
+    for name, (_, unit) in benchmark.CASES.items():
+        row = results["results"][name]["2000"]
+        assert row[unit] > 0 and row["seconds"] > 0
+        assert "peak_rss_mb" in row and "gc_collections" in row
+        assert row["alloc_peak_mb"] > 0
+        assert 0 <= row["alloc_retained_mb"] <= row["alloc_peak_mb"]
+    assert results["meta"]["environment"] == benchmark.environment()
+    json.dumps(results)  # документ серіалізується в JSON
+
+    untraced = benchmark.measure("risk_validate_order", 2_000, alloc_max_size=0)
+    assert untraced["alloc_peak_mb"] is None
+
+
+def test_compare_flags_only_large_drops():
+    def doc(rate):
+        return {"results": {"backtester_run": {"1000": {"bars_per_sec": rate}}}}
+
+    assert benchmark.compare(doc(90.0), doc(100.0), tolerance=0.2) == []
+    regressions = benchmark.compare(doc(70.0), doc(100.0), tolerance=0.2)
+    assert [r[:2] for r in regressions] == [("backtester_run", 1000)]
+    assert benchmark.compare(doc(70.0), {"results": {}}) == []
+
+
+def test_main_writes_results_and_detects_regression(tmp_path):
+    output, baseline = tmp_path / "out.json", tmp_path / "base.json"
+    args = ["--sizes", "500", "--cases", "risk_validate_order", "--no-isolate"]
+    args += ["--output", str(output), "--baseline", str(baseline)]
+    assert benchmark.main(args + ["--save-baseline"]) == 0
+    assert json.loads(output.read_text())["results"]["risk_validate_order"]
+
+    stored = json.loads(baseline.read_text())
+    stored["results"]["risk_validate_order"]["500"]["orders_per_sec"] *= 100
+    baseline.write_text(json.dumps(stored))
+    assert benchmark.main(args) == 1
+
+
+def test_main_requires_baseline_unless_disabled(tmp_path):
+    args = ["--sizes", "500", "--cases", "risk_validate_order", "--no-isolate"]
+    args += ["--output", str(tmp_path / "out.json")]
+    args += ["--baseline", str(tmp_path / "missing.json")]
+    assert benchmark.main(args) == 2
+    assert benchmark.main(args + ["--no-compare"]) == 0
+
+
+def test_main_fails_on_missing_size_or_other_environment(tmp_path, capsys):
+    output, baseline = tmp_path / "out.json", tmp_path / "base.json"
+    args = ["--cases", "risk_validate_order", "--no-isolate"]
+    args += ["--output", str(output), "--baseline", str(baseline)]
+    assert benchmark.main(args + ["--sizes", "500", "--save-baseline"]) == 0
+
+    assert benchmark.main(args + ["--sizes", "500,700"]) == 2
+    assert "НЕМАЄ BASELINE risk_validate_order 700" in capsys.readouterr().out
+
+    stored = json.loads(baseline.read_text())
+    stored["meta"]["environment"]["cpu"] = "other"
+    baseline.write_text(json.dumps(stored))
+    assert benchmark.main(args + ["--sizes", "500"]) == 2
+    assert "іншого середовища" in capsys.readouterr().out
+
+
+def test_committed_baseline_covers_every_case_and_size():
+    baseline = json.loads(benchmark.DEFAULT_BASELINE.read_text(encoding="utf-8"))
+    assert set(baseline["results"]) == set(benchmark.CASES)
+    for rows in baseline["results"].values():
+        assert set(rows) == {str(size) for size in benchmark.SIZES}
+    assert set(baseline["meta"]["environment"]) == set(benchmark.environment())
@@ -0,0 +1,201 @@
+# test_data_manager.py
+"""
+Тести DataManager (core.data_manager) без підключення до IB.
+
+ib_insync підміняється заглушкою в sys.modules. Перевіряє вибір між
+базовою серією і прямим запитом, формат результату (зокрема колонки
+volume/average/barCount після resample) та оновлення кешу базових серій.
+"""
+
+import datetime
+import importlib
+import os
+import shutil
+import sys
+import types
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.bar_data import BarSeries
+from core.resampler import resample
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+START = 1_704_067_200  # 2024-01-01 00:00 UTC
+
+
+def _ib_bars(start, count, step=60):
+    """Бари у форматі reqHistoricalData (MIDPOINT: volume/average/barCount = -1)."""
+    closes = 1.1 + np.cumsum(np.random.default_rng(start % 97).normal(0, 1e-4, count))
+    return [
+        {
+            "date": datetime.datetime.fromtimestamp(
+                start + i * step, tz=datetime.timezone.utc
+            ),
+            "open": close - 1e-5,
+            "high": close + 2e-4,
+            "low": close - 2e-4,
+            "close": close,
+            "volume": -1.0,
+            "average": -1.0,
+            "barCount": -1,
+        }
+        for i, close in enumerate(closes.tolist())
+    ]
+
+
+class FakeIB:
+    def __init__(self):
+        self.requests = []
+        self.start = START
+        self.count = 120
+
+    def connect(self, host, port, clientId):
+        pass
+
+    def qualifyContracts(self, contract):
+        pass
+
+    def reqHistoricalData(self, contract, durationStr, barSizeSetting, **kwargs):
+        self.requests.append((contract, durationStr, barSizeSetting))
+        if barSizeSetting == "1 min":
+            return _ib_bars(self.start, self.count)
+        return _ib_bars(self.start, 3, step=86_400)
+
+
+@pytest.fixture
+def dm(monkeypatch):
+    stub = types.ModuleType("ib_insync")
+    stub.IB = FakeIB
+    stub.Forex = lambda symbol: symbol
+    monkeypatch.setitem(sys.modules, "ib_insync", stub)
+    monkeypatch.delitem(sys.modules, "core.data_manager", raising=False)
+    module = importlib.import_module("core.data_manager")
+    clock = types.SimpleNamespace(now=START + 119 * 60 + 30)
+    monkeypatch.setattr(module, "time", types.SimpleNamespace(time=lambda: clock.now))
+    manager = module.DataManager(backend="ib")
+    manager.clock = clock
+    yield module, manager
+    sys.modules.pop("core.data_manager", None)
+
+
+def test_duration_and_base_series_choice(dm):
+    module, manager = dm
+    assert module.duration_seconds("1 D") == 86_400
+    assert module.duration_seconds("2 W") == 1_209_600
+    with pytest.raises(ValueError):
+        module.duration_seconds("1 Q")
+
+    assert manager.use_base_series("1 D", "5 mins")
+    assert manager.use_base_series("1 W", "1 hour")
+    assert not manager.use_base_series("2 W", "5 mins")  # понад MAX_BASE_BARS
+    assert not manager.use_base_series("1 Y", "1 day")
+    assert not manager.use_base_series("1 D", "90 secs")  # не кратний 1 min
+
+
+def test_long_range_is_requested_at_bar_size(dm):
+    _, manager = dm
+    frame = manager.get_historical_data("EURUSD", "1 Y", "1 day")
+    assert manager.ib.requests == [("EURUSD", "1 Y", "1 day")]
+    pd.testing.assert_frame_equal(frame, pd.DataFrame(_ib_bars(START, 3, 86_400)))
+    assert not manager._base_series
+
+
+def test_short_range_is_resampled_from_base_series(dm):
+    module, manager = dm
+    frame = manager.get_historical_data("EURUSD", "1 D", "5 mins")
+    assert manager.ib.requests == [("EURUSD", "1 D", "1 min")]
+    assert list(frame.columns) == [
+        "date",
+        "open",
+        "high",
+        "low",
+        "close",
+        "volume",
+        "average",
+        "barCount",
+    ]
+    base = module._frame_to_series(pd.DataFrame(_ib_bars(START, 120)))
+    expected = resample(base, "M5")
+    assert len(frame) == 24
+    times = frame["date"].to_numpy().astype("datetime64[s]").astype(np.int64)
+    assert times.tolist() == expected.time.tolist()
+    assert np.allclose(frame["close"], expected.close)
+    assert np.allclose(frame["high"], expected.high)
+    # недоступні значення IB лишаються -1
+    assert (frame["volume"] == -1).all() and (frame["average"] == -1).all()
+    assert (frame["barCount"] == -1).all()
+
+    manager.get_historical_data("EURUSD", "1 D", "15 mins")
+    assert len(manager.ib.requests) == 1  # та сама базова серія з пам'яті
+
+
+def test_base_series_refresh(dm):
+    _, manager = dm
+    manager.get_historical_data("EURUSD", "1 D", "5 mins")
+    manager.clock.now += 30  # почався новий хвилинний бар
+    manager.ib.count = 121
+    frame = manager.get_historical_data("EURUSD", "1 D", "5 mins")
+    assert len(manager.ib.requests) == 2
+    assert len(manager.get_base_series("EURUSD", "1 D")) == 121
+    assert len(frame) == 25
+
+    manager.ib.start += 3600
+    manager.clock.now += 3600
+    manager.get_base_series("EURUSD", "1 D")
+    manager.get_base_series("EURUSD", "1 D", refresh=True)
+    assert len(manager.ib.requests) == 4
+
+    manager.clear_cache("GBPUSD")
+    manager.get_base_series("EURUSD", "1 D")
+    assert len(manager.ib.requests) == 4
+    manager.clear_cache()
+    assert not manager._base_series and not manager._base_extra
+    manager.get_base_series("EURUSD", "1 D")
+    assert len(manager.ib.requests) == 5
+
+
+def test_file_backed_series_is_cached(dm, tmp_path):
+    module, _ = dm
+    path = tmp_path / "bars.csv"
+    shutil.copy(
+        os.path.join(PROJECT_ROOT, "data", "test_backtester_sma_data.csv"), path
+    )
+    manager = module.DataManager(backend="dummy", data_files={"EURUSD": path})
+    first = manager.get_base_series("EURUSD")
+    assert manager.get_base_series("EURUSD") is first
+    frame = manager.get_historical_data("EURUSD", "1 D", "1 min")
+    assert list(frame.columns)[:6] == ["date", "open", "high", "low", "close", "volume"]
+    assert len(frame) == len(resample(first, "M1"))
+
+
+def test_frame_series_round_trip(dm):
+    module, _ = dm
+    frame = pd.DataFrame(_ib_bars(START, 5))
+    frame["volume"] = [3.0, -1.0, 2.0, 0.0, 1.0]
+    series = module._frame_to_series(frame)
+    assert series.time.tolist() == [START + 60 * i for i in range(5)]
+    assert series.volume.tolist() == [3.0, 0.0, 2.0, 0.0, 1.0]
+    back = module._series_to_frame(series)
+    assert list(back.columns) == ["date", "open", "high", "low", "close", "volume"]
+    assert back["date"].iloc[0] == pd.Timestamp(START, unit="s")
+    assert np.allclose(back["close"], frame["close"])
+    empty = module._frame_to_series(pd.DataFrame())
+    assert isinstance(empty, BarSeries) and len(empty) == 0
+
+
+def test_resample_extra_columns(dm):
+    module, _ = dm
+    extra = {
+        "volume": np.array([10.0, 30.0, 5.0, 0.0, -1.0, 4.0]),
+        "average": np.array([1.0, 2.0, 3.0, 9.0, 1.0, 5.0]),
+        "barCount": np.array([1.0, 3.0, 2.0, 0.0, 1.0, -1.0]),
+    }
+    columns = module._resample_extra(extra, np.array([0, 2, 4]))
+    assert columns["volume"].tolist() == [40.0, 5.0, -1.0]
+    # середня зважена за обсягом (від'ємні обсяги не враховуються)
+    assert columns["average"].tolist() == pytest.approx([1.75, 3.0, 5.0])
+    assert columns["barCount"].tolist() == [4, 2, -1]
+    assert columns["barCount"].dtype == np.int64
+    assert module._resample_extra({}, np.array([0])) == {}
@@ -7,9 +7,14 @@ test_execution.py
 а також коректне оновлення балансу після угод.
 """
 
+import json
+import pickle
+import sys
+
+import numpy as np
 import pytest
 
-from core.execution import ExecutionEngine
+from core.execution import ExecutionEngine, Order, trades_to_array
 from core.risk_manager import RiskManager
 
 
@@ -50,3 +55,74 @@ def test_submit_and_close_order(setup_execution_engine):
     assert (
         abs(rm.balance - expected_balance) < 1e-6
     ), "Balance not updated correctly after closing order"
+
+
+def test_simulator_order_ids_are_sequential(setup_execution_engine):
+    """У симуляторі ID — послідовні цілі числа; закрити можна за ID."""
+    engine, _ = setup_execution_engine
+    orders = [engine.submit_order("EURUSD", "long", 1.1, 1.09)[1] for _ in range(3)]
+    assert [o["id"] for o in orders] == [1, 2, 3]
+    assert set(engine.active_orders) == {1, 2, 3}
+    assert engine.close_order(2, exit_price=1.11)[0]
+    assert orders[1]["status"] == "CLOSED"
+    assert set(engine.active_orders) == {1, 3}
+
+
+def test_order_behaves_like_dict():
+    """Order сумісний зі словником: доступ, відсутні ключі, рівність, JSON."""
+    order = Order(id=1, symbol="EURUSD", side="long", price=1.1, size=2.0)
+    expected = {"id": 1, "symbol": "EURUSD", "side": "long", "price": 1.1, "size": 2.0}
+    assert order == expected and dict(order) == expected
+    assert "profit" not in order and order.get("profit") is None
+    with pytest.raises(KeyError):
+        order["profit"]
+
+    order["profit"] = 5.0
+    order["note"] = "manual"  # довільне поле поза ORDER_FIELDS
+    assert list(order)[-2:] == ["profit", "note"]
+    assert json.loads(json.dumps(order.to_dict()))["note"] == "manual"
+    assert pickle.loads(pickle.dumps(order)) == order
+    del order["note"]
+    assert "note" not in order and len(order) == 6
+
+
+def test_order_is_smaller_than_dict():
+    fields = dict(
+        id=1,
+        symbol="EURUSD",
+        side="long",
+        price=1.1,
+        size=2.0,
+        stop_loss=1.09,
+        take_profit=1.12,
+        status="CLOSED",
+        open_index=10,
+        exit_price=1.12,
+        exit_reason="take_profit",
+        profit=0.04,
+    )
+    assert sys.getsizeof(Order(fields)) < sys.getsizeof(dict(fields))
+    assert not hasattr(Order(fields), "__dict__")
+
+
+def test_trades_to_array():
+    trades = [
+        Order(id=1, side="long", price=1.0, size=2.0, stop_loss=0.9, take_profit=None)
+    ]
+    trades.append(
+        {
+            "side": "short",
+            "price": 2.0,
+            "size": 1.0,
+            "stop_loss": 2.1,
+            "take_profit": 1.8,
+            "open_index": 4,
+            "exit_price": 1.8,
+            "profit": 0.2,
+        }
+    )
+    records = trades_to_array(trades)
+    assert records["id"].tolist() == [1, -1]
+    assert records["side"].tolist() == [1, -1]
+    assert np.isnan(records["take_profit"][0]) and np.isnan(records["profit"][0])
+    assert records["profit"][1] == 0.2 and records["open_index"].tolist() == [-1, 4]
@@ -0,0 +1,150 @@
+# test_indicators.py
+"""
+Тести інкрементальних індикаторів (core.indicators).
+
+Перевіряє, що інкрементальна і векторна форми кожного індикатора дають
+побітово однакові числа, збіг з наївними формулами і кільцевий буфер.
+"""
+
+import math
+
+import numpy as np
+import pytest
+from numpy.lib.stride_tricks import sliding_window_view
+
+from core.indicators import (
+    ATR,
+    EMA,
+    RESYNC_EVERY,
+    RSI,
+    Bollinger,
+    RingBuffer,
+    RollingSMA,
+    atr,
+    bollinger,
+    ema,
+    rsi,
+    sma,
+)
+
+
+@pytest.fixture
+def bars():
+    rng = np.random.default_rng(3)
+    close = 1.1 + np.cumsum(rng.normal(0, 1e-3, 2_000))
+    high = close + rng.uniform(0, 2e-3, len(close))
+    low = close - rng.uniform(0, 2e-3, len(close))
+    return high, low, close
+
+
+def _stream(indicator, *columns):
+    """Значення update по кожному бару (None → NaN)."""
+    out = []
+    for row in zip(*(c.tolist() for c in columns)):
+        value = indicator.update(*row)
+        out.append(math.nan if value is None else value)
+    return np.array(out)
+
+
+def _same(a, b):
+    np.testing.assert_array_equal(np.asarray(a), np.asarray(b))
+
+
+def test_ring_buffer():
+    buf = RingBuffer(3)
+    assert [buf.push(x) for x in (1.0, 2.0, 3.0, 4.0)] == [None, None, None, 1.0]
+    assert list(buf) == [2.0, 3.0, 4.0] and buf.full
+    assert buf.replace_last(5.0) == 4.0
+    assert list(buf) == [2.0, 3.0, 5.0]
+    buf.clear()
+    assert len(buf) == 0
+    with pytest.raises(ValueError):
+        RingBuffer(0)
+
+
+@pytest.mark.parametrize("period", [1, 3, 20])
+def test_sma_stream_matches_batch(bars, period):
+    close = bars[2]
+    _same(_stream(RollingSMA(period), close), sma(close, period))
+    window = np.array([close[i - period + 1 : i + 1].mean() for i in range(100, 110)])
+    np.testing.assert_allclose(sma(close, period)[100:110], window, rtol=1e-12)
+
+
+def test_sma_partial_windows():
+    np.testing.assert_allclose(
+        sma([1.0, 2.0, 3.0, 4.0, 5.0], 3), [1 / 3, 1.0, 2.0, 3.0, 4.0]
+    )
+    indicator = RollingSMA(3)
+    indicator.update(1.0)
+    assert not indicator.ready
+    indicator.update(2.0)
+    indicator.update(3.0)
+    assert indicator.ready
+    assert indicator.replace(6.0) == pytest.approx(3.0)
+
+
+def test_ema_stream_matches_batch(bars):
+    close = bars[2]
+    _same(_stream(EMA(10), close), ema(close, 10))
+    assert ema([2.0, 4.0], 3).tolist() == [2.0, 3.0]
+
+
+def test_atr_stream_matches_batch(bars):
+    high, low, close = bars
+    expected = atr(high, low, close, 14)
+    _same(_stream(ATR(14), high, low, close), expected)
+    assert np.isnan(expected[:13]).all() and not np.isnan(expected[13:]).any()
+
+
+def test_rsi_stream_matches_batch(bars):
+    close = bars[2]
+    expected = rsi(close, 14)
+    _same(_stream(RSI(14), close), expected)
+    assert np.isnan(expected[:14]).all()
+    assert ((expected[14:] >= 0) & (expected[14:] <= 100)).all()
+    assert rsi(np.arange(20.0), 14)[-1] == 100.0
+    assert rsi(np.ones(20), 14)[-1] == 50.0
+
+
+def test_bollinger_stream_matches_batch(bars):
+    close = bars[2]
+    indicator = Bollinger(20, 2.0)
+    streamed = [indicator.update(x) for x in close.tolist()]
+    middle, upper, lower = bollinger(close, 20, 2.0)
+    assert streamed[18] is None
+    _same([s[0] for s in streamed[19:]], middle[19:])
+    _same([s[1] for s in streamed[19:]], upper[19:])
+    _same([s[2] for s in streamed[19:]], lower[19:])
+    std = close[-20:].std()
+    assert upper[-1] - middle[-1] == pytest.approx(2 * std, rel=1e-6)
+
+
+@pytest.mark.parametrize("period", [20, RESYNC_EVERY + 500])
+def test_resynced_sums_match_between_forms(period):
+    close = 1.1 + np.cumsum(np.random.default_rng(8).normal(0, 1e-4, 5_000))
+    _same(_stream(RollingSMA(period), close), sma(close, period))
+    indicator = Bollinger(period, 2.0)
+    streamed = [indicator.update(x) for x in close.tolist()]
+    middle, upper, lower = bollinger(close, period, 2.0)
+    _same([s[0] for s in streamed[period - 1 :]], middle[period - 1 :])
+    _same([s[1] for s in streamed[period - 1 :]], upper[period - 1 :])
+    _same([s[2] for s in streamed[period - 1 :]], lower[period - 1 :])
+
+
+def test_precision_at_fx_price_levels():
+    # хвилинне блукання біля 1.1: дисперсія вікна ~1e-9 при ціні ~1
+    close = 1.1 + np.cumsum(np.random.default_rng(5).normal(0, 1e-5, 200_000))
+    windows = sliding_window_view(close, 20)
+    middle, upper, _ = bollinger(close, 20, 2.0)
+    std = windows.std(axis=1)
+    np.testing.assert_allclose((upper - middle)[19:] / 2, std, rtol=1e-8)
+    np.testing.assert_allclose(middle[19:], windows.mean(axis=1), rtol=1e-13)
+    np.testing.assert_allclose(sma(close, 20)[19:], windows.mean(axis=1), rtol=1e-13)
+
+
+def test_reset_restarts_indicator(bars):
+    close = bars[2]
+    indicator = RSI(5)
+    first = _stream(indicator, close[:50])
+    indicator.reset()
+    _same(_stream(indicator, close[:50]), first)
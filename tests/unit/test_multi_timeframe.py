@@ -0,0 +1,134 @@
+# test_multi_timeframe.py
+"""
+Тести доступу до кількох таймфреймів (core.multi_timeframe).
+
+Перевіряє карти індексів (лише завершені бари вищого таймфрейму, без
+заглядання в майбутнє), перенесення рядів на базові бари і стратегію
+з фільтром тренду вищого таймфрейму.
+"""
+
+import numpy as np
+import pytest
+
+from core.backtester import Backtester
+from core.bar_data import BarSeries
+from core.multi_timeframe import MultiTimeframe, infer_timeframe
+from core.risk_manager import RiskManager
+from core.synthetic_data import generate_bars
+from strategies.registry import create_strategy
+from strategies.strategy_mtf import MTFTrendStrategy
+from strategies.strategy_sma import SMAStrategy
+
+
+@pytest.fixture(scope="module")
+def base():
+    return generate_bars(3_000, "M5", seed=4)
+
+
+def test_index_map_has_no_lookahead(base):
+    mtf = MultiTimeframe.from_base(base, ["H1", "H4"])
+    assert mtf.base_seconds == 300
+    for timeframe, seconds in (("H1", 3600), ("H4", 14_400)):
+        series = mtf.series[timeframe]
+        index = mtf.index_map(timeframe)
+        assert len(index) == len(base)
+        assert not index.flags.writeable
+        bar_close = base.time + 300
+        for i in range(0, len(base), 7):
+            j = mtf.index(timeframe, i)
+            if j >= 0:
+                assert series.time[j] + seconds <= bar_close[i]
+            if j + 1 < len(series):
+                assert series.time[j + 1] + seconds > bar_close[i]
+
+
+def test_last_base_bar_of_hour_sees_that_hour():
+    times = np.arange(24) * 300  # дві години M5 з 00:00
+    closes = np.arange(24, dtype=float)
+    base = BarSeries(times, closes, closes + 1, closes - 1, closes)
+    mtf = MultiTimeframe.from_base(base, ["H1"])
+    assert [mtf.index("H1", i) for i in (0, 10, 11, 12, 23)] == [-1, -1, 0, 0, 1]
+    assert mtf.bar("H1", 10) is None
+    assert mtf.value("H1", "close", 11) == 11.0
+    assert mtf.bar("H1", 23)["high"] == 24.0
+    aligned = mtf.align("H1", [100.0, 200.0])
+    assert np.isnan(aligned[:11]).all()
+    assert aligned[11:23].tolist() == [100.0] * 12 and aligned[23] == 200.0
+
+
+def test_external_series_and_inferred_timeframe(base):
+    assert infer_timeframe(base.time) == 300
+    with pytest.raises(ValueError):
+        infer_timeframe(base.time[:1])
+    hourly = generate_bars(200, "H1", seed=1, weekends=False)
+    mtf = MultiTimeframe(base, {"1 hour": hourly}, base_timeframe="M5")
+    assert mtf.index_map("1 hour").max() < len(hourly)
+
+
+def test_trend_filter_strategy(base):
+    mtf = MultiTimeframe.from_base(base, ["H1"])
+    filtered = MTFTrendStrategy(mtf, "H1", 5, sma_fast=3, sma_slow=8)
+    plain = SMAStrategy(3, 8)
+
+    kept = 0
+    for i in range(len(base)):
+        signal, expected = filtered.on_bar(base[i]), plain.on_bar(base[i])
+        if signal is not None:
+            assert signal == expected
+            assert (filtered._trend[i] > 0) == (signal[0] == "long")
+            kept += 1
+        elif expected is not None:
+            assert filtered._trend[i] != (1 if expected[0] == "long" else -1)
+    assert kept > 0
+
+    legacy = MTFTrendStrategy(mtf, "H1", 5, sma_fast=3, sma_slow=8)
+    streaming = create_strategy("sma_mtf", mtf=mtf, trend_period=5, sma_slow=8)
+    for i in range(200):
+        assert streaming.on_bar(base[i]) == legacy.generate_signal(base[: i + 1])
+
+
+def test_trend_filter_aligns_by_bar_time(base):
+    mtf = MultiTimeframe.from_base(base, ["H1"])
+    full = MTFTrendStrategy(mtf, "H1", 5, sma_fast=3, sma_slow=8)
+    expected = [full._filter(("long", 0, 0), i) for i in range(len(base))]
+
+    # вікно серії: тренд за індексом у mtf.base, а не з нуля
+    windowed = MTFTrendStrategy(mtf, "H1", 5, sma_fast=3, sma_slow=8)
+    window = base[1_000:1_500]
+    assert [windowed._index(window[k]) for k in range(len(window))] == list(
+        range(1_000, 1_500)
+    )
+    assert [
+        windowed._filter(("long", 0, 0), windowed._index(window[k]))
+        for k in range(len(window))
+    ] == expected[1_000:1_500]
+
+    # словники з рядковим часом і стрибок назад (відновлення) — теж за часом
+    assert windowed._index(dict(base[42])) == 42
+    assert windowed._index(base.window(7, 8)[0]) == 7
+
+    plain = SMAStrategy(3, 8)
+    for k in range(len(window)):
+        signal, unfiltered = windowed.on_bar(window[k]), plain.on_bar(window[k])
+        if unfiltered is not None and full._trend[1_000 + k] == (
+            1 if unfiltered[0] == "long" else -1
+        ):
+            assert signal == unfiltered
+        else:
+            assert signal is None
+
+    other = generate_bars(100, "M5", start="2023-06-01", seed=4)
+    fresh = MTFTrendStrategy(mtf, "H1", 5)
+    with pytest.raises(ValueError, match="not in the base series"):
+        fresh.on_bar(other[0])
+    with pytest.raises(ValueError):
+        fresh.generate_signal(other[:10])
+
+
+def test_backtester_runs_mtf_strategy(base, tmp_path):
+    rm = RiskManager(10_000, max_drawdown=0.9, max_trades_per_day=10**9)
+    strategy = MTFTrendStrategy(MultiTimeframe.from_base(base, ["H1"]), "H1", 5)
+    bt = Backtester("unused.csv", strategy, rm, close_after_bars=10, use_cache=False)
+    bt.load_data = lambda: base
+    trades = bt.run()
+    assert trades
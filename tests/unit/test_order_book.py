@@ -0,0 +1,148 @@
+# test_order_book.py
+"""
+Тести книги відкладених limit/stop ордерів (core.order_book) і її
+використання в ExecutionEngine.
+
+Перевіряє умови спрацювання кожного типу, ціну виконання при гепі,
+скасування (зокрема перебудову куп) та ізоляцію символів.
+"""
+
+import random
+
+import pytest
+
+from core.execution import ExecutionEngine
+from core.order_book import OrderBook, PendingOrder
+from core.risk_manager import RiskManager
+
+
+def _order(order_id, side, order_type, price, symbol="EURUSD"):
+    return PendingOrder(order_id, symbol, side, order_type, price, stop_loss=0.0)
+
+
+@pytest.mark.parametrize(
+    "side, order_type, touched, untouched",
+    [
+        ("long", "limit", (1.10, 1.12, 1.09), (1.10, 1.12, 1.101)),
+        ("short", "stop", (1.10, 1.12, 1.09), (1.10, 1.12, 1.101)),
+        ("short", "limit", (1.08, 1.101, 1.07), (1.08, 1.099, 1.07)),
+        ("long", "stop", (1.08, 1.101, 1.07), (1.08, 1.099, 1.07)),
+    ],
+)
+def test_trigger_conditions(side, order_type, touched, untouched):
+    book = OrderBook()
+    book.add(_order(1, side, order_type, 1.10))
+    assert book.match("EURUSD", *untouched) == []
+    assert 1 in book
+    (fill,) = book.match("EURUSD", *touched)
+    assert fill[0].id == 1 and fill[1] == pytest.approx(1.10)
+    assert len(book) == 0
+
+
+def test_gap_fill_prices():
+    book = OrderBook()
+    book.add(_order(1, "long", "limit", 1.10))
+    book.add(_order(2, "short", "stop", 1.10))
+    book.add(_order(3, "short", "limit", 1.20))
+    book.add(_order(4, "long", "stop", 1.20))
+    # бар відкрився гепом нижче рівнів 1.10
+    fills = dict((o.id, price) for o, price in book.match("EURUSD", 1.05, 1.06, 1.04))
+    assert fills == {1: 1.05, 2: 1.05}
+    # і вище рівнів 1.20
+    fills = dict((o.id, price) for o, price in book.match("EURUSD", 1.25, 1.26, 1.24))
+    assert fills == {3: 1.25, 4: 1.25}
+
+
+def test_match_pops_only_crossed_orders():
+    book = OrderBook()
+    for i, price in enumerate((1.00, 1.01, 1.02, 1.03, 1.04)):
+        book.add(_order(i, "long", "limit", price))
+    fills = book.match("EURUSD", 1.05, 1.05, 1.015)
+    # від найближчого до відкриття бару
+    assert [o.id for o, _ in fills] == [4, 3, 2]
+    assert [o.id for o in book.orders()] == [0, 1]
+
+
+def test_match_price_agrees_with_scan():
+    rng = random.Random(7)
+    book = OrderBook()
+    orders = {}
+    for i in range(500):
+        side = rng.choice(("long", "short"))
+        order_type = rng.choice(("limit", "stop"))
+        order = _order(i, side, order_type, round(rng.uniform(0.9, 1.1), 4))
+        book.add(order)
+        orders[i] = order
+    price = 1.0
+    for _ in range(200):
+        price += rng.uniform(-0.01, 0.01)
+        expected = {
+            i
+            for i, o in orders.items()
+            if (price <= o.price if o.triggers_below else price >= o.price)
+        }
+        filled = {o.id for o, _ in book.match_price("EURUSD", price)}
+        assert filled == expected
+        for i in filled:
+            del orders[i]
+    assert len(book) == len(orders)
+
+
+def test_cancel_and_compaction():
+    book = OrderBook()
+    for i in range(300):
+        book.add(_order(i, "long", "limit", 1.0 + i / 1000))
+    kept = [i for i in range(300) if i % 3 == 2]
+    for i in range(300):
+        if i % 3 != 2:
+            assert book.cancel(i)
+    assert not book.cancel(0)
+    assert len(book) == 100
+    heap_size = sum(len(h) for h in book._books["EURUSD"].values())
+    assert heap_size < 300  # скасовані записи прибрано перебудовою
+    fills = book.match("EURUSD", 2.0, 2.0, 0.0)
+    assert sorted(o.id for o, _ in fills) == kept
+
+
+def test_symbols_are_isolated():
+    book = OrderBook()
+    book.add(_order(1, "long", "limit", 1.10, symbol="EURUSD"))
+    book.add(_order(2, "long", "limit", 1.10, symbol="GBPUSD"))
+    assert [o.id for o, _ in book.match("EURUSD", 1.09, 1.09, 1.09)] == [1]
+    assert book.match("USDJPY", 1.0, 2.0, 0.5) == []
+    assert [o.id for o in book.orders("GBPUSD")] == [2]
+
+
+def test_invalid_and_duplicate_orders():
+    with pytest.raises(ValueError):
+        _order(1, "buy", "limit", 1.0)
+    with pytest.raises(ValueError):
+        _order(1, "long", "market", 1.0)
+    book = OrderBook()
+    book.add(_order(1, "long", "limit", 1.0))
+    with pytest.raises(ValueError):
+        book.add(_order(1, "short", "stop", 1.0))
+
+
+def test_engine_fills_pending_orders_on_bar():
+    rm = RiskManager(
+        balance=10_000, risk_per_trade=0.01, max_drawdown=0.2, max_trades_per_day=3
+    )
+    engine = ExecutionEngine(risk_manager=rm, mode="simulator")
+    ok, pending = engine.place_pending_order("EURUSD", "long", "limit", 1.10, 1.09)
+    assert ok and pending.id == 1
+    ok, stop = engine.place_pending_order("EURUSD", "long", "stop", 1.20, 1.19)
+    assert ok and stop.id == 2
+    assert engine.place_pending_order("EURUSD", "long", "oco", 1.0, 0.9)[0] is False
+
+    assert engine.on_bar("EURUSD", 1.15, 1.16, 1.14) == []
+    assert not engine.active_orders
+
+    (result,) = engine.on_bar("EURUSD", 1.12, 1.13, 1.08)
+    filled, ok, order = result
+    assert filled is pending and ok
+    assert order.price == pytest.approx(1.10)
+    assert order.id in engine.active_orders
+
+    assert engine.cancel_order(stop.id)
+    assert engine.on_tick("EURUSD", 1.30) == []
@@ -0,0 +1,116 @@
+# test_resampler.py
+"""
+Тести перетворення таймфрейму (core.resampler).
+
+Перевіряє векторний resample, потоковий resample_chunks та інкрементальний
+Resampler на тих самих даних, розбір назв таймфреймів і Backtester(timeframe).
+"""
+
+import os
+
+import numpy as np
+import pytest
+
+from core.backtester import Backtester
+from core.bar_data import BAR_FIELDS, BarSeries
+from core.resampler import Resampler, resample, resample_chunks, timeframe_seconds
+from core.risk_manager import RiskManager
+from strategies.strategy_sma import SMAStrategy
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+
+@pytest.fixture
+def m1():
+    """Хвилинні бари з пропусками (кошики різної довжини)."""
+    rng = np.random.default_rng(2)
+    times = np.cumsum(rng.integers(1, 4, 2_000)) * 60 + 1_704_067_200
+    closes = 1.1 + np.cumsum(rng.normal(0, 1e-4, len(times)))
+    return BarSeries(
+        times,
+        closes - 1e-5,
+        closes + 2e-4,
+        closes - 2e-4,
+        closes,
+        rng.integers(1, 100, len(times)).astype(float),
+    )
+
+
+@pytest.mark.parametrize(
+    "value, seconds",
+    [("M5", 300), ("h1", 3600), ("D1", 86_400), ("5 mins", 300), ("1 hour", 3600)],
+)
+def test_timeframe_seconds(value, seconds):
+    assert timeframe_seconds(value) == seconds
+    assert timeframe_seconds(seconds) == seconds
+
+
+def test_timeframe_seconds_rejects_unknown():
+    with pytest.raises(ValueError):
+        timeframe_seconds("fortnight")
+
+
+def test_resample_ohlcv(m1):
+    h1 = resample(m1, "H1")
+    bucket = m1.time // 3600
+    assert len(h1) == len(np.unique(bucket))
+    first = bucket == bucket[0]
+    assert h1.time[0] == bucket[0] * 3600
+    assert h1.open[0] == m1.open[first][0]
+    assert h1.close[0] == m1.close[first][-1]
+    assert h1.high[0] == m1.high[first].max()
+    assert h1.low[0] == m1.low[first].min()
+    assert h1.volume[0] == m1.volume[first].sum()
+
+
+@pytest.mark.parametrize("timeframe", ["M5", "H1", "D1", "W1"])
+def test_chunked_and_incremental_match_vectorized(m1, timeframe):
+    expected = resample(m1, timeframe)
+
+    chunks = (m1.window(a, a + 97) for a in range(0, len(m1), 97))
+    parts = list(resample_chunks(chunks, timeframe))
+    for name in BAR_FIELDS:
+        joined = np.concatenate([getattr(p, name) for p in parts])
+        assert joined.tolist() == getattr(expected, name).tolist()
+
+    resampler = Resampler(timeframe)
+    bars = [bar for bar in map(resampler.update, m1) if bar is not None]
+    bars.append(resampler.flush())
+    assert bars == expected.to_records()
+
+
+def test_weekly_bars_start_on_monday():
+    """Тижневі кошики вирівняні від понеділка 00:00 UTC, а не від четверга epoch."""
+    times = np.arange(24 * 7 * 5, dtype=np.int64) * 3600 + 1_704_200_000
+    closes = np.arange(len(times), dtype=np.float64)
+    h1 = BarSeries(times, closes, closes, closes, closes)
+    w1 = resample(h1, "W1")
+
+    starts = w1.time.astype("datetime64[s]").astype(object)
+    assert all(t.weekday() == 0 and t.hour == 0 for t in starts)
+    for k, start in enumerate(w1.time):
+        inside = (h1.time >= start) & (h1.time < start + 604_800)
+        assert w1.open[k] == closes[inside][0]
+        assert w1.close[k] == closes[inside][-1]
+    bars = [bar for bar in map(Resampler("1 week").update, h1) if bar is not None]
+    assert [bar["time"] for bar in bars] == [
+        str(t) for t in w1.time[:-1].astype("datetime64[s]")
+    ]
+
+
+def test_backtester_timeframe(tmp_path):
+    path = os.path.join(PROJECT_ROOT, "data", "test_backtester_sma_data.csv")
+    base = BarSeries.from_csv(path)
+
+    def backtester():
+        return Backtester(path, SMAStrategy(2, 3), RiskManager(10_000), timeframe="M15")
+
+    data = backtester().load_data()
+    assert data.to_records() == resample(base, 900).to_records()
+    assert len(data) < len(base)
+
+    def without_id(trades):
+        return [{k: v for k, v in t.items() if k != "id"} for t in trades]
+
+    streamed = backtester().run(chunk_size=5)
+    assert without_id(streamed) == without_id(backtester().run())
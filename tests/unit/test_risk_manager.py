@@ -13,6 +13,8 @@ RiskManager — клас для управління ризиками торгі
 дотримуватись заданих параметрів управління ризиками.
 """
 
+import datetime
+
 import pytest
 
 from core.risk_manager import RiskManager
@@ -101,3 +103,21 @@ def test_trade_4_blocked_due_to_max_trades(risk_manager):
     assert (
         "max trades" in info.lower()
     ), f"Block reason should mention max trades: {info}"
+
+
+def test_daily_limit_resets_on_new_trade_date():
+    """
+    Після вичерпання ліміту угоди в той самий день блокуються,
+    а з новою датою (наприклад, датою бару в бек-тесті) знову дозволені.
+    """
+    rm = RiskManager(balance=10_000, max_trades_per_day=1)
+    day = datetime.date(2024, 1, 1)
+
+    assert rm.validate_order(stop_loss_distance=10, price=100, today=day)[0]
+    rm.register_trade(profit_loss=5)
+
+    valid, info = rm.validate_order(stop_loss_distance=10, price=100, today=day)
+    assert not valid and "max trades" in info.lower()
+
+    next_day = day + datetime.timedelta(days=1)
+    assert rm.validate_order(stop_loss_distance=10, price=100, today=next_day)[0]
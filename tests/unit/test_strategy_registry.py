@@ -0,0 +1,100 @@
+# test_strategy_registry.py
+"""
+Тести реєстру стратегій (strategies.registry).
+
+Перевіряє, що імпорт пакету і перелік стратегій не імпортують модулі
+стратегій, а створення за ім'ям і з конфігурації — імпортує лише потрібний.
+"""
+
+import os
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+from core.config_trades import STRATEGY
+from strategies import registry
+from strategies.strategy_dummy import DummyStrategy
+from strategies.strategy_sma import SMAStrategy
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+
+@pytest.fixture
+def clean_registry(monkeypatch):
+    monkeypatch.setattr(registry, "_REGISTRY", dict(registry._REGISTRY))
+    monkeypatch.setattr(registry, "_LOADED", {})
+
+
+def test_listing_does_not_import_strategies():
+    code = textwrap.dedent("""
+        import sys
+        import strategies
+        names = strategies.available_strategies()
+        assert {"sma", "dummy"} <= set(names), names
+        loaded = [m for m in sys.modules if m.startswith("strategies.strategy_")]
+        assert not loaded, loaded
+        strategies.create_strategy("dummy")
+        assert "strategies.strategy_dummy" in sys.modules
+        assert "strategies.strategy_sma" not in sys.modules
+        """)
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=PROJECT_ROOT)
+
+
+def test_create_by_name_rejects_unknown_params(clean_registry):
+    strategy = registry.create_strategy("sma", sma_fast=2, sma_slow=8)
+    assert isinstance(strategy, SMAStrategy)
+    assert (strategy.sma_fast, strategy.sma_slow) == (2, 8)
+    assert registry.load_strategy("sma") is SMAStrategy
+    with pytest.raises(ValueError, match="sma_fsat"):
+        registry.create_strategy("sma", sma_fsat=2)
+    with pytest.raises(ValueError, match="sma_fast"):
+        registry.create_strategy("dummy", sma_fast=2)
+
+
+def test_strategy_from_config(clean_registry):
+    strategy = registry.strategy_from_config()
+    assert isinstance(strategy, SMAStrategy)
+    assert strategy.sma_slow == STRATEGY["sma_slow"]
+    assert isinstance(registry.strategy_from_config({"name": "dummy"}), DummyStrategy)
+
+
+def test_strategy_from_config_logs_ignored_keys(clean_registry, caplog):
+    with caplog.at_level("WARNING", logger=registry.__name__):
+        strategy = registry.strategy_from_config({**STRATEGY, "sma_fsat": 9})
+    assert strategy.sma_fast == STRATEGY["sma_fast"]
+    assert "sma_fsat" in caplog.text
+
+
+def test_register_and_unknown(clean_registry):
+    registry.register_strategy("sma_alias", "strategies.strategy_sma:SMAStrategy")
+    assert "sma_alias" in registry.available_strategies()
+    assert registry.load_strategy("sma_alias") is SMAStrategy
+
+    with pytest.raises(ValueError):
+        registry.register_strategy("sma", "strategies.strategy_dummy:DummyStrategy")
+    with pytest.raises(ValueError):
+        registry.register_strategy("broken", "strategies.strategy_sma")
+    with pytest.raises(ValueError, match="available"):
+        registry.create_strategy("missing")
+
+
+def test_lazy_package_attributes():
+    code = textwrap.dedent("""
+        import sys
+        from strategies import *
+        assert callable(create_strategy)
+        loaded = [m for m in sys.modules if m.startswith("strategies.strategy_")]
+        assert not loaded, loaded
+        import strategies
+        assert "SMAStrategy" in dir(strategies)
+        assert not [m for m in sys.modules if m.startswith("strategies.strategy_")]
+        """)
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=PROJECT_ROOT)
+
+    import strategies
+
+    assert strategies.SMAStrategy is SMAStrategy
+    with pytest.raises(AttributeError):
+        strategies.NoSuchStrategy
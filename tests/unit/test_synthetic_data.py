@@ -0,0 +1,116 @@
+# test_synthetic_data.py
+"""
+Тести генератора синтетичних даних (core.synthetic_data).
+
+Перевіряє відтворюваність за seed, коректність OHLC, пропуск вихідних
+із гепами, режими волатильності і запис у формати Backtester/TickReplay.
+"""
+
+import numpy as np
+
+from core.backtester import Backtester
+from core.bar_cache import open_cache
+from core.bar_data import BAR_FIELDS, BarSeries
+from core.resampler import resample
+from core.risk_manager import RiskManager
+from core.synthetic_data import (
+    generate_bars,
+    generate_ticks,
+    generate_universe,
+    parse_count,
+    trading_to_calendar,
+    write_bars_csv,
+    write_ticks,
+)
+from core.tick_replay import iter_tick_chunks
+from strategies.strategy_sma import SMAStrategy
+
+
+def _weekday(seconds):
+    return (np.asarray(seconds) // 86_400 + 3) % 7  # 0 — понеділок
+
+
+def test_bars_are_reproducible_and_consistent():
+    bars = generate_bars(50_000, "M5", seed=1)
+    again = generate_bars(50_000, "M5", seed=1)
+    for name in BAR_FIELDS:
+        assert np.array_equal(getattr(bars, name), getattr(again, name))
+    assert not np.array_equal(bars.close, generate_bars(50_000, "M5", seed=2).close)
+
+    assert np.all(bars.high >= np.maximum(bars.open, bars.close))
+    assert np.all(bars.low <= np.minimum(bars.open, bars.close))
+    assert np.all(bars.low > 0) and np.all(bars.volume > 0)
+    assert np.all(np.diff(bars.time) >= 300)
+
+
+def test_weekends_are_skipped_with_gaps():
+    bars = generate_bars(20_000, "M5", start="2024-01-03", seed=3)  # середа
+    assert bars[0]["time"] == "2024-01-03T00:00:00"
+    assert np.all(_weekday(bars.time) < 5)
+    breaks = np.flatnonzero(np.diff(bars.time) > 300)
+    assert len(breaks) >= 5
+    assert np.all(_weekday(bars.time[breaks + 1]) == 0)  # після перерви — понеділок
+    # відкриття після вихідних зсунуте відносно попереднього закриття
+    assert np.any(bars.open[breaks + 1] != bars.close[breaks])
+
+    # старт у суботу переноситься на понеділок
+    saturday = int(np.datetime64("2024-01-06", "s").astype(np.int64))
+    assert _weekday(trading_to_calendar(np.array([0]), saturday))[0] == 0
+
+
+def test_weeks_start_where_weekly_bars_start():
+    # з суботи ряд починається з понеділка — там же, де тижневий бар resampler
+    bars = generate_bars(3 * 1_440, "M5", start="2024-01-06", seed=2)
+    weekly = resample(bars, "W1")
+    assert (
+        bars.time[0] == weekly.time[0] == np.datetime64("2024-01-08", "s").astype(int)
+    )
+    assert set(_weekday(weekly.time).tolist()) == {0}
+
+
+def test_parse_count():
+    assert parse_count("10k") == 10_000
+    assert parse_count("1M") == 1_000_000
+    assert parse_count("2_500") == 2_500
+
+
+def test_regimes_change_volatility():
+    calm = generate_bars(20_000, regime_scale=(1.0,), seed=4)
+    mixed = generate_bars(20_000, regime_scale=(1.0, 5.0), regime_switch=0.01, seed=4)
+    assert np.std(np.diff(np.log(mixed.close))) > np.std(np.diff(np.log(calm.close)))
+
+
+def test_universe_has_independent_symbols():
+    universe = generate_universe(["EURUSD", "GBPUSD"], 1_000, {"GBPUSD": 1.3}, seed=5)
+    assert universe["GBPUSD"].open[0] == 1.3 and universe["EURUSD"].open[0] == 1.1
+    assert not np.array_equal(
+        np.diff(universe["EURUSD"].close), np.diff(universe["GBPUSD"].close)
+    )
+
+
+def test_bars_csv_roundtrip_and_backtest(tmp_path):
+    bars = generate_bars(3_000, "M1", seed=6)
+    path = write_bars_csv(bars, tmp_path / "synthetic.csv")
+    parsed = BarSeries.from_csv(path)
+    cached = open_cache(path)
+    for name in BAR_FIELDS:
+        assert np.array_equal(getattr(parsed, name), getattr(bars, name))
+        assert np.array_equal(getattr(cached, name), getattr(bars, name))
+
+    bt = Backtester(path, SMAStrategy(5, 20, 0.001), RiskManager(10_000))
+    assert bt.run()
+
+
+def test_ticks_roundtrip(tmp_path):
+    ticks = generate_ticks(10_000, seed=7)
+    assert np.all(np.diff(ticks["time"].astype(np.int64)) >= 1)
+    assert np.all(_weekday(ticks["time"].astype("datetime64[s]").astype(np.int64)) < 5)
+
+    for name in ("ticks.npy", "ticks.csv"):
+        path = write_ticks(ticks, tmp_path / name)
+        times, prices, volumes = (
+            np.concatenate(c) for c in zip(*iter_tick_chunks(path, 3_000))
+        )
+        assert np.array_equal(times, ticks["time"].astype(np.int64))
+        assert np.array_equal(prices, ticks["price"])
+        assert np.array_equal(volumes, ticks["volume"])